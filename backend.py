@@ -1,37 +1,68 @@
 import os
+import sys
 import pdfplumber
-import requests
+try:
+    import pypdfium2  # Fast text-layer extraction (installed alongside recent pdfplumber versions)
+except ImportError:
+    pypdfium2 = None
+import httpx
 import json
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Response
+import re
+import unicodedata
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Response, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
 import uuid
-from pydantic import BaseModel
-import tempfile
-import speech_recognition as sr
-from pydub import AudioSegment
+from pydantic import BaseModel, ValidationError
+import subprocess
+import numpy as np
 import io
 import sqlite3
 from datetime import datetime
 import logging
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 import csv
-import pandas as pd
+from xml.sax.saxutils import escape as xml_escape
 from typing import List, Optional
 from datetime import datetime, timedelta
 import traceback
+import hashlib
+import math
+import base64
+import threading
+import time
+import asyncio
+import random
+import queue
+import copy
+import contextvars
+import functools
+from contextlib import contextmanager
+from urllib.parse import urlparse, quote, unquote
+import multiprocessing
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from fastapi import APIRouter
-import openai
-import whisper
+
+# Id of the HTTP request being handled, attached to every log line it produces
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(RequestIdFilter())
 logger = logging.getLogger(__name__)
+# LOG_LEVEL=DEBUG turns on this module's debug output (e.g. sampled LLM payloads) without library debug noise
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
 app = FastAPI()
 
@@ -47,52 +78,6 @@ app.add_middleware(
 # Create a router for API endpoints
 api_router = APIRouter(prefix="/api")
 
-# Database setup
-def init_db():
-    try:
-        conn = sqlite3.connect('interview_sessions.db')
-        c = conn.cursor()
-        
-        # Create sessions table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                id TEXT PRIMARY KEY,
-                created_at TIMESTAMP,
-                num_questions INTEGER,
-                difficulty TEXT,
-                interview_type TEXT,
-                overall_score REAL
-            )
-        ''')
-        
-        # Create questions table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id TEXT PRIMARY KEY,
-                session_id TEXT,
-                question_text TEXT,
-                answer_text TEXT,
-                evaluation_json TEXT,
-                FOREIGN KEY (session_id) REFERENCES sessions (id)
-            )
-        ''')
-        
-        conn.commit()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Error initializing database: {str(e)}")
-        raise
-    finally:
-        conn.close()
-
-# Initialize database
-init_db()
-
-# MongoDB connection
-client = MongoClient("mongodb://localhost:27017/")
-db = client["interview_db"]
-sessions_collection = db["sessions"]
-
 # New Pydantic models for additional features
 class Tag(BaseModel):
     name: str
@@ -118,9 +103,18 @@ class ComparisonRequest(BaseModel):
     session_ids: List[str]
     compare_by: List[str] = ["score", "difficulty", "interview_type"]
 
-# Add new MongoDB collections
-tags_collection = db["tags"]
-session_tags_collection = db["session_tags"]
+class CriterionEvaluation(BaseModel):
+    score: float
+    feedback: str = ""
+
+class Evaluation(BaseModel):
+    summary: str
+    score: float
+    evaluation: Dict[str, CriterionEvaluation]
+    strengths: List[str] = []
+    improvements: List[str] = []
+    revised_answer: str = ""
+    tips: List[str] = []
 
 class InterviewParams(BaseModel):
     num_questions: int
@@ -130,6 +124,7 @@ class InterviewParams(BaseModel):
 class EvaluationRequest(BaseModel):
     session_id: str
     answers: List[Dict[str, str]]
+    batch_size: Optional[int] = None  # Answers per LLM request; defaults to EVALUATION_BATCH_SIZE
 
 class Session(BaseModel):
     id: str
@@ -141,588 +136,4436 @@ class Session(BaseModel):
     interview_type: str
 
 # OpenRouter API Configuration
-OPENROUTER_API_KEY = "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"
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "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")
+OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
 
-# Configure OpenAI API key
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# OpenRouter client tuning: concurrent requests per host, retries on 429/5xx and circuit breaker
+OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "30"))
+OPENROUTER_MAX_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "8"))
+OPENROUTER_MAX_RETRIES = int(os.getenv("OPENROUTER_MAX_RETRIES", "3"))
+OPENROUTER_BACKOFF_BASE = float(os.getenv("OPENROUTER_BACKOFF_BASE", "0.5"))
+OPENROUTER_BACKOFF_MAX = float(os.getenv("OPENROUTER_BACKOFF_MAX", "8"))
+OPENROUTER_BREAKER_THRESHOLD = int(os.getenv("OPENROUTER_BREAKER_THRESHOLD", "5"))
+OPENROUTER_BREAKER_COOLDOWN = float(os.getenv("OPENROUTER_BREAKER_COOLDOWN", "30"))
 
-# Initialize Whisper model (will download the model on first run)
-model = whisper.load_model("base")  # You can use "tiny", "base", "small", "medium", or "large"
+# LLM request scheduler: upstream rate limit to pace requests under (0 requests/min disables scheduling;
+# 0 tokens/min only limits requests), burst size, waiting requests allowed per lane and per-lane deadlines (seconds)
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "20"))
+LLM_RATE_LIMIT_TPM = float(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "5"))
+LLM_QUEUE_LIMIT = int(os.getenv("LLM_QUEUE_LIMIT", "50"))
+LLM_LANE_DEADLINES = {
+    "interactive": float(os.getenv("LLM_DEADLINE_INTERACTIVE", "30")),
+    "evaluation": float(os.getenv("LLM_DEADLINE_EVALUATION", "120")),
+    "bulk": float(os.getenv("LLM_DEADLINE_BULK", "600"))
+}
 
-def get_openrouter_headers():
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "http://localhost:3000",
-        "X-Title": "Interview Assistant"
-    }
-    logger.info(f"Using headers: {headers}")
-    return headers
+# Transcription engine used by the inference workers: "openai-whisper" (fp32 PyTorch) or "faster-whisper" (CTranslate2)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai-whisper")
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from a PDF file with better error handling"""
-    try:
-        logger.info(f"Opening PDF file: {file_path}")
-        with pdfplumber.open(file_path) as pdf:
-            logger.info(f"PDF opened successfully. Number of pages: {len(pdf.pages)}")
-            text = []
-            for i, page in enumerate(pdf.pages):
+# Whisper model size loaded by each inference worker (will download the model on first run)
+WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")  # You can use "tiny", "base", "small", "medium", or "large"
+
+# CPU threads per inference worker (0 keeps the library default) and faster-whisper weight quantization
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", "0"))
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+
+# Inference worker pool: number of Whisper processes and how many jobs may wait for one
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "8"))
+
+# Micro-batching of /api/transcribe requests: up to TRANSCRIPTION_BATCH_SIZE recordings collected for at most
+# TRANSCRIPTION_BATCH_WAIT_MS share one batched Whisper pass (1 transcribes each request on its own)
+TRANSCRIPTION_BATCH_SIZE = int(os.getenv("TRANSCRIPTION_BATCH_SIZE", "1"))
+TRANSCRIPTION_BATCH_WAIT_MS = int(os.getenv("TRANSCRIPTION_BATCH_WAIT_MS", "250"))
+
+# Models load on first use; set to warm up the Whisper and report workers in the background at startup
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+# Whisper models expect 16kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Whisper decodes fixed 30 second windows
+WHISPER_WINDOW_SECONDS = 30
+
+# Whisper decoding options (also part of the transcription cache key)
+WHISPER_OPTIONS = {
+    "language": "en",  # Specify English language
+    "task": "transcribe",  # Specify transcription task
+    "temperature": 0.2,  # Lower temperature for more accurate transcription
+    "initial_prompt": "This is an interview response. Please transcribe it accurately."  # Context for better accuracy
+}
+
+# PDF text extraction: size/page budget, early stop once enough text for the prompt, page-parallel workers
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_TARGET_CHARS = int(os.getenv("PDF_TARGET_CHARS", "20000"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_FAST_PATH_MIN_CHARS_PER_PAGE = int(os.getenv("PDF_FAST_PATH_MIN_CHARS_PER_PAGE", "200"))
+
+# Generated question sets cached per resume fingerprint and parameters (0 disables the cache)
+QUESTION_CACHE_DB_PATH = os.getenv("QUESTION_CACHE_DB_PATH", "interview_sessions.db")
+QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Background jobs: store backend ("sqlite" or "mongo"), in-process workers and retry policy
+JOB_STORE_BACKEND = os.getenv("JOB_STORE", "sqlite")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "interview_sessions.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # 0 = only run workers via `python backend.py worker`
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))
+
+# Number of answers evaluated concurrently for one /api/evaluate request
+EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "4"))
+
+# Answers packed into one evaluation request (1 = one request per answer)
+EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "1"))
+
+# Maximum number of transcripts kept in the in-memory cache
+TRANSCRIPTION_CACHE_SIZE = int(os.getenv("TRANSCRIPTION_CACHE_SIZE", "256"))
+
+# Energy VAD: analysis frame, minimum RMS counted as speech, pause length that closes a segment
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_MIN_RMS = float(os.getenv("VAD_MIN_RMS", "0.01"))
+VAD_MIN_SILENCE = float(os.getenv("VAD_MIN_SILENCE", "0.5"))
+
+# Silence trimming before Whisper on uploaded answers: padding kept around each speech segment,
+# and the least speech (seconds) worth transcribing; quieter recordings skip the model
+VAD_TRIM_SILENCE = os.getenv("VAD_TRIM_SILENCE", "true").lower() in ("1", "true", "yes")
+VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "200"))
+VAD_MIN_SPEECH = float(os.getenv("VAD_MIN_SPEECH", "0.3"))
+
+# Live transcription over WebSocket: seconds between incremental passes, longest open window before forcing a commit
+LIVE_TRANSCRIBE_INTERVAL = float(os.getenv("LIVE_TRANSCRIBE_INTERVAL", "1.0"))
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_WINDOW_SECONDS", "20"))
+
+# Session listing page sizes
+SESSIONS_PAGE_SIZE = int(os.getenv("SESSIONS_PAGE_SIZE", "20"))
+SESSIONS_MAX_PAGE_SIZE = int(os.getenv("SESSIONS_MAX_PAGE_SIZE", "100"))
+
+# Full-text search side index (SQLite FTS5) over session content
+SEARCH_DB_PATH = os.getenv("SEARCH_DB_PATH", "interview_sessions.db")
+
+# Sessions fetched per $in query while streaming an export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# PDF reports: ReportLab worker processes and the on-disk cache of rendered reports
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", "reports")
+# Bump when the report layout changes so cached reports are rendered again
+REPORT_TEMPLATE_VERSION = 1
+
+# Session storage: "mongo", or "sqlite" for a local-only deployment that needs no MongoDB server
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo")
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
+STORAGE_DB_PATH = os.getenv("STORAGE_DB_PATH", "interview_sessions.db")
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+
+# Latency histogram buckets (seconds) exported on /metrics
+METRICS_BUCKETS = [float(bound) for bound in os.getenv(
+    "METRICS_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60"
+).split(",")]
+
+# Full LLM request/response payloads are only logged at DEBUG level (LOG_LEVEL=DEBUG), for this fraction of calls
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+
+class MetricsRegistry:
+    """In-process counters, histograms and gauges rendered in the Prometheus text format"""
+
+    def __init__(self, buckets: List[float], prefix: str = "interview_"):
+        self.buckets = sorted(buckets)
+        self.prefix = prefix
+        self._metrics = {}  # name -> (kind, help)
+        self._counters = defaultdict(float)  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts, sum, count]
+        self._gauges = {}  # name -> (callback returning the current value or {label value: value}, label name)
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._metrics[name] = (kind, help_text)
+
+    def gauge(self, name: str, help_text: str, callback, label: Optional[str] = None):
+        self.describe(name, "gauge", help_text)
+        self._gauges[name] = (callback, label)
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Record the duration of the block under stage_duration_seconds{stage=...}"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_duration_seconds", time.perf_counter() - started, stage=stage)
+
+    @staticmethod
+    def _labels(labels: tuple, extra: Optional[tuple] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: [list(value[0]), value[1], value[2]] for key, value in self._histograms.items()}
+        lines = []
+        for name, (kind, help_text) in self._metrics.items():
+            full_name = self.prefix + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            if kind == "gauge":
+                callback, label = self._gauges[name]
                 try:
-                    page_text = page.extract_text() or ""
-                    text.append(page_text)
-                    logger.info(f"Extracted text from page {i+1}. Length: {len(page_text)} characters")
+                    if label:
+                        for value_label, value in callback().items():
+                            lines.append(f"{full_name}{self._labels(((label, value_label),))} {float(value)}")
+                    else:
+                        lines.append(f"{full_name} {float(callback())}")
                 except Exception as e:
-                    logger.error(f"Error extracting text from page {i+1}: {str(e)}")
-                    text.append("")  # Add empty string for failed pages
-            
-            result = "\n".join(text)
-            logger.info(f"Total extracted text length: {len(result)} characters")
-            return result
-    except Exception as e:
-        logger.error(f"Error in extract_text_from_pdf: {str(e)}")
-        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+                    logger.warning(f"Could not read gauge {name}: {str(e)}")
+            elif kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{full_name}{self._labels(labels)} {value}")
+            else:
+                for (metric, labels), (bucket_counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, bucket_count in zip(self.buckets, bucket_counts):
+                        lines.append(f"{full_name}_bucket{self._labels(labels, ('le', f'{bound:g}'))} {bucket_count}")
+                    lines.append(f"{full_name}_bucket{self._labels(labels, ('le', '+Inf'))} {count}")
+                    lines.append(f"{full_name}_sum{self._labels(labels)} {total}")
+                    lines.append(f"{full_name}_count{self._labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(METRICS_BUCKETS)
+metrics.describe("http_requests_total", "counter", "HTTP requests by method, route and status code")
+metrics.describe("http_request_duration_seconds", "histogram", "HTTP request latency by method and route")
+metrics.describe(
+    "stage_duration_seconds", "histogram",
+    "Time spent per pipeline stage (upload_read, pdf_extraction, llm_request, json_parse, audio_decode, "
+    "whisper_inference, storage_read, storage_write, pdf_render)"
+)
+metrics.describe("llm_requests_total", "counter", "OpenRouter HTTP attempts by outcome status")
+
+def log_payload(message: str, payload: Any):
+    """Log a full LLM payload at DEBUG level for a LOG_PAYLOAD_SAMPLE_RATE fraction of calls"""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+        logger.debug(f"{message}: {payload if isinstance(payload, str) else json.dumps(payload, indent=2)}")
 
-def generate_questions(resume_text: str, params: InterviewParams) -> List[Dict[str, str]]:
+@app.middleware("http")
+async def instrument_requests(request, call_next):
+    """Tag the request with an id (X-Request-ID, generated if absent) and record its latency"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    started = time.perf_counter()
+    status = 500
     try:
-        logger.info("Generating questions using OpenRouter API")
-        prompt = (
-            f"Generate {params.num_questions} technical interview questions based on this resume. "
-            f"Focus on:\n"
-            f"  1. Core technical skills mentioned\n"
-            f"  2. Tools and technologies actually used\n"
-            f"  3. Work experience and contribution-based scenarios\n"
-            f"  4. At least 1 question around a challenge faced in projects\n"
-            f"  5. 1–2 behavioral questions tied to leadership/teamwork if applicable\n"
-            f"- Do NOT ask generic questions. Only ask what is directly relevant.\n\n"
-            f"Resume Summary:\n{resume_text}\n\n"
-            f"Return exactly {params.num_questions} numbered questions in a clear list."
-        )
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        # Label by route template so /api/sessions/{session_id} is one series, not one per id
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.inc("http_requests_total", method=request.method, route=path, status=status)
+        metrics.observe("http_request_duration_seconds", time.perf_counter() - started, method=request.method, route=path)
+        request_id_var.reset(token)
 
-        payload = {
-            "model": "meta-llama/llama-4-maverick:free",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 1000
-        }
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
-        logger.info(f"Sending request to OpenRouter API with payload: {json.dumps(payload)}")
-        response = requests.post(
-            OPENROUTER_URL,
-            headers=get_openrouter_headers(),
-            json=payload,
-            timeout=30
-        )
+class WriteResult(NamedTuple):
+    matched: bool
+    modified: bool
 
-        logger.info(f"Response status code: {response.status_code}")
-        logger.info(f"Response headers: {response.headers}")
-        logger.info(f"Response text: {response.text}")
+class SessionRepository:
+    """Storage for interview sessions, their running stats and tags.
 
-        if response.status_code != 200:
-            logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail=f"Failed to generate questions: {response.text}")
+    Updates use the MongoDB operator subset the API needs ($set, $inc, $push, $addToSet,
+    with dotted paths such as "evaluations.3"); documents come back with a string "_id".
+    """
 
-        response_data = response.json()
-        logger.info(f"Response data: {json.dumps(response_data, indent=2)}")
+    def insert_session(self, session: Dict[str, Any]):
+        raise NotImplementedError
 
-        if "choices" not in response_data or not response_data["choices"]:
-            logger.error("No choices in response data")
-            raise HTTPException(status_code=500, detail="Invalid response format from API")
+    def get_session(self, session_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
 
-        content = response_data["choices"][0]["message"]["content"]
-        logger.info(f"Raw response content: {content}")
+    def get_sessions(self, session_ids: List[str], projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Fetch many sessions in one round trip; missing ids are skipped, order is not guaranteed"""
+        raise NotImplementedError
 
-        # Process the response and format questions
-        questions = []
-        for line in content.split('\n'):
-            if line.strip() and line[0].isdigit():
-                questions.append({"question": line.strip()})
-        
-        logger.info(f"Generated {len(questions)} questions")
-        return questions
+    def iter_sessions(self, projection: Optional[Dict[str, int]] = None, batch_size: int = 500):
+        """Every session, oldest first"""
+        raise NotImplementedError
 
-    except requests.exceptions.Timeout:
-        logger.error("Request to OpenRouter API timed out")
-        raise HTTPException(status_code=500, detail="Request timed out")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request to OpenRouter API failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Request failed: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unexpected error in generate_questions: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    def count_sessions(self) -> int:
+        raise NotImplementedError
 
-def convert_webm_to_wav(webm_data: bytes) -> bytes:
-    """Convert webm audio data to wav format"""
-    # Create a temporary file for the webm data
-    with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as webm_file:
-        webm_file.write(webm_data)
-        webm_path = webm_file.name
+    def list_sessions(
+        self,
+        filters: Dict[str, Any],
+        after: Optional[tuple],
+        limit: int,
+        summary: bool
+    ) -> List[Dict[str, Any]]:
+        """Newest first by (timestamp, _id), strictly after the (timestamp, session_id) position if given.
 
-    try:
-        # Load the webm file
-        audio = AudioSegment.from_file(webm_path, format="webm")
-        
-        # Export to wav format in memory
-        wav_buffer = io.BytesIO()
-        audio.export(wav_buffer, format="wav")
-        return wav_buffer.getvalue()
-        
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(webm_path):
-            os.remove(webm_path)
+        filters may hold "difficulty", "start" and "end"; summary rows carry SESSION_SUMMARY_FIELDS only.
+        """
+        raise NotImplementedError
 
-def transcribe_audio(audio_file_path: str) -> str:
-    try:
-        # Transcribe using local Whisper model
-        result = model.transcribe(
-            audio_file_path,
-            language="en",  # Specify English language
-            task="transcribe",  # Specify transcription task
-            temperature=0.2,  # Lower temperature for more accurate transcription
-            initial_prompt="This is an interview response. Please transcribe it accurately."  # Context for better accuracy
-        )
-        
-        if result and result["text"]:
-            return result["text"].strip()
-        else:
-            logger.error("No transcription returned from Whisper")
-            return "Could not transcribe audio. Please try again."
-            
-    except Exception as e:
-        logger.error(f"Error in transcribe_audio: {str(e)}")
-        return f"Error transcribing audio: {str(e)}"
+    def update_session(self, session_id: str, update: Dict[str, Dict[str, Any]], expect: Optional[Dict[str, Any]] = None) -> WriteResult:
+        """Apply an update, optionally only if the session's fields still equal expect"""
+        raise NotImplementedError
 
-def evaluate_answer(question: str, answer: str) -> Dict[str, Any]:
-    """Evaluate the answer using Llama 4 Maverick model with structured evaluation criteria"""
-    try:
-        logger.info("Evaluating answer using OpenRouter API")
-        prompt = f"""You are an expert interview coach and AI analyst. Your task is to evaluate a candidate's spoken interview response.
+    def find_and_update_session(
+        self,
+        session_id: str,
+        update: Dict[str, Dict[str, Any]],
+        projection: Optional[Dict[str, int]] = None,
+        return_after: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
 
-### Interview Question:
-{question}
+    def find_and_delete_session(self, session_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
 
-### Candidate Response:
-{answer}
+    def set_session_scores(self, session_scores: Dict[str, tuple]):
+        """Overwrite every session's score_total/scored_answers/avg_score from {session_id: (total, count)}"""
+        raise NotImplementedError
 
-### Your Evaluation Should Include:
-1. **Overall Clarity**: Was the answer coherent and easy to understand?
-2. **Technical Relevance**: Did the candidate address the key technical aspects of the question?
-3. **Structure & Flow**: Was the answer well-organized (e.g., point-wise, logical order)?
-4. **Communication Style**: Was it confident, concise, and professional?
-5. **Correctness**: Were there any factual or conceptual errors?
+    def aggregate_stats(self) -> Dict[str, Any]:
+        """Recompute the session stats totals directly from the stored sessions"""
+        raise NotImplementedError
 
-### Provide:
-- A 1–2 sentence **Summary Feedback**
-- A detailed **Strengths vs Areas to Improve** section
-- A **Revised Version** of the answer (as you would say it in an interview)
-- A **Score out of 10**
-- 1–2 **Improvement Tips**
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
 
-Format your response as a JSON object with the following structure:
-{{
-    "summary": "1-2 sentence summary of the evaluation",
-    "score": <number between 0 and 10>,
-    "evaluation": {{
-        "clarity": {{
-            "score": <number between 0 and 10>,
-            "feedback": "feedback on clarity"
-        }},
-        "technical_relevance": {{
-            "score": <number between 0 and 10>,
-            "feedback": "feedback on technical relevance"
-        }},
-        "structure": {{
-            "score": <number between 0 and 10>,
-            "feedback": "feedback on structure and flow"
-        }},
-        "communication": {{
-            "score": <number between 0 and 10>,
-            "feedback": "feedback on communication style"
-        }},
-        "correctness": {{
-            "score": <number between 0 and 10>,
-            "feedback": "feedback on correctness"
-        }}
-    }},
-    "strengths": ["strength1", "strength2", "strength3"],
-    "improvements": ["improvement1", "improvement2"],
-    "revised_answer": "A better version of the answer",
-    "tips": ["tip1", "tip2"]
-}}
+    def increment_stats(self, increments: Dict[str, float]):
+        raise NotImplementedError
 
-IMPORTANT: Return ONLY the JSON object, without any markdown formatting or additional text."""
+    def replace_stats(self, stats: Dict[str, Any]):
+        raise NotImplementedError
 
-        payload = {
-            "model": "meta-llama/llama-4-maverick:free",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 1000
-        }
+    def get_tag(self, name: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
 
-        logger.info("Sending request to OpenRouter API")
-        response = requests.post(
-            OPENROUTER_URL,
-            headers=get_openrouter_headers(),
-            json=payload,
-            timeout=30
-        )
+    def insert_tag(self, name: str, color: Optional[str]) -> str:
+        raise NotImplementedError
 
-        if response.status_code != 200:
-            logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail=f"Failed to evaluate answer: {response.text}")
+    def link_tag(self, session_id: str, tag_name: str):
+        raise NotImplementedError
 
-        response_data = response.json()
-        logger.info(f"Response data: {json.dumps(response_data, indent=2)}")
+    def ensure_indexes(self):
+        pass
 
-        if "choices" not in response_data or not response_data["choices"]:
-            logger.error("No choices in response data")
-            raise HTTPException(status_code=500, detail="Invalid response format from API")
+# Fields of a session card in summary listings (question/answer counts are computed)
+SESSION_SUMMARY_FIELDS = [
+    "timestamp", "difficulty", "interview_type", "status", "evaluation_status",
+    "notes", "tags", "avg_score", "scored_answers"
+]
 
-        content = response_data["choices"][0]["message"]["content"]
-        logger.info(f"Raw response content: {content}")
+# Indexes behind the keyset-paginated listings and the stats score trend
+SESSION_INDEXES = [
+    [("timestamp", -1), ("_id", -1)],
+    [("difficulty", 1), ("timestamp", -1), ("_id", -1)],
+    [("interview_type", 1), ("timestamp", -1), ("_id", -1)]
+]
 
-        # Clean the content by removing any markdown formatting
-        content = content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
+class MongoSessionRepository(SessionRepository):
+    STATS_ID = "global"
 
-        try:
-            evaluation = json.loads(content)
-            logger.info("Successfully parsed evaluation response")
-            return evaluation
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse evaluation response: {str(e)}")
-            logger.error(f"Content that failed to parse: {content}")
-            raise HTTPException(status_code=500, detail="Failed to parse evaluation response")
-
-    except requests.exceptions.Timeout:
-        logger.error("Request to OpenRouter API timed out")
-        raise HTTPException(status_code=500, detail="Request timed out")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request to OpenRouter API failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Request failed: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unexpected error in evaluate_answer: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    def __init__(self, database):
+        self.sessions = database["sessions"]
+        self.stats = database["session_stats"]
+        self.tags = database["tags"]
+        self.session_tags = database["session_tags"]
 
-@api_router.post("/transcribe")
-async def transcribe_interview(
-    audio: UploadFile = File(...),
-    question: str = Form(...),
-    session_id: str = Form(...),
-    is_final: bool = Form(False)  # New parameter to indicate if this is the final answer
-):
-    try:
-        logger.info("Starting transcription process")
-        
-        # Save the audio file
-        audio_path = f"audio/{session_id}_{datetime.now().timestamp()}.webm"
-        os.makedirs("audio", exist_ok=True)
-        with open(audio_path, "wb") as buffer:
-            content = await audio.read()
-            buffer.write(content)
-        logger.info(f"Saved audio file to {audio_path}")
-        
-        # Convert WebM to WAV
+    @staticmethod
+    def _object_id(session_id: Any) -> Optional[ObjectId]:
+        if isinstance(session_id, ObjectId):
+            return session_id
         try:
-            # Use the saved file for conversion
-            audio = AudioSegment.from_file(audio_path, format="webm")
-            # Set the sample rate to 16kHz (recommended for speech recognition)
-            audio = audio.set_frame_rate(16000)
-            # Set the number of channels to 1 (mono)
-            audio = audio.set_channels(1)
-            wav_buffer = io.BytesIO()
-            audio.export(wav_buffer, format="wav")
-            wav_data = wav_buffer.getvalue()
-            logger.info("Successfully converted WebM to WAV")
-        except Exception as e:
-            logger.error(f"Error converting WebM to WAV: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error converting audio format: {str(e)}")
-        
-        # Save WAV data to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_file:
-            wav_file.write(wav_data)
-            wav_path = wav_file.name
-        logger.info(f"Saved WAV file to {wav_path}")
-        
+            return ObjectId(session_id)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _out(session: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if session is not None:
+            session["_id"] = str(session["_id"])
+        return session
+
+    def insert_session(self, session: Dict[str, Any]):
+        self.sessions.insert_one({**session, "_id": self._object_id(session["_id"])})
+
+    def get_session(self, session_id, projection=None):
+        object_id = self._object_id(session_id)
+        if object_id is None:
+            return None
+        return self._out(self.sessions.find_one({"_id": object_id}, projection))
+
+    def get_sessions(self, session_ids, projection=None):
+        object_ids = [object_id for object_id in map(self._object_id, session_ids) if object_id is not None]
+        return [self._out(session) for session in self.sessions.find({"_id": {"$in": object_ids}}, projection)]
+
+    def iter_sessions(self, projection=None, batch_size=500):
+        for session in self.sessions.find({}, projection).sort("timestamp", 1).batch_size(batch_size):
+            yield self._out(session)
+
+    def count_sessions(self):
+        return self.sessions.estimated_document_count()
+
+    def list_sessions(self, filters, after, limit, summary):
+        match = {}
+        if filters.get("difficulty"):
+            match["difficulty"] = filters["difficulty"]
+        if filters.get("start") is not None or filters.get("end") is not None:
+            match["timestamp"] = {}
+            if filters.get("start") is not None:
+                match["timestamp"]["$gte"] = filters["start"]
+            if filters.get("end") is not None:
+                match["timestamp"]["$lte"] = filters["end"]
+        if after is not None:
+            timestamp, session_id = after
+            if timestamp is None:
+                # Undated sessions sort after all dated ones
+                position = {"timestamp": {"$not": {"$type": "date"}}, "_id": {"$lt": self._object_id(session_id)}}
+            else:
+                position = {"$or": [
+                    {"timestamp": {"$lt": timestamp}},
+                    {"timestamp": timestamp, "_id": {"$lt": self._object_id(session_id)}},
+                    {"timestamp": {"$not": {"$type": "date"}}}
+                ]}
+            match = {"$and": [match, position]} if match else position
+
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"timestamp": -1, "_id": -1}},
+            {"$limit": limit}
+        ]
+        if summary:
+            pipeline.append({"$project": {
+                **{field: 1 for field in SESSION_SUMMARY_FIELDS},
+                "question_count": {"$size": {"$ifNull": ["$questions", []]}},
+                "answer_count": {"$size": {"$ifNull": ["$answers", []]}}
+            }})
+        return [self._out(session) for session in self.sessions.aggregate(pipeline)]
+
+    def update_session(self, session_id, update, expect=None):
+        object_id = self._object_id(session_id)
+        if object_id is None:
+            return WriteResult(False, False)
+        result = self.sessions.update_one({"_id": object_id, **(expect or {})}, update)
+        return WriteResult(result.matched_count > 0, result.modified_count > 0)
+
+    def find_and_update_session(self, session_id, update, projection=None, return_after=False):
+        object_id = self._object_id(session_id)
+        if object_id is None:
+            return None
+        return self._out(self.sessions.find_one_and_update(
+            {"_id": object_id},
+            update,
+            projection=projection,
+            return_document=ReturnDocument.AFTER if return_after else ReturnDocument.BEFORE
+        ))
+
+    def find_and_delete_session(self, session_id, projection=None):
+        object_id = self._object_id(session_id)
+        if object_id is None:
+            return None
+        return self._out(self.sessions.find_one_and_delete({"_id": object_id}, projection=projection))
+
+    def set_session_scores(self, session_scores):
+        self.sessions.update_many({}, {"$set": {"score_total": 0, "scored_answers": 0, "avg_score": None}})
+        for session_id, (total, count) in session_scores.items():
+            self.sessions.update_one(
+                {"_id": self._object_id(session_id)},
+                {"$set": {"score_total": total, "scored_answers": count, "avg_score": round(total / count, 2)}}
+            )
+
+    def aggregate_stats(self):
+        totals = next(self.sessions.aggregate([
+            {"$group": {
+                "_id": None,
+                "total_sessions": {"$sum": 1},
+                "total_questions": {"$sum": {"$size": {"$ifNull": ["$questions", []]}}},
+                "total_answers": {"$sum": {"$size": {"$ifNull": ["$answers", []]}}}
+            }}
+        ]), {})
+        difficulty = self.sessions.aggregate([
+            {"$group": {"_id": {"$ifNull": ["$difficulty", "unknown"]}, "count": {"$sum": 1}}}
+        ])
+        tags = self.sessions.aggregate([
+            {"$unwind": "$tags"},
+            {"$group": {"_id": "$tags", "count": {"$sum": 1}}}
+        ])
+        # Scored with evaluation_score, like the incremental updates, so legacy string scores are skipped the same way
+        session_scores = {}
+        for session in self.sessions.find({"evaluations.0": {"$exists": True}}, {"evaluations": 1}):
+            scores = [score for score in map(evaluation_score, session["evaluations"]) if score is not None]
+            if scores:
+                session_scores[str(session["_id"])] = (sum(scores), len(scores))
+        return {
+            "total_sessions": totals.get("total_sessions", 0),
+            "total_questions": totals.get("total_questions", 0),
+            "total_answers": totals.get("total_answers", 0),
+            "difficulty": {entry["_id"]: entry["count"] for entry in difficulty},
+            "tags": {entry["_id"]: entry["count"] for entry in tags},
+            "session_scores": session_scores
+        }
+
+    def get_stats(self):
+        return self.stats.find_one({"_id": self.STATS_ID})
+
+    def increment_stats(self, increments):
+        self.stats.update_one({"_id": self.STATS_ID}, {"$inc": increments}, upsert=True)
+
+    def replace_stats(self, stats):
+        self.stats.replace_one({"_id": self.STATS_ID}, {"_id": self.STATS_ID, **stats}, upsert=True)
+
+    def get_tag(self, name):
+        tag = self.tags.find_one({"name": name})
+        if tag is not None:
+            tag["_id"] = str(tag["_id"])
+        return tag
+
+    def insert_tag(self, name, color):
+        tag_id = ObjectId()
+        self.tags.insert_one({"_id": tag_id, "name": name, "color": color, "created_at": datetime.now()})
+        return str(tag_id)
+
+    def link_tag(self, session_id, tag_name):
+        self.session_tags.insert_one({"session_id": session_id, "tag_name": tag_name, "added_at": datetime.now()})
+
+    def ensure_indexes(self):
+        for keys in SESSION_INDEXES:
+            self.sessions.create_index(keys)
+        # Sessions stored without a datetime timestamp (older code paths) take their id's creation time,
+        # so they sort and paginate with the rest instead of trailing after every dated session
+        for session in self.sessions.find({"timestamp": {"$not": {"$type": "date"}}}, {"_id": 1}):
+            if isinstance(session["_id"], ObjectId):
+                created = session["_id"].generation_time.astimezone().replace(tzinfo=None)
+                self.sessions.update_one({"_id": session["_id"]}, {"$set": {"timestamp": created}})
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of WAL-mode SQLite connections shared across request threads"""
+
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self._connections = queue.Queue()
+        for _ in range(max(1, size)):
+            self._connections.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        # Constant SQL strings are compiled once and reused from each connection's statement cache
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, timeout=30, cached_statements=256
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
         try:
-            # Transcribe the audio
-            transcription = transcribe_audio(wav_path)
-            logger.info("Successfully transcribed audio")
-            
-            if is_final:
-                # Only store the answer if this is marked as final
-                sessions_collection.update_one(
-                    {"_id": ObjectId(session_id)},
-                    {"$push": {"answers": transcription}}
-                )
-                logger.info("Updated session with final transcription")
-            
-            return {"transcription": transcription}
+            yield conn
         finally:
-            # Clean up the temporary WAV file
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
-                logger.info(f"Cleaned up temporary WAV file: {wav_path}")
-            # Clean up the original WebM file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-                logger.info(f"Cleaned up original WebM file: {audio_path}")
-    except Exception as e:
-        logger.error(f"Error in transcribe_interview: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+            self._connections.put(conn)
 
-@app.post("/api/upload")
-async def upload_resume(
-    file: UploadFile = File(...),
-    num_questions: int = Form(...),
-    difficulty: str = Form(...),
-    interview_type: str = Form(...)
-):
-    file_path = None
-    try:
-        logger.info(f"Starting resume upload process for file: {file.filename}")
-        
-        # Validate parameters
-        if num_questions < 1 or num_questions > 20:
-            raise HTTPException(status_code=400, detail="Number of questions must be between 1 and 20")
-        
-        if difficulty not in ["easy", "medium", "hard"]:
-            raise HTTPException(status_code=400, detail="Invalid difficulty level")
-            
-        if interview_type not in ["technical", "behavioral", "system_design", "mixed"]:
-            raise HTTPException(status_code=400, detail="Invalid interview type")
-        
-        # Validate file type
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are supported")
-        
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+def _migrate_legacy_report_tables(conn: sqlite3.Connection):
+    # The tables init_db used to create for the report endpoints
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            created_at TIMESTAMP,
+            num_questions INTEGER,
+            difficulty TEXT,
+            interview_type TEXT,
+            overall_score REAL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS questions (
+            id TEXT PRIMARY KEY,
+            session_id TEXT,
+            question_text TEXT,
+            answer_text TEXT,
+            evaluation_json TEXT,
+            FOREIGN KEY (session_id) REFERENCES sessions (id)
+        )
+    ''')
+
+def _migrate_legacy_report_columns(conn: sqlite3.Connection):
+    # get_report read sessions.duration and questions.score, which were never created
+    for table, column, column_type in (("sessions", "duration", "REAL"), ("questions", "score", "REAL")):
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        if column not in columns:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+def _migrate_session_documents(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_documents (
+            id TEXT PRIMARY KEY,
+            ts TEXT NOT NULL,
+            difficulty TEXT,
+            interview_type TEXT,
+            document TEXT NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_session_documents_ts ON session_documents (ts DESC, id DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_session_documents_difficulty ON session_documents (difficulty, ts DESC, id DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_session_documents_type ON session_documents (interview_type, ts DESC, id DESC)')
+    conn.execute('CREATE TABLE IF NOT EXISTS session_stats (id TEXT PRIMARY KEY, document TEXT NOT NULL)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tags (
+            id TEXT PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            color TEXT,
+            created_at TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_tags (
+            session_id TEXT NOT NULL,
+            tag_name TEXT NOT NULL,
+            added_at TEXT
+        )
+    ''')
+
+    # Carry sessions from the legacy report tables over as documents
+    legacy = conn.execute('SELECT id, created_at, difficulty, interview_type, duration FROM sessions').fetchall()
+    for session_id, created_at, difficulty, interview_type, duration in legacy:
+        rows = conn.execute(
+            'SELECT question_text, answer_text, evaluation_json FROM questions WHERE session_id = ? ORDER BY rowid',
+            (session_id,)
+        ).fetchall()
+        try:
+            timestamp = datetime.fromisoformat(created_at) if created_at else datetime.now()
+        except ValueError:
+            timestamp = datetime.now()
+        session = {
+            "_id": session_id,
+            "timestamp": timestamp,
+            "difficulty": difficulty,
+            "interview_type": interview_type,
+            "duration": duration,
+            "questions": [{"question": row[0]} for row in rows],
+            "answers": [row[1] or "" for row in rows],
+            "evaluations": [json.loads(row[2]) if row[2] else {} for row in rows],
+            "status": "completed"
+        }
+        SQLiteSessionRepository._write(conn, session, insert=True)
+
+# Applied in order; PRAGMA user_version records how many have run
+SQLITE_MIGRATIONS = [
+    _migrate_legacy_report_tables,
+    _migrate_legacy_report_columns,
+    _migrate_session_documents
+]
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _json_object_hook(value: Dict[str, Any]):
+    if len(value) == 1 and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+def _resolve_path(document: Dict[str, Any], path: str):
+    """Container and key for a dotted path, creating intermediate objects like MongoDB does"""
+    parts = path.split(".")
+    container = document
+    for position, part in enumerate(parts):
+        last = position == len(parts) - 1
+        if isinstance(container, list):
+            index = int(part)
+            container.extend([None] * (index + 1 - len(container)))
+            if last:
+                return container, index
+            if not isinstance(container[index], (dict, list)):
+                container[index] = {}
+            container = container[index]
+        else:
+            if last:
+                return container, part
+            if not isinstance(container.get(part), (dict, list)):
+                container[part] = {}
+            container = container[part]
+
+def _apply_update(document: Dict[str, Any], update: Dict[str, Dict[str, Any]]) -> bool:
+    modified = False
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            container, key = _resolve_path(document, path)
+            exists = key < len(container) if isinstance(container, list) else key in container
+            current = container[key] if exists else None
+            if operator == "$set":
+                modified |= not exists or current != value
+                container[key] = value
+            elif operator == "$inc":
+                modified |= value != 0 or not exists
+                container[key] = (current or 0) + value
+            elif operator == "$push":
+                container[key] = (current or []) + [value]
+                modified = True
+            elif operator == "$addToSet":
+                items = current or []
+                if value not in items:
+                    container[key] = items + [value]
+                    modified = True
+            else:
+                raise ValueError(f"Unsupported update operator {operator}")
+    return modified
+
+def _apply_projection(document: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    if not projection:
+        return document
+    included = [field for field, flag in projection.items() if flag]
+    if included:
+        return {"_id": document["_id"], **{field: document[field] for field in included if field in document}}
+    return {field: value for field, value in document.items() if projection.get(field, 1)}
+
+def _sqlite_timestamp(value: Any) -> str:
+    # Fixed-width so text order matches time order
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f") if isinstance(value, datetime) else ""
+
+class SQLiteSessionRepository(SessionRepository):
+    """Embedded storage for local-only deployments: one JSON document per session plus filter columns"""
+
+    STATS_ID = "global"
+
+    def __init__(self, db_path: str, pool_size: int):
+        self.pool = SQLiteConnectionPool(db_path, pool_size)
+        self.migrate()
+
+    def migrate(self):
+        with self.pool.transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for number, migration in enumerate(SQLITE_MIGRATIONS[version:], start=version + 1):
+                logger.info(f"Applying SQLite migration {number}: {migration.__name__}")
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {number}')
+
+    @staticmethod
+    def _load(document: str) -> Dict[str, Any]:
+        return json.loads(document, object_hook=_json_object_hook)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, session: Dict[str, Any], insert: bool = False):
+        values = (
+            _sqlite_timestamp(session.get("timestamp")),
+            session.get("difficulty"),
+            session.get("interview_type"),
+            json.dumps(session, default=_json_default),
+            str(session["_id"])
+        )
+        if insert:
+            conn.execute(
+                'INSERT INTO session_documents (ts, difficulty, interview_type, document, id) VALUES (?, ?, ?, ?, ?)',
+                values
+            )
+        else:
+            conn.execute(
+                'UPDATE session_documents SET ts = ?, difficulty = ?, interview_type = ?, document = ? WHERE id = ?',
+                values
+            )
+
+    def _read(self, conn: sqlite3.Connection, session_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute('SELECT document FROM session_documents WHERE id = ?', (str(session_id),)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def insert_session(self, session):
+        with self.pool.transaction() as conn:
+            self._write(conn, {**session, "_id": str(session["_id"])}, insert=True)
+
+    def get_session(self, session_id, projection=None):
+        with self.pool.connection() as conn:
+            session = self._read(conn, session_id)
+        return _apply_projection(session, projection) if session else None
+
+    def get_sessions(self, session_ids, projection=None):
+        session_ids = [str(session_id) for session_id in session_ids]
+        if not session_ids:
+            return []
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f'SELECT document FROM session_documents WHERE id IN ({", ".join("?" for _ in session_ids)})',
+                session_ids
+            ).fetchall()
+        return [_apply_projection(self._load(row[0]), projection) for row in rows]
+
+    def iter_sessions(self, projection=None, batch_size=500):
+        position = ("", "")
+        while True:
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    'SELECT ts, id, document FROM session_documents WHERE (ts, id) > (?, ?) ORDER BY ts, id LIMIT ?',
+                    (*position, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, _, document in rows:
+                yield _apply_projection(self._load(document), projection)
+            position = (rows[-1][0], rows[-1][1])
+
+    def count_sessions(self):
+        with self.pool.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM session_documents').fetchone()[0]
+
+    def list_sessions(self, filters, after, limit, summary):
+        conditions = []
+        params = []
+        if filters.get("difficulty"):
+            conditions.append("difficulty = ?")
+            params.append(filters["difficulty"])
+        if filters.get("start") is not None:
+            conditions.append("ts >= ?")
+            params.append(_sqlite_timestamp(filters["start"]))
+        if filters.get("end") is not None:
+            conditions.append("ts <= ?")
+            params.append(_sqlite_timestamp(filters["end"]))
+        if after is not None:
+            conditions.append("(ts, id) < (?, ?)")
+            params.extend([_sqlite_timestamp(after[0]), str(after[1])])
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+
+        if not summary:
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    f'SELECT document FROM session_documents {where} ORDER BY ts DESC, id DESC LIMIT ?',
+                    (*params, limit)
+                ).fetchall()
+            return [self._load(row[0]) for row in rows]
+
+        # Summary rows are assembled in SQL so large documents are never decoded
+        extracted = ", ".join(f"json_extract(document, '$.{field}')" for field in SESSION_SUMMARY_FIELDS[1:])
+        with self.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT id, json_extract(document, '$.timestamp."$date"'), {extracted},
+                       COALESCE(json_array_length(document, '$.questions'), 0),
+                       COALESCE(json_array_length(document, '$.answers'), 0)
+                FROM session_documents {where}
+                ORDER BY ts DESC, id DESC
+                LIMIT ?
+            ''', (*params, limit)).fetchall()
+        sessions = []
+        for row in rows:
+            session = {"_id": row[0]}
+            if row[1]:
+                session["timestamp"] = datetime.fromisoformat(row[1])
+            for field, value in zip(SESSION_SUMMARY_FIELDS[1:], row[2:-2]):
+                if value is not None:
+                    session[field] = json.loads(value) if field == "tags" else value
+            session["question_count"], session["answer_count"] = row[-2], row[-1]
+            sessions.append(session)
+        return sessions
+
+    def update_session(self, session_id, update, expect=None):
+        with self.pool.transaction() as conn:
+            session = self._read(conn, session_id)
+            if session is None or any(session.get(field) != value for field, value in (expect or {}).items()):
+                return WriteResult(False, False)
+            modified = _apply_update(session, update)
+            if modified:
+                self._write(conn, session)
+            return WriteResult(True, modified)
+
+    def find_and_update_session(self, session_id, update, projection=None, return_after=False):
+        with self.pool.transaction() as conn:
+            session = self._read(conn, session_id)
+            if session is None:
+                return None
+            before = _apply_projection(copy.deepcopy(session), projection)
+            if _apply_update(session, update):
+                self._write(conn, session)
+            return _apply_projection(session, projection) if return_after else before
+
+    def find_and_delete_session(self, session_id, projection=None):
+        with self.pool.transaction() as conn:
+            session = self._read(conn, session_id)
+            if session is None:
+                return None
+            conn.execute('DELETE FROM session_documents WHERE id = ?', (str(session_id),))
+            return _apply_projection(session, projection)
+
+    def set_session_scores(self, session_scores):
+        with self.pool.transaction() as conn:
+            for session_id, document in conn.execute('SELECT id, document FROM session_documents').fetchall():
+                session = self._load(document)
+                total, count = session_scores.get(session_id, (0, 0))
+                _apply_update(session, {"$set": {
+                    "score_total": total,
+                    "scored_answers": count,
+                    "avg_score": round(total / count, 2) if count else None
+                }})
+                self._write(conn, session)
+
+    def aggregate_stats(self):
+        with self.pool.connection() as conn:
+            total_sessions, total_questions, total_answers = conn.execute('''
+                SELECT COUNT(*),
+                       COALESCE(SUM(json_array_length(document, '$.questions')), 0),
+                       COALESCE(SUM(json_array_length(document, '$.answers')), 0)
+                FROM session_documents
+            ''').fetchone()
+            difficulty = conn.execute('''
+                SELECT COALESCE(json_extract(document, '$.difficulty'), 'unknown'), COUNT(*)
+                FROM session_documents GROUP BY 1
+            ''').fetchall()
+            tags = conn.execute('''
+                SELECT tag.value, COUNT(*)
+                FROM session_documents, json_each(session_documents.document, '$.tags') AS tag
+                GROUP BY tag.value
+            ''').fetchall()
+            evaluations = conn.execute('''
+                SELECT session_documents.id, evaluation.value
+                FROM session_documents, json_each(session_documents.document, '$.evaluations') AS evaluation
+                WHERE evaluation.type = 'object'
+            ''').fetchall()
+
+        session_scores = {}
+        for session_id, evaluation in evaluations:
+            score = evaluation_score(json.loads(evaluation))
+            if score is not None:
+                total, count = session_scores.get(session_id, (0.0, 0))
+                session_scores[session_id] = (total + score, count + 1)
+        return {
+            "total_sessions": total_sessions,
+            "total_questions": total_questions,
+            "total_answers": total_answers,
+            "difficulty": dict(difficulty),
+            "tags": dict(tags),
+            "session_scores": session_scores
+        }
+
+    def get_stats(self):
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT document FROM session_stats WHERE id = ?', (self.STATS_ID,)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def increment_stats(self, increments):
+        with self.pool.transaction() as conn:
+            row = conn.execute('SELECT document FROM session_stats WHERE id = ?', (self.STATS_ID,)).fetchone()
+            stats = self._load(row[0]) if row else {"_id": self.STATS_ID}
+            _apply_update(stats, {"$inc": increments})
+            conn.execute(
+                'INSERT OR REPLACE INTO session_stats (id, document) VALUES (?, ?)',
+                (self.STATS_ID, json.dumps(stats, default=_json_default))
+            )
+
+    def replace_stats(self, stats):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO session_stats (id, document) VALUES (?, ?)',
+                (self.STATS_ID, json.dumps({"_id": self.STATS_ID, **stats}, default=_json_default))
+            )
+
+    def get_tag(self, name):
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT id, name, color, created_at FROM tags WHERE name = ?', (name,)).fetchone()
+        return {"_id": row[0], "name": row[1], "color": row[2], "created_at": row[3]} if row else None
+
+    def insert_tag(self, name, color):
+        tag_id = str(ObjectId())
+        with self.pool.transaction() as conn:
+            conn.execute(
+                'INSERT INTO tags (id, name, color, created_at) VALUES (?, ?, ?, ?)',
+                (tag_id, name, color, datetime.now().isoformat())
+            )
+        return tag_id
+
+    def link_tag(self, session_id, tag_name):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                'INSERT INTO session_tags (session_id, tag_name, added_at) VALUES (?, ?, ?)',
+                (session_id, tag_name, datetime.now().isoformat())
+            )
+
+class TimedSessionRepository:
+    """Wraps a SessionRepository, timing each call as a storage_read or storage_write stage"""
+
+    READ_METHODS = {
+        "get_session", "get_sessions", "count_sessions", "list_sessions",
+        "aggregate_stats", "get_stats", "get_tag"
+    }
+
+    def __init__(self, repository: SessionRepository):
+        self._repository = repository
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._repository, name)
+        # iter_sessions is a lazy generator; timing its creation would measure nothing
+        if not callable(attribute) or name == "iter_sessions":
+            return attribute
+        stage = "storage_read" if name in self.READ_METHODS else "storage_write"
+
+        @functools.wraps(attribute)
+        def timed(*args, **kwargs):
+            with metrics.timer(stage):
+                return attribute(*args, **kwargs)
+        return timed
+
+def create_session_repository(backend: str) -> SessionRepository:
+    if backend == "sqlite":
+        logger.info(f"Using local SQLite session storage at {STORAGE_DB_PATH}")
+        return SQLiteSessionRepository(STORAGE_DB_PATH, SQLITE_POOL_SIZE)
+    return MongoSessionRepository(db)
+
+# MongoDB connection (lazy; nothing connects unless a Mongo-backed store is used)
+client = MongoClient(MONGODB_URI, connect=False)
+db = client["interview_db"]
+
+session_repository = TimedSessionRepository(create_session_repository(STORAGE_BACKEND))
+
+def get_openrouter_headers():
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "http://localhost:3000",
+        "X-Title": "Interview Assistant"
+    }
+    return headers
+
+class LLMRequestError(Exception):
+    """Raised when a chat completion request fails after all retries"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class CircuitOpenError(LLMRequestError):
+    """Raised without contacting the API while the circuit breaker is open"""
+
+class CircuitBreaker:
+    """Stops calling an upstream after repeated failures until a cooldown has passed"""
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        # A half-open breaker lets requests through; the next result closes or re-opens it
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class LLMRejectedError(LLMRequestError):
+    """Raised without contacting the API when the scheduler sheds a request (lane queue full or deadline missed)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message, status_code=503, retry_after=retry_after)
+
+# Scheduler lane and fairness owner (usually the session id) for LLM requests made in the current task
+llm_lane_var = contextvars.ContextVar("llm_lane", default=("evaluation", None))
+
+@contextmanager
+def llm_lane(lane: str, owner: Optional[str] = None):
+    """Send the LLM requests made inside the block through the given scheduler lane on behalf of owner"""
+    token = llm_lane_var.set((lane, owner))
+    try:
+        yield
+    finally:
+        llm_lane_var.reset(token)
+
+def estimate_tokens(payload: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion: ~4 characters per prompt token plus the completion budget"""
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+    return prompt_chars // 4 + int(payload.get("max_tokens", 1000))
+
+class LLMScheduler:
+    """Paces chat completion requests under the upstream rate limit.
+
+    Two token buckets (requests and estimated tokens per minute) decide when the next request may go out.
+    Waiting requests are served strictly by lane priority and round-robin across owners within a lane;
+    a request is shed when its lane's queue is full or it can no longer start before its deadline.
+    """
+
+    LANES = ("interactive", "evaluation", "bulk")
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, burst: int, queue_limit: int,
+                 deadlines: Dict[str, float]):
+        self.enabled = requests_per_minute > 0
+        self.request_rate = requests_per_minute / 60
+        self.token_rate = tokens_per_minute / 60
+        self.request_capacity = float(max(1, burst))
+        self.token_capacity = float(tokens_per_minute)
+        self.queue_limit = queue_limit
+        self.deadlines = deadlines
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        # lane -> owner -> waiting requests; owners are rotated to the back after each grant
+        self._queues = {lane: OrderedDict() for lane in self.LANES}
+        self._wakeup = None
+        self._dispatcher = None
+        self.counts = {lane: {"granted": 0, "queue_full": 0, "deadline": 0} for lane in self.LANES}
+        self.total_wait = {lane: 0.0 for lane in self.LANES}
+
+    def depth(self, lane: Optional[str] = None) -> int:
+        lanes = [lane] if lane else self.LANES
+        return sum(len(waiters) for name in lanes for waiters in self._queues[name].values())
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self.request_rate)
+        if self.token_rate:
+            self._tokens = min(self.token_capacity, self._tokens + elapsed * self.token_rate)
+
+    def _delay(self, tokens: int, now: float) -> float:
+        """Seconds until both buckets can pay for a request of this many tokens"""
+        self._refill(now)
+        delay = max(0.0, self._paused_until - now)
+        if self._requests < 1:
+            delay = max(delay, (1 - self._requests) / self.request_rate)
+        if self.token_rate:
+            needed = min(tokens, self.token_capacity)
+            if self._tokens < needed:
+                delay = max(delay, (needed - self._tokens) / self.token_rate)
+        return delay
+
+    def _retry_after(self, lane: str) -> int:
+        ahead = sum(self.depth(name) for name in self.LANES[:self.LANES.index(lane) + 1])
+        return max(1, int((ahead + 1) / self.request_rate + 0.999))
+
+    def _reject(self, waiter: Dict[str, Any], reason: str, message: str):
+        self.counts[waiter["lane"]][reason] += 1
+        metrics.inc("llm_scheduler_requests_total", lane=waiter["lane"], outcome=reason)
+        if not waiter["future"].done():
+            waiter["future"].set_exception(LLMRejectedError(message, self._retry_after(waiter["lane"])))
+
+    async def acquire(self, tokens: int):
+        """Wait for this request's turn under the rate limit; raises LLMRejectedError if it is shed"""
+        if not self.enabled:
+            return
+        lane, owner = llm_lane_var.get()
+        lane = lane if lane in self._queues else "evaluation"
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        waiter = {"future": loop.create_future(), "tokens": tokens, "lane": lane, "owner": owner,
+                  "enqueued_at": now, "deadline": now + self.deadlines.get(lane, 120)}
+
+        if self.depth(lane) >= self.queue_limit:
+            self._reject(waiter, "queue_full", f"LLM {lane} queue is full")
+            return await waiter["future"]
+        # Everything queued in this lane or a more urgent one goes first
+        ahead = sum(self.depth(name) for name in self.LANES[:self.LANES.index(lane) + 1])
+        if max(0.0, self._paused_until - now) + ahead / self.request_rate > waiter["deadline"] - now:
+            self._reject(waiter, "deadline", f"LLM {lane} request cannot start before its deadline")
+            return await waiter["future"]
+
+        self._queues[lane].setdefault(owner, deque()).append(waiter)
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await waiter["future"]
+
+    def _next_waiter(self, now: float) -> Optional[Dict[str, Any]]:
+        """Head of the most urgent non-empty lane, taking owners in turn; drops cancelled and expired requests"""
+        for lane in self.LANES:
+            owners = self._queues[lane]
+            for owner in list(owners):
+                waiters = owners[owner]
+                while waiters and (waiters[0]["future"].done() or waiters[0]["deadline"] <= now):
+                    waiter = waiters.popleft()
+                    if not waiter["future"].done():
+                        self._reject(waiter, "deadline", f"LLM {lane} request expired in the queue")
+                if not waiters:
+                    del owners[owner]
+                    continue
+                return waiters[0]
+        return None
+
+    async def _dispatch(self):
+        while True:
+            now = time.monotonic()
+            waiter = self._next_waiter(now)
+            if waiter is None:
+                return
+            delay = self._delay(waiter["tokens"], now)
+            if delay > 0:
+                if now + delay > waiter["deadline"]:
+                    self._queues[waiter["lane"]][waiter["owner"]].popleft()
+                    self._reject(waiter, "deadline", f"LLM {waiter['lane']} request cannot start before its deadline")
+                    continue
+                # Wake early when a request arrives; it may belong to a more urgent lane
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            owner = waiter["owner"]
+            owners = self._queues[waiter["lane"]]
+            owners[owner].popleft()
+            if owners[owner]:
+                owners.move_to_end(owner)
+            else:
+                del owners[owner]
+            self._requests -= 1
+            if self.token_rate:
+                self._tokens -= min(waiter["tokens"], self.token_capacity)
+
+            wait = now - waiter["enqueued_at"]
+            lane = waiter["lane"]
+            self.counts[lane]["granted"] += 1
+            self.total_wait[lane] += wait
+            metrics.inc("llm_scheduler_requests_total", lane=lane, outcome="granted")
+            metrics.observe("llm_queue_wait_seconds", wait, lane=lane)
+            waiter["future"].set_result(None)
+
+    def record_usage(self, estimated: int, actual: Optional[int]):
+        """Settle the token bucket with the usage the API reported for a request charged at estimated"""
+        if self.enabled and self.token_rate and actual is not None:
+            self._tokens = min(self.token_capacity, self._tokens + estimated - actual)
+
+    def penalize(self, retry_after: float):
+        """Hold all dispatch after the upstream answered 429"""
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._requests = min(self._requests, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "requests_per_minute": self.request_rate * 60,
+            "tokens_per_minute": self.token_rate * 60,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "lanes": {
+                lane: {
+                    "depth": self.depth(lane),
+                    "owners": len(self._queues[lane]),
+                    **self.counts[lane],
+                    "avg_wait": round(self.total_wait[lane] / self.counts[lane]["granted"], 3)
+                    if self.counts[lane]["granted"] else 0.0
+                }
+                for lane in self.LANES
+            }
+        }
+
+llm_scheduler = LLMScheduler(
+    LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM, LLM_RATE_BURST, LLM_QUEUE_LIMIT, LLM_LANE_DEADLINES
+)
+metrics.describe("llm_scheduler_requests_total", "counter",
+                 "LLM requests leaving the scheduler by lane and outcome (granted, queue_full, deadline)")
+metrics.describe("llm_queue_wait_seconds", "histogram", "Time LLM requests waited in the scheduler by lane")
+metrics.gauge("llm_queue_depth", "LLM requests waiting in the scheduler by lane",
+              lambda: {lane: llm_scheduler.depth(lane) for lane in LLMScheduler.LANES}, label="lane")
+
+def llm_http_exception(e: LLMRequestError, action: str) -> HTTPException:
+    """HTTP error for a failed LLM call: 503 with Retry-After when the client should come back later"""
+    if isinstance(e, (CircuitOpenError, LLMRejectedError)) or e.status_code == 429:
+        retry_after = e.retry_after or int(
+            OPENROUTER_BREAKER_COOLDOWN if isinstance(e, CircuitOpenError) else OPENROUTER_BACKOFF_MAX
+        )
+        return HTTPException(status_code=503, detail=f"{action}: {str(e)}", headers={"Retry-After": str(retry_after)})
+    return HTTPException(status_code=500, detail=f"{action}: {str(e)}")
+
+class OpenRouterClient:
+    """Shared async chat completion client with keep-alive pooling, retries and a circuit breaker"""
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, url: str, max_connections: int, max_retries: int, timeout: float,
+                 breaker: CircuitBreaker):
+        self.url = url
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.breaker = breaker
+        self._client = None
+        self._host_limits = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_connections)
+        return self._host_limits[host]
+
+    @staticmethod
+    def _backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), OPENROUTER_BACKOFF_MAX)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(OPENROUTER_BACKOFF_MAX, OPENROUTER_BACKOFF_BASE * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_json(body: str) -> Dict[str, Any]:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            raise LLMRequestError(f"Malformed response from OpenRouter: {body[:200]}", status_code=502)
+        return data
+
+    async def chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("OpenRouter circuit breaker is open", status_code=503)
+
+        tokens = estimate_tokens(payload)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            response = None
+            await llm_scheduler.acquire(tokens)
+            try:
+                async with self._host_limit(self.url):
+                    with metrics.timer("llm_request"):
+                        response = await self._get_client().post(
+                            self.url,
+                            headers=get_openrouter_headers(),
+                            json=payload
+                        )
+                metrics.inc("llm_requests_total", status=response.status_code)
+                if response.status_code == 200:
+                    try:
+                        data = self._parse_json(response.text)
+                    except LLMRequestError as e:
+                        # A truncated or non-JSON body is retried like a bad gateway
+                        error = e
+                    else:
+                        self.breaker.record_success()
+                        llm_scheduler.record_usage(tokens, (data.get("usage") or {}).get("total_tokens"))
+                        return data
+                else:
+                    if response.status_code == 429:
+                        llm_scheduler.penalize(self._backoff_delay(attempt, response))
+                    error = LLMRequestError(response.text, status_code=response.status_code)
+                    if response.status_code not in self.RETRYABLE_STATUS:
+                        raise error
+            except httpx.TimeoutException:
+                error = LLMRequestError("Request timed out", status_code=504)
+                metrics.inc("llm_requests_total", status="timeout")
+            except httpx.TransportError as e:
+                error = LLMRequestError(f"Request failed: {str(e)}", status_code=502)
+                metrics.inc("llm_requests_total", status="transport_error")
+
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response)
+                logger.warning(f"OpenRouter request failed ({error.status_code}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        self.breaker.record_failure()
+        raise error
+
+    async def stream_chat_completion(self, payload: Dict[str, Any]):
+        """Yield content deltas from a streamed (stream: true) chat completion"""
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("OpenRouter circuit breaker is open", status_code=503)
+
+        tokens = estimate_tokens(payload)
+        error = None
+        started = False
+        for attempt in range(self.max_retries + 1):
+            response_status = None
+            await llm_scheduler.acquire(tokens)
+            try:
+                async with self._host_limit(self.url):
+                    with metrics.timer("llm_request"):
+                        async with self._get_client().stream(
+                            "POST",
+                            self.url,
+                            headers=get_openrouter_headers(),
+                            json=payload
+                        ) as response:
+                            response_status = response.status_code
+                            metrics.inc("llm_requests_total", status=response_status)
+                            if response.status_code == 429:
+                                llm_scheduler.penalize(self._backoff_delay(attempt, response))
+                            if response.status_code != 200:
+                                error = LLMRequestError((await response.aread()).decode("utf-8", "replace"),
+                                                        status_code=response.status_code)
+                            else:
+                                error = None
+                                async for line in response.aiter_lines():
+                                    # Server-sent events: skip keep-alive comments and blank separators
+                                    if not line.startswith("data:"):
+                                        continue
+                                    data = line[5:].strip()
+                                    if data == "[DONE]":
+                                        break
+                                    try:
+                                        chunk = self._parse_json(data)
+                                    except LLMRequestError as e:
+                                        error = e
+                                        response_status = e.status_code
+                                        break
+                                    if chunk.get("error"):
+                                        raise LLMRequestError(json.dumps(chunk["error"]), status_code=502)
+                                    choices = chunk.get("choices") or [{}]
+                                    delta = choices[0].get("delta", {}).get("content")
+                                    if delta:
+                                        started = True
+                                        yield delta
+                                if error is None:
+                                    self.breaker.record_success()
+                                    return
+                if response_status not in self.RETRYABLE_STATUS:
+                    raise error
+            except httpx.TimeoutException:
+                error = LLMRequestError("Request timed out", status_code=504)
+                metrics.inc("llm_requests_total", status="timeout")
+            except httpx.TransportError as e:
+                error = LLMRequestError(f"Request failed: {str(e)}", status_code=502)
+                metrics.inc("llm_requests_total", status="transport_error")
+
+            # Retrying is only safe until the first delta has been delivered
+            if attempt < self.max_retries and not started:
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"OpenRouter stream request failed ({error.status_code}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            else:
+                break
+
+        self.breaker.record_failure()
+        raise error
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_limits = {}
+
+openrouter_client = OpenRouterClient(
+    OPENROUTER_URL,
+    max_connections=OPENROUTER_MAX_CONNECTIONS,
+    max_retries=OPENROUTER_MAX_RETRIES,
+    timeout=OPENROUTER_TIMEOUT,
+    breaker=CircuitBreaker(OPENROUTER_BREAKER_THRESHOLD, OPENROUTER_BREAKER_COOLDOWN)
+)
+
+@app.on_event("shutdown")
+async def close_openrouter_client():
+    await openrouter_client.aclose()
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Extract text from pages [start, end) with pdfplumber's layout analysis"""
+    text = []
+    with pdfplumber.open(file_path, pages=list(range(start + 1, end + 1))) as pdf:
+        for i, page in enumerate(pdf.pages, start=start):
+            try:
+                text.append(page.extract_text() or "")
+            except Exception as e:
+                logger.error(f"Error extracting text from page {i+1}: {str(e)}")
+                text.append("")  # Add empty string for failed pages
+    return text
+
+def _extract_text_layer(file_path: str, max_pages: int) -> Optional[List[str]]:
+    """Read the embedded text layer with pdfium, without layout analysis"""
+    if pypdfium2 is None:
+        return None
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        text = []
+        for i in range(min(len(pdf), max_pages)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return text
+    finally:
+        pdf.close()
+
+_pdf_pool = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max(1, PDF_WORKERS),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+@app.on_event("shutdown")
+async def stop_pdf_workers():
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+
+def _page_count(file_path: str) -> int:
+    if pypdfium2 is not None:
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+def _extract_pages_parallel(file_path: str, page_count: int, target_chars: int) -> List[str]:
+    """Extract page ranges in a process pool, stopping once enough leading text is available"""
+    ranges = [
+        (start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+    if len(ranges) == 1 or PDF_WORKERS <= 1:
+        text = []
+        for start, end in ranges:
+            text.extend(_extract_page_range(file_path, start, end))
+            if sum(len(page) for page in text) >= target_chars:
+                break
+        return text
+
+    pool = _get_pdf_pool()
+    futures = [pool.submit(_extract_page_range, file_path, start, end) for start, end in ranges]
+    text = []
+    try:
+        # Results are consumed in page order so the early stop keeps the start of the document
+        for future in futures:
+            text.extend(future.result())
+            if sum(len(page) for page in text) >= target_chars:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    return text
+
+def extract_text_from_pdf(file_path: str, max_pages: int = PDF_MAX_PAGES,
+                          target_chars: int = PDF_TARGET_CHARS, fast_path: bool = True) -> str:
+    """Extract text from a PDF file within the page/byte budget.
+
+    The embedded text layer is tried first; full pdfplumber layout analysis (page-parallel)
+    is only used when that yields too little text, e.g. for unusual encodings.
+    """
+    try:
+        file_size = os.path.getsize(file_path)
+        if file_size > PDF_MAX_BYTES:
+            raise ValueError(f"PDF is {file_size} bytes, the limit is {PDF_MAX_BYTES} bytes")
+
+        logger.info(f"Opening PDF file: {file_path}")
+        page_count = min(_page_count(file_path), max_pages)
+        logger.info(f"PDF opened successfully. Extracting {page_count} pages")
+
+        text = None
+        if fast_path:
+            try:
+                text = _extract_text_layer(file_path, page_count)
+            except Exception as e:
+                logger.warning(f"Text-layer extraction failed, falling back to pdfplumber: {str(e)}")
+                text = None
+            if text is not None:
+                characters = sum(len(page.strip()) for page in text)
+                if characters < PDF_FAST_PATH_MIN_CHARS_PER_PAGE * max(1, len(text)) and characters < target_chars:
+                    logger.info(f"Text layer too sparse ({characters} characters), using pdfplumber")
+                    text = None
+
+        if text is None:
+            text = _extract_pages_parallel(file_path, page_count, target_chars)
+
+        result = "\n".join(text)
+        if len(result) > target_chars:
+            result = result[:target_chars]
+        logger.info(f"Total extracted text length: {len(result)} characters")
+        return result
+    except Exception as e:
+        logger.error(f"Error in extract_text_from_pdf: {str(e)}")
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+async def generate_questions(resume_text: str, params: InterviewParams) -> List[Dict[str, str]]:
+    try:
+        logger.info("Generating questions using OpenRouter API")
+        prompt = (
+            f"Generate {params.num_questions} technical interview questions based on this resume. "
+            f"Focus on:\n"
+            f"  1. Core technical skills mentioned\n"
+            f"  2. Tools and technologies actually used\n"
+            f"  3. Work experience and contribution-based scenarios\n"
+            f"  4. At least 1 question around a challenge faced in projects\n"
+            f"  5. 1–2 behavioral questions tied to leadership/teamwork if applicable\n"
+            f"- Do NOT ask generic questions. Only ask what is directly relevant.\n\n"
+            f"Resume Summary:\n{resume_text}\n\n"
+            f"Return exactly {params.num_questions} numbered questions in a clear list."
+        )
+
+        payload = {
+            "model": "meta-llama/llama-4-maverick:free",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 1000
+        }
+
+        logger.info("Sending request to OpenRouter API")
+        log_payload("OpenRouter request payload", payload)
+        try:
+            response_data = await openrouter_client.chat_completion(payload)
+        except LLMRequestError as e:
+            logger.error(f"OpenRouter API error: {e.status_code} - {str(e)}")
+            raise llm_http_exception(e, "Failed to generate questions")
+
+        log_payload("Response data", response_data)
+
+        if "choices" not in response_data or not response_data["choices"]:
+            logger.error("No choices in response data")
+            raise HTTPException(status_code=500, detail="Invalid response format from API")
+
+        content = response_data["choices"][0]["message"]["content"]
+        log_payload("Raw response content", content)
+
+        # Process the response and format questions
+        questions = []
+        for line in content.split('\n'):
+            if line.strip() and line[0].isdigit():
+                questions.append({"question": line.strip()})
+        
+        logger.info(f"Generated {len(questions)} questions")
+        return questions
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in generate_questions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+class QuestionCache:
+    """Persistent cache of generated question sets keyed on resume fingerprint and interview parameters"""
+
+    def __init__(self, db_path: str, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS question_cache (
+                cache_key TEXT PRIMARY KEY,
+                questions TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        ''')
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        # Ignore layout differences between extractions of the same resume
+        text = unicodedata.normalize("NFKC", text)
+        return " ".join(text.lower().split())
+
+    @classmethod
+    def make_key(cls, resume_text: str, params: InterviewParams) -> str:
+        digest = hashlib.sha256(cls.normalize_text(resume_text).encode("utf-8"))
+        digest.update(json.dumps(params.dict(), sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT questions, created_at FROM question_cache WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM question_cache WHERE cache_key = ?', (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE question_cache SET hits = hits + 1 WHERE cache_key = ?', (key,))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, questions: List[Dict[str, str]], created_at: Optional[float] = None):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO question_cache (cache_key, questions, created_at, hits) VALUES (?, ?, ?, 0)',
+                (key, json.dumps(questions), created_at or time.time())
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM question_cache').fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "ttl_seconds": self.ttl
+            }
+
+question_cache = QuestionCache(QUESTION_CACHE_DB_PATH, QUESTION_CACHE_TTL)
+
+async def get_or_generate_questions(resume_text: str, params: InterviewParams, fresh: bool = False) -> List[Dict[str, str]]:
+    """Return the cached question set for this resume and parameters, generating it on a miss.
+
+    fresh=True skips the lookup and replaces the cached set with a newly generated variant.
+    """
+    if QUESTION_CACHE_TTL <= 0:
+        return await generate_questions(resume_text, params)
+
+    cache_key = QuestionCache.make_key(resume_text, params)
+    if fresh:
+        question_cache.bypassed += 1
+    else:
+        cached = question_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Question cache hit")
+            return cached
+
+    questions = await generate_questions(resume_text, params)
+    if questions:
+        question_cache.put(cache_key, questions)
+    return questions
+
+class AudioConversionError(Exception):
+    """Raised when the uploaded audio cannot be decoded"""
+
+def decode_audio(audio_data: bytes, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Decode compressed audio (e.g. webm/opus) in memory into a mono float32 array via ffmpeg pipes"""
+    process = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "f32le", "-ac", "1", "-ar", str(sample_rate),
+            "pipe:1"
+        ],
+        input=audio_data,
+        capture_output=True
+    )
+    if process.returncode != 0:
+        raise AudioConversionError(process.stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+    # Zero-copy view over ffmpeg's output; Whisper only reads it
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+def detect_speech_segments(
+    samples: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    frame_ms: int = VAD_FRAME_MS,
+    min_rms: float = VAD_MIN_RMS,
+    min_silence: float = VAD_MIN_SILENCE
+) -> List[tuple]:
+    """Find speech as (start, end) sample ranges using frame energy; pauses shorter than min_silence are bridged"""
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return []
+
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    # Adapt to the recording's noise floor so a noisy mic is not all "speech",
+    # without letting a pause-free recording push the threshold above its own voice
+    noise_floor, loud = np.percentile(rms, [10, 90])
+    threshold = max(min_rms, min(float(noise_floor) * 3, float(loud) * 0.5))
+    voiced = rms > threshold
+
+    segments = []
+    max_gap = int(min_silence * 1000 / frame_ms)
+    start = None
+    last_voiced = None
+    for index in np.flatnonzero(voiced):
+        if start is None:
+            start = index
+        elif index - last_voiced > max_gap:
+            segments.append((int(start) * frame_length, int(last_voiced + 1) * frame_length))
+            start = index
+        last_voiced = index
+    if start is not None:
+        segments.append((int(start) * frame_length, int(last_voiced + 1) * frame_length))
+    return segments
+
+class TranscriptionCache:
+    """Bounded LRU cache of transcripts keyed on audio content and Whisper options"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio_data: bytes, options: Dict[str, Any]) -> str:
+        digest = hashlib.sha256(audio_data)
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, transcription: str):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = transcription
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+transcription_cache = TranscriptionCache(TRANSCRIPTION_CACHE_SIZE)
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference admission queue is saturated"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Transcription queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class TranscriptionEngine:
+    """Speech-to-text backend loaded once per inference worker process"""
+
+    name = ""
+
+    def __init__(self, model_name: str, threads: int = 0):
+        self.model_name = model_name
+        self.threads = threads
+
+    def transcribe(self, samples: np.ndarray, options: Dict[str, Any]) -> str:
+        """Transcribe 16kHz mono float32 samples with the given Whisper decoding options"""
+        raise NotImplementedError
+
+    def transcribe_batch(self, windows: List[np.ndarray], options: Dict[str, Any]) -> List[str]:
+        """Transcribe windows of at most WHISPER_WINDOW_SECONDS each; engines without batching run them in turn"""
+        return [self.transcribe(window, options) for window in windows]
+
+class OpenAIWhisperEngine(TranscriptionEngine):
+    """Reference openai-whisper model running in fp32 PyTorch"""
+
+    name = "openai-whisper"
+
+    def __init__(self, model_name: str, threads: int = 0):
+        super().__init__(model_name, threads)
+        # Whisper (and torch) are only imported by the inference worker processes
+        import torch
+        import whisper
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.model = whisper.load_model(model_name)
+
+    def transcribe(self, samples: np.ndarray, options: Dict[str, Any]) -> str:
+        return self.model.transcribe(samples, **options)["text"]
+
+    def transcribe_batch(self, windows: List[np.ndarray], options: Dict[str, Any]) -> List[str]:
+        import torch
+        import whisper
+
+        # Pad every window to 30s of log-mel frames so they stack into one encoder/decoder pass
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(window), self.model.dims.n_mels) for window in windows
+        ]).to(self.model.device)
+        decoding_options = whisper.DecodingOptions(
+            task=options.get("task", "transcribe"),
+            language=options.get("language"),
+            temperature=options.get("temperature", 0.0),
+            prompt=options.get("initial_prompt"),
+            without_timestamps=True,
+            fp16=self.model.device.type != "cpu"
+        )
+        results = whisper.decode(self.model, mels, decoding_options)
+        # Same silence test transcribe() applies, so padded or empty windows do not produce hallucinated text
+        return [
+            "" if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0 else result.text
+            for result in results
+        ]
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """CTranslate2 port of the same Whisper weights, quantized (int8 by default) for CPU inference"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name: str, threads: int = 0, compute_type: str = WHISPER_COMPUTE_TYPE):
+        super().__init__(model_name, threads)
+        from faster_whisper import WhisperModel
+
+        self.compute_type = compute_type
+        self.model = WhisperModel(model_name, device="cpu", compute_type=compute_type, cpu_threads=threads)
+
+    def transcribe(self, samples: np.ndarray, options: Dict[str, Any]) -> str:
+        # openai-whisper draws a single sample at temperature > 0; faster-whisper defaults to five
+        segments, _ = self.model.transcribe(samples, best_of=1, **options)
+        # Segments are decoded lazily as the generator is consumed
+        return "".join(segment.text for segment in segments)
+
+def create_transcription_engine(backend: str, model_name: str, threads: int = 0) -> TranscriptionEngine:
+    if backend == "faster-whisper":
+        return FasterWhisperEngine(model_name, threads)
+    if backend != "openai-whisper":
+        raise ValueError(f"Unknown transcription backend: {backend}")
+    return OpenAIWhisperEngine(model_name, threads)
+
+# Transcription engine held by each inference worker process
+_worker_engine = None
+
+def _init_inference_worker(backend: str, model_name: str, threads: int):
+    global _worker_engine
+    _worker_engine = create_transcription_engine(backend, model_name, threads)
+
+def _warm_up_inference_worker() -> int:
+    # The initializer has loaded the model by the time any job runs
+    return os.getpid()
+
+def trim_silence(
+    samples: np.ndarray,
+    padding_ms: int = VAD_PADDING_MS,
+    min_speech: float = VAD_MIN_SPEECH
+) -> Tuple[np.ndarray, List[int]]:
+    """Drop leading/trailing silence and pauses, keeping padding around each speech segment
+
+    Returns the concatenated speech and the sample positions in it where a pause was cut out,
+    or empty audio and no cuts when there is less than min_speech seconds of speech.
+    """
+    padding = padding_ms * WHISPER_SAMPLE_RATE // 1000
+    spans = []
+    for start, end in detect_speech_segments(samples):
+        start, end = max(0, start - padding), min(len(samples), end + padding)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+
+    cuts = []
+    position = 0
+    for start, end in spans:
+        if position:
+            cuts.append(position)
+        position += end - start
+    if position < min_speech * WHISPER_SAMPLE_RATE:
+        return samples[:0], []
+    if len(spans) == 1 and spans[0] == (0, len(samples)):
+        return samples, cuts
+    return np.concatenate([samples[start:end] for start, end in spans]), cuts
+
+def prepare_speech(samples: np.ndarray) -> Tuple[np.ndarray, Optional[List[int]]]:
+    """The audio Whisper should see: speech only when VAD_TRIM_SILENCE is on, otherwise all of it.
+
+    Also returns where pauses were cut out of it, or None for untrimmed audio.
+    """
+    if not VAD_TRIM_SILENCE:
+        return samples, None
+    return trim_silence(samples)
+
+def _speech_metrics(audio: np.ndarray, speech: np.ndarray) -> Dict[str, Any]:
+    return {
+        "recordings": 1,
+        "audio_seconds": len(audio) / WHISPER_SAMPLE_RATE,
+        "speech_seconds": len(speech) / WHISPER_SAMPLE_RATE,
+        # Recordings with no speech left never reach the model
+        "skipped": int(bool(audio.size) and not speech.size)
+    }
+
+def _run_transcription_job(audio_data: bytes, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode and transcribe one recording inside an inference worker process"""
+    started_at = time.time()
+
+    # Decode straight from memory into the 16kHz mono samples Whisper expects
+    try:
+        audio = decode_audio(audio_data)
+    except AudioConversionError:
+        raise
+    except Exception as e:
+        raise AudioConversionError(str(e))
+    decode_seconds = time.time() - started_at
+
+    # A single recording goes through transcribe(), which does its own 30s windowing
+    speech = prepare_speech(audio)[0]
+    return {
+        **_transcribe_samples(speech, options, started_at),
+        **_speech_metrics(audio, speech),
+        "decode_seconds": decode_seconds
+    }
+
+def split_into_windows(
+    samples: np.ndarray,
+    max_seconds: int = WHISPER_WINDOW_SECONDS,
+    pauses: Optional[List[int]] = None
+) -> List[np.ndarray]:
+    """Cut audio into Whisper-sized windows, preferring cuts in the pauses between speech segments"""
+    limit = max_seconds * WHISPER_SAMPLE_RATE
+    if len(samples) <= limit:
+        return [samples]
+
+    if pauses is None:
+        segments = detect_speech_segments(samples)
+        pauses = [(previous_end + next_start) // 2 for (_, previous_end), (next_start, _) in zip(segments, segments[1:])]
+    windows = []
+    start = 0
+    while len(samples) - start > limit:
+        fitting = [pause for pause in pauses if start < pause <= start + limit]
+        # Without a pause in range the cut falls mid-speech at the window limit
+        end = fitting[-1] if fitting else start + limit
+        windows.append(samples[start:end])
+        start = end
+    windows.append(samples[start:])
+    return windows
+
+def _run_batch_transcription_job(items: List[Any], options: Dict[str, Any], max_windows: int) -> Dict[str, Any]:
+    """Transcribe several recordings (encoded bytes or decoded samples) with batched passes in an inference worker"""
+    started_at = time.time()
+    results = [None] * len(items)
+    windows = []
+    owners = []
+    speech_stats = []
+    decode_seconds = 0.0
+    for index, item in enumerate(items):
+        if isinstance(item, (bytes, bytearray)):
+            decode_started = time.perf_counter()
+            try:
+                item = decode_audio(bytes(item))
+            except Exception as e:
+                # One undecodable upload must not fail the rest of the batch
+                results[index] = {"error": str(e)}
+                continue
+            finally:
+                decode_seconds += time.perf_counter() - decode_started
+        speech, cuts = prepare_speech(item)
+        speech_stats.append(_speech_metrics(item, speech))
+        if speech.size:
+            # Trimmed audio has no long pauses left; cut windows where silence was removed instead
+            for window in split_into_windows(speech, pauses=cuts):
+                windows.append(window)
+                owners.append(index)
+
+    texts = []
+    for start in range(0, len(windows), max(1, max_windows)):
+        texts.extend(_worker_engine.transcribe_batch(windows[start:start + max_windows], options))
+
+    parts = defaultdict(list)
+    for owner, text in zip(owners, texts):
+        if text.strip():
+            parts[owner].append(text.strip())
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = {"text": " ".join(parts[index])}
+    return {
+        "results": results,
+        "windows": len(windows),
+        "decode_seconds": decode_seconds,
+        **{key: sum(stats[key] for stats in speech_stats) for key in ("recordings", "audio_seconds", "speech_seconds", "skipped")},
+        "started_at": started_at,
+        "finished_at": time.time()
+    }
+
+def _run_samples_transcription_job(samples: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcribe already-decoded 16kHz samples inside an inference worker process"""
+    return _transcribe_samples(samples, options, time.time())
+
+def _transcribe_samples(samples: np.ndarray, options: Dict[str, Any], started_at: float) -> Dict[str, Any]:
+    text = _worker_engine.transcribe(samples, options) if samples.size else ""
+    return {
+        "text": text,
+        "started_at": started_at,
+        "finished_at": time.time()
+    }
+
+class InferenceExecutor:
+    """Runs Whisper jobs in a process pool behind a bounded admission queue"""
+
+    def __init__(self, backend: str, model_name: str, threads: int, workers: int, queue_size: int, batch_size: int = 1):
+        self.backend = backend
+        self.model_name = model_name
+        self.threads = threads
+        self.workers = max(1, workers)
+        # Capacity is counted in recordings; with micro-batching each worker takes a whole batch at once
+        self.capacity = self.workers * max(1, batch_size) + max(0, queue_size)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.total_inference = 0.0
+        # Silence trimming: uploaded audio vs. what was left for the model, and recordings with no speech at all
+        self.trimmed_recordings = 0
+        self.total_audio_seconds = 0.0
+        self.total_speech_seconds = 0.0
+        self.skipped_recordings = 0
+        self.recent_jobs = deque(maxlen=50)
+        # "cold" until a worker has loaded the model, then "loading", "ready" or "failed"
+        self.model_state = "cold"
+        self.model_error = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._pool is None:
+            logger.info(f"Starting {self.workers} inference workers with {self.backend} model '{self.model_name}'")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_inference_worker,
+                initargs=(self.backend, self.model_name, self.threads)
+            )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.model_state = "cold"
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """Start every worker process so the model is loaded before the first transcription"""
+        self.start()
+        self.model_state = "loading"
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            # Each job submitted while no worker is idle spawns another worker process
+            await asyncio.gather(*(
+                loop.run_in_executor(self._pool, _warm_up_inference_worker) for _ in range(self.workers)
+            ))
+        except Exception as e:
+            logger.error(f"Error warming up inference workers: {str(e)}")
+            if isinstance(e, BrokenProcessPool):
+                self.shutdown()
+            self.model_state = "failed"
+            self.model_error = str(e)
+            raise
+        self.model_state = "ready"
+        self.model_error = None
+        logger.info(f"Inference workers warmed up in {time.perf_counter() - started:.1f}s")
+        return {"workers": self.workers, "seconds": round(time.perf_counter() - started, 3)}
+
+    def retry_after(self) -> int:
+        """Estimate how many seconds until a queue slot frees up"""
+        average = self.total_inference / self.completed if self.completed else 5.0
+        return max(1, int(average * self.pending / self.workers + 0.999))
+
+    def reserve(self, jobs: int = 1):
+        """Admit jobs into the queue, or raise InferenceQueueFull if there is no room"""
+        with self._lock:
+            if self.pending + jobs > self.capacity:
+                self.rejected += jobs
+                raise InferenceQueueFull(self.retry_after())
+            self.pending += jobs
+
+    async def run(self, fn, *args) -> Dict[str, Any]:
+        self.reserve()
+        return await self.execute(fn, *args)
+
+    async def execute(self, fn, *args, jobs: int = 1) -> Dict[str, Any]:
+        """Run fn in a worker for jobs already admitted with reserve(), releasing them when it returns"""
+        self.start()
+
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, fn, *args)
+        except BrokenProcessPool:
+            logger.error("Inference worker pool crashed, restarting on next job")
+            self.shutdown()
+            raise
+        finally:
+            with self._lock:
+                self.pending -= jobs
+
+        queue_wait = max(0.0, result["started_at"] - submitted_at)
+        inference = result["finished_at"] - result["started_at"]
+        # Decoding happens in the worker too; report it as its own stage
+        decode_seconds = result.get("decode_seconds", 0.0)
+        if decode_seconds:
+            metrics.observe("stage_duration_seconds", decode_seconds, stage="audio_decode")
+        metrics.observe("stage_duration_seconds", max(0.0, inference - decode_seconds), stage="whisper_inference")
+        job = {
+            "submitted_at": submitted_at,
+            "jobs": jobs,
+            "queue_wait": round(queue_wait, 3),
+            "inference": round(inference, 3)
+        }
+        # Jobs for uploaded recordings report how much audio silence trimming removed
+        if "audio_seconds" in result:
+            audio_seconds, speech_seconds = result["audio_seconds"], result["speech_seconds"]
+            job["speech_ratio"] = round(speech_seconds / audio_seconds, 3) if audio_seconds else 0.0
+            job["seconds_saved"] = round(audio_seconds - speech_seconds, 3)
+        with self._lock:
+            self.model_state = "ready"
+            self.completed += jobs
+            self.total_queue_wait += queue_wait * jobs
+            self.total_inference += inference
+            if "audio_seconds" in result:
+                self.trimmed_recordings += result["recordings"]
+                self.total_audio_seconds += result["audio_seconds"]
+                self.total_speech_seconds += result["speech_seconds"]
+                self.skipped_recordings += result["skipped"]
+            self.recent_jobs.append(job)
+        logger.info(f"Inference job finished ({jobs} recordings): queue wait {queue_wait:.3f}s, inference {inference:.3f}s")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "backend": self.backend,
+                "model": self.model_name,
+                "threads": self.threads,
+                "model_state": self.model_state,
+                "capacity": self.capacity,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_wait": round(self.total_queue_wait / self.completed, 3) if self.completed else 0.0,
+                "avg_inference": round(self.total_inference / self.completed, 3) if self.completed else 0.0,
+                "silence_trimming": {
+                    "enabled": VAD_TRIM_SILENCE,
+                    "recordings": self.trimmed_recordings,
+                    "skipped": self.skipped_recordings,
+                    "audio_seconds": round(self.total_audio_seconds, 3),
+                    "speech_seconds": round(self.total_speech_seconds, 3),
+                    "seconds_saved": round(self.total_audio_seconds - self.total_speech_seconds, 3),
+                    "speech_ratio": round(self.total_speech_seconds / self.total_audio_seconds, 4)
+                    if self.total_audio_seconds else 0.0
+                },
+                "recent_jobs": list(self.recent_jobs)
+            }
+
+inference_executor = InferenceExecutor(
+    TRANSCRIPTION_BACKEND, WHISPER_MODEL_NAME, WHISPER_THREADS, INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE,
+    TRANSCRIPTION_BATCH_SIZE
+)
+metrics.gauge("inference_pending", "Recordings admitted to the inference queue and not finished yet",
+              lambda: inference_executor.pending)
+
+@app.on_event("startup")
+async def start_inference_workers():
+    inference_executor.start()
+
+@app.on_event("shutdown")
+async def stop_inference_workers():
+    inference_executor.shutdown()
+
+class TranscriptionBatcher:
+    """Collects concurrent transcription requests for a short window and runs them as one batched worker job"""
+
+    def __init__(self, executor: InferenceExecutor, options: Dict[str, Any], max_batch_size: int, max_wait: float):
+        self.executor = executor
+        self.options = options
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.recordings = 0
+        self.windows = 0
+        self.total_collect_wait = 0.0
+        self._pending = []  # (item, future, enqueued_at)
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, item: Any) -> Dict[str, Any]:
+        """Queue encoded audio bytes or decoded samples and wait for their transcript"""
+        # Admission happens per recording, so a full queue still rejects immediately
+        self.executor.reserve()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]):
+        flushed_at = time.perf_counter()
+        items = [item for item, _, _ in batch]
+        try:
+            result = await self.executor.execute(
+                _run_batch_transcription_job, items, self.options, self.max_batch_size, jobs=len(batch)
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.recordings += len(batch)
+        self.windows += result["windows"]
+        self.total_collect_wait += sum(flushed_at - enqueued_at for _, _, enqueued_at in batch)
+        for (_, future, _), item_result in zip(batch, result["results"]):
+            if future.done():
+                continue
+            if "error" in item_result:
+                future.set_exception(AudioConversionError(item_result["error"]))
+            else:
+                future.set_result({"text": item_result["text"]})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait": self.max_wait,
+            "batches": self.batches,
+            "recordings": self.recordings,
+            "avg_batch_size": round(self.recordings / self.batches, 2) if self.batches else 0.0,
+            "avg_windows_per_batch": round(self.windows / self.batches, 2) if self.batches else 0.0,
+            "avg_collect_wait": round(self.total_collect_wait / self.recordings, 3) if self.recordings else 0.0,
+            "pending": len(self._pending)
+        }
+
+transcription_batcher = TranscriptionBatcher(
+    inference_executor, WHISPER_OPTIONS, TRANSCRIPTION_BATCH_SIZE, TRANSCRIPTION_BATCH_WAIT_MS / 1000
+)
+
+
+async def transcribe_audio(audio_data: bytes) -> str:
+    """Transcribe webm audio data, reusing the cached transcript for identical uploads"""
+    cache_key = TranscriptionCache.make_key(audio_data, WHISPER_OPTIONS)
+    cached = transcription_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Transcription cache hit")
+        return cached
+
+    try:
+        # Transcribe using local Whisper model in the inference worker pool, batched with concurrent requests if enabled
+        if TRANSCRIPTION_BATCH_SIZE > 1:
+            result = await transcription_batcher.submit(audio_data)
+        else:
+            result = await inference_executor.run(_run_transcription_job, audio_data, WHISPER_OPTIONS)
+        
+        if result and result["text"]:
+            transcription = result["text"].strip()
+            transcription_cache.put(cache_key, transcription)
+            return transcription
+        else:
+            logger.error("No transcription returned from Whisper")
+            return "Could not transcribe audio. Please try again."
+            
+    except InferenceQueueFull:
+        raise
+    except AudioConversionError as e:
+        logger.error(f"Error decoding audio: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error converting audio format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error in transcribe_audio: {str(e)}")
+        return f"Error transcribing audio: {str(e)}"
+
+# Rubric and output schema shared by the single-answer and batched evaluation prompts
+EVALUATION_CRITERIA = """1. **Overall Clarity**: Was the answer coherent and easy to understand?
+2. **Technical Relevance**: Did the candidate address the key technical aspects of the question?
+3. **Structure & Flow**: Was the answer well-organized (e.g., point-wise, logical order)?
+4. **Communication Style**: Was it confident, concise, and professional?
+5. **Correctness**: Were there any factual or conceptual errors?
+
+### Provide:
+- A 1–2 sentence **Summary Feedback**
+- A detailed **Strengths vs Areas to Improve** section
+- A **Revised Version** of the answer (as you would say it in an interview)
+- A **Score out of 10**
+- 1–2 **Improvement Tips**"""
+
+# Template line(s) for each field of the evaluation JSON, in prompt order
+EVALUATION_FIELD_TEMPLATES = {
+    "summary": '''    "summary": "1-2 sentence summary of the evaluation"''',
+    "score": '''    "score": <number between 0 and 10>''',
+    "evaluation": '''    "evaluation": {
+        "clarity": {
+            "score": <number between 0 and 10>,
+            "feedback": "feedback on clarity"
+        },
+        "technical_relevance": {
+            "score": <number between 0 and 10>,
+            "feedback": "feedback on technical relevance"
+        },
+        "structure": {
+            "score": <number between 0 and 10>,
+            "feedback": "feedback on structure and flow"
+        },
+        "communication": {
+            "score": <number between 0 and 10>,
+            "feedback": "feedback on communication style"
+        },
+        "correctness": {
+            "score": <number between 0 and 10>,
+            "feedback": "feedback on correctness"
+        }
+    }''',
+    "strengths": '''    "strengths": ["strength1", "strength2", "strength3"]''',
+    "improvements": '''    "improvements": ["improvement1", "improvement2"]''',
+    "revised_answer": '''    "revised_answer": "A better version of the answer"''',
+    "tips": '''    "tips": ["tip1", "tip2"]'''
+}
+
+EVALUATION_SCHEMA_FIELDS = ",\n".join(EVALUATION_FIELD_TEMPLATES.values())
+
+def build_evaluation_payload(question: str, answer: str) -> Dict[str, Any]:
+    """Build the chat completion payload for evaluating one answer"""
+    prompt = f"""You are an expert interview coach and AI analyst. Your task is to evaluate a candidate's spoken interview response.
+
+### Interview Question:
+{question}
+
+### Candidate Response:
+{answer}
+
+### Your Evaluation Should Include:
+{EVALUATION_CRITERIA}
+
+Format your response as a JSON object with the following structure:
+{{
+{EVALUATION_SCHEMA_FIELDS}
+}}
+
+IMPORTANT: Return ONLY the JSON object, without any markdown formatting or additional text."""
+
+    return {
+        "model": "meta-llama/llama-4-maverick:free",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.7,
+        "max_tokens": 1000
+    }
+
+def build_batch_evaluation_payload(items: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Build one chat completion payload that evaluates several answers, stating the rubric once"""
+    responses = "\n\n".join(
+        f"### Response {index}\nInterview Question:\n{item['question']}\n\nCandidate Response:\n{item['answer']}"
+        for index, item in enumerate(items, start=1)
+    )
+    schema_fields = EVALUATION_SCHEMA_FIELDS.replace("\n", "\n    ")
+    prompt = f"""You are an expert interview coach and AI analyst. Your task is to evaluate {len(items)} of a candidate's spoken interview responses. Evaluate each response independently of the others.
+
+{responses}
+
+### For Each Response, Your Evaluation Should Include:
+{EVALUATION_CRITERIA}
+
+Format your response as a JSON array with exactly {len(items)} objects, one per response and in the same order, each with the following structure:
+[
+    {{
+        "index": <response number>,
+    {schema_fields}
+    }}
+]
+
+IMPORTANT: Return ONLY the JSON array, without any markdown formatting or additional text."""
+
+    return {
+        "model": "meta-llama/llama-4-maverick:free",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.7,
+        # Same completion budget per answer as a single evaluation
+        "max_tokens": 1000 * len(items)
+    }
+
+JSON_CLOSERS = {"{": "}", "[": "]"}
+
+def _balanced_json_spans(content: str, opener: str):
+    """Yield candidate JSON texts starting at each `opener`: the balanced span, or the rest of a truncated one"""
+    start = content.find(opener)
+    while start != -1:
+        depth = 0
+        in_string = False
+        escape = False
+        end = None
+        for position in range(start, len(content)):
+            char = content[position]
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    end = position + 1
+                    break
+        yield content[start:end] if end else content[start:]
+        if end is None:
+            return
+        start = content.find(opener, start + 1)
+
+def repair_json(text: str) -> Optional[Any]:
+    """Parse JSON after fixing common LLM defects: trailing commas, raw newlines in strings and truncation.
+
+    A truncated document is closed at the end, or else cut back to the last complete member.
+    """
+    out = []
+    stack = []
+    cut_points = []
+    in_string = False
+    escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            out.append(char)
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(JSON_CLOSERS[char])
+        elif char in "}]":
+            # Drop a trailing comma before the closer
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+        elif char == ",":
+            cut_points.append((len(out), list(stack)))
+        out.append(char)
+
+    candidates = []
+    # A string cut off mid-way is incomplete content, so its member is dropped rather than closed
+    if not in_string:
+        candidates.append("".join(out).rstrip().rstrip(",") + "".join(reversed(stack)))
+    # Cut back one member at a time, newest first
+    for length, open_closers in reversed(cut_points[-20:]):
+        candidates.append("".join(out[:length]) + "".join(reversed(open_closers)))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def extract_json(content: str, opener: str = "{") -> tuple:
+    """Find the first JSON object (or array, with opener "[") in a model response.
+
+    Returns (value, repaired); value is None when nothing usable was found.
+    """
+    with metrics.timer("json_parse"):
+        for span in _balanced_json_spans(content, opener):
+            try:
+                return json.loads(span), False
+            except json.JSONDecodeError:
+                pass
+            value = repair_json(span)
+            if value is not None:
+                return value, True
+        return None, False
+
+def invalid_evaluation_fields(evaluation: Dict[str, Any]) -> List[str]:
+    """Top-level evaluation fields that are missing or fail validation"""
+    invalid = [field for field in EVALUATION_FIELD_TEMPLATES if field not in evaluation]
+    try:
+        Evaluation(**evaluation)
+    except ValidationError as e:
+        invalid.extend(str(error["loc"][0]) for error in e.errors() if error["loc"])
+    return list(dict.fromkeys(field for field in invalid if field in EVALUATION_FIELD_TEMPLATES))
+
+class EvaluationParseStats:
+    """How often evaluation responses parse cleanly, need repair, need a follow-up request or fail"""
+
+    OUTCOMES = ("clean", "repaired", "completed", "failed")
+
+    def __init__(self):
+        self.counts = {outcome: 0 for outcome in self.OUTCOMES}
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            responses = sum(self.counts.values())
+            return {
+                "responses": responses,
+                **self.counts,
+                "failure_rate": round(self.counts["failed"] / responses, 4) if responses else 0.0
+            }
+
+evaluation_parse_stats = EvaluationParseStats()
+
+def build_missing_fields_payload(question: str, answer: str, partial: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Build a short follow-up request for just the evaluation fields that were missing or invalid"""
+    known = {key: value for key, value in partial.items() if key in ("summary", "score")}
+    templates = ",\n".join(EVALUATION_FIELD_TEMPLATES[field] for field in fields)
+    prompt = f"""You are an expert interview coach. Complete an evaluation of a candidate's interview response.
+
+### Interview Question:
+{question}
+
+### Candidate Response:
+{answer}
+
+### Evaluation So Far:
+{json.dumps(known)}
+
+Return a JSON object with exactly these keys: {", ".join(fields)}. Use this structure:
+{{
+{templates}
+}}
+
+IMPORTANT: Return ONLY the JSON object, without any markdown formatting or additional text."""
+
+    return {
+        "model": "meta-llama/llama-4-maverick:free",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.7,
+        "max_tokens": 500
+    }
+
+async def parse_evaluation_content(content: str, question: str, answer: str) -> Dict[str, Any]:
+    """Parse the evaluation JSON returned by the model, repairing it and re-requesting only missing fields"""
+    evaluation, repaired = extract_json(content)
+    if not isinstance(evaluation, dict):
+        evaluation_parse_stats.record("failed")
+        logger.error(f"Failed to parse evaluation response ({len(content)} characters)")
+        log_payload("Content that failed to parse", content)
+        raise HTTPException(status_code=500, detail="Failed to parse evaluation response")
+
+    invalid = invalid_evaluation_fields(evaluation)
+    requested = bool(invalid)
+    if requested:
+        logger.warning(f"Evaluation response missing or invalid fields {invalid}, requesting them again")
+        for field in invalid:
+            evaluation.pop(field, None)
+        try:
+            response_data = await openrouter_client.chat_completion(
+                build_missing_fields_payload(question, answer, evaluation, invalid)
+            )
+            completion, _ = extract_json(response_data["choices"][0]["message"]["content"])
+            if isinstance(completion, dict):
+                evaluation.update({field: completion[field] for field in invalid if field in completion})
+        except Exception as e:
+            logger.error(f"Follow-up request for evaluation fields failed: {str(e)}")
+
+    try:
+        result = Evaluation(**evaluation).dict()
+    except ValidationError as e:
+        evaluation_parse_stats.record("failed")
+        logger.error(f"Evaluation response failed validation: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to parse evaluation response")
+
+    evaluation_parse_stats.record("completed" if requested else "repaired" if repaired else "clean")
+    logger.info("Successfully parsed evaluation response")
+    return result
+
+async def evaluate_answer(question: str, answer: str) -> Dict[str, Any]:
+    """Evaluate the answer using Llama 4 Maverick model with structured evaluation criteria"""
+    try:
+        logger.info("Evaluating answer using OpenRouter API")
+        payload = build_evaluation_payload(question, answer)
+
+        logger.info("Sending request to OpenRouter API")
+        try:
+            response_data = await openrouter_client.chat_completion(payload)
+        except LLMRequestError as e:
+            logger.error(f"OpenRouter API error: {e.status_code} - {str(e)}")
+            raise llm_http_exception(e, "Failed to evaluate answer")
+
+        log_payload("Response data", response_data)
+
+        if "choices" not in response_data or not response_data["choices"]:
+            logger.error("No choices in response data")
+            raise HTTPException(status_code=500, detail="Invalid response format from API")
+
+        content = response_data["choices"][0]["message"]["content"]
+        log_payload("Raw response content", content)
+
+        return await parse_evaluation_content(content, question, answer)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in evaluate_answer: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+def split_batch_evaluations(content: str, count: int) -> Dict[int, Dict[str, Any]]:
+    """Split a batched evaluation response into {position: evaluation}, keeping only valid entries"""
+    entries, _ = extract_json(content, "[")
+    if not isinstance(entries, list):
+        logger.error("Failed to parse batched evaluation response")
+        return {}
+
+    evaluations = {}
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        # Prefer the model's own numbering, falling back to array order
+        index = entry.pop("index", position + 1)
+        if isinstance(index, int) and 1 <= index <= count and index - 1 not in evaluations and not invalid_evaluation_fields(entry):
+            evaluations[index - 1] = Evaluation(**entry).dict()
+    return evaluations
+
+class EvaluationBatchStats:
+    """Token usage and latency of batched evaluation requests, grouped by batch size"""
+
+    def __init__(self):
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def record(self, size: int, latency: float, usage: Dict[str, Any], fallbacks: int):
+        with self._lock:
+            totals = self._sizes.setdefault(size, {
+                "batches": 0, "answers": 0, "latency": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "fallbacks": 0
+            })
+            totals["batches"] += 1
+            totals["answers"] += size
+            totals["latency"] += latency
+            totals["prompt_tokens"] += usage.get("prompt_tokens", 0)
+            totals["completion_tokens"] += usage.get("completion_tokens", 0)
+            totals["fallbacks"] += fallbacks
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                str(size): {
+                    "batches": totals["batches"],
+                    "avg_latency": round(totals["latency"] / totals["batches"], 3),
+                    "prompt_tokens_per_answer": round(totals["prompt_tokens"] / totals["answers"], 1),
+                    "completion_tokens_per_answer": round(totals["completion_tokens"] / totals["answers"], 1),
+                    "fallback_rate": round(totals["fallbacks"] / totals["answers"], 4)
+                }
+                for size, totals in sorted(self._sizes.items())
+            }
+
+evaluation_batch_stats = EvaluationBatchStats()
+
+async def evaluate_answer_batch(items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Evaluate several answers with one request; entries that come back malformed are evaluated one by one.
+
+    Returns one result per item, in order; failed items are {"status": "error", ...} placeholders.
+    A failed request fails the whole batch rather than retrying each answer against the same upstream.
+    """
+    logger.info(f"Evaluating batch of {len(items)} answers using OpenRouter API")
+    started = time.perf_counter()
+    try:
+        response_data = await openrouter_client.chat_completion(build_batch_evaluation_payload(items))
+    except LLMRequestError as e:
+        logger.error(f"OpenRouter API error for evaluation batch: {e.status_code} - {str(e)}")
+        detail = llm_http_exception(e, "Failed to evaluate answer").detail
+        return [{"status": "error", "error": detail, "question": item["question"]} for item in items]
+
+    usage = response_data.get("usage")
+    usage = usage if isinstance(usage, dict) else {}
+    try:
+        evaluations = split_batch_evaluations(response_data["choices"][0]["message"]["content"], len(items))
+    except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+        # A malformed envelope means every entry is malformed
+        logger.error(f"Invalid response format for evaluation batch: {type(e).__name__} - {str(e)}")
+        evaluations = {}
+    latency = time.perf_counter() - started
+
+    missing = [index for index in range(len(items)) if index not in evaluations]
+    evaluation_batch_stats.record(len(items), latency, usage, len(missing))
+    logger.info(
+        f"Evaluated batch of {len(items)} answers in {latency:.2f}s "
+        f"({usage.get('prompt_tokens', '?')} prompt / {usage.get('completion_tokens', '?')} completion tokens, "
+        f"{len(missing)} falling back to single evaluations)"
+    )
+
+    async def evaluate_single(index: int):
+        try:
+            evaluations[index] = await evaluate_answer(items[index]["question"], items[index]["answer"])
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            evaluations[index] = {"status": "error", "error": detail, "question": items[index]["question"]}
+
+    await asyncio.gather(*(evaluate_single(index) for index in missing))
+    return [evaluations[index] for index in range(len(items))]
+
+@api_router.get("/evaluate/batches")
+async def get_evaluation_batch_stats():
+    return evaluation_batch_stats.stats()
+
+@api_router.get("/evaluate/parsing")
+async def get_evaluation_parse_stats():
+    return evaluation_parse_stats.stats()
+
+@api_router.get("/llm/scheduler")
+async def get_llm_scheduler_stats():
+    return {**llm_scheduler.stats(), "circuit": openrouter_client.breaker.state}
+
+class SummaryDeltaExtractor:
+    """Incrementally pulls the "summary" string value out of a streamed JSON object"""
+
+    ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+    KEY_PATTERN = re.compile(r'"summary"\s*:\s*"')
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = None
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed content and return any newly completed summary characters"""
+        self.buffer += chunk
+        if self.done:
+            return ""
+        if self.position is None:
+            match = self.KEY_PATTERN.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+
+        delta = []
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if char == '"':
+                self.done = True
+                break
+            if char != '\\':
+                delta.append(char)
+                self.position += 1
+                continue
+            # Wait for the rest of a split escape sequence
+            if self.position + 1 >= len(self.buffer):
+                break
+            escaped = self.buffer[self.position + 1]
+            if escaped == 'u':
+                if self.position + 6 > len(self.buffer):
+                    break
+                try:
+                    delta.append(chr(int(self.buffer[self.position + 2:self.position + 6], 16)))
+                except ValueError:
+                    pass
+                self.position += 6
+            else:
+                delta.append(self.ESCAPES.get(escaped, escaped))
+                self.position += 2
+        return "".join(delta)
+
+async def evaluate_answer_streaming(question: str, answer: str, on_summary_delta) -> Dict[str, Any]:
+    """Evaluate an answer with a streamed completion, reporting summary tokens as they arrive"""
+    try:
+        logger.info("Evaluating answer using streamed OpenRouter API response")
+        payload = build_evaluation_payload(question, answer)
+        payload["stream"] = True
+
+        extractor = SummaryDeltaExtractor()
+        try:
+            async for delta in openrouter_client.stream_chat_completion(payload):
+                summary_delta = extractor.feed(delta)
+                if summary_delta:
+                    await on_summary_delta(summary_delta)
+        except LLMRequestError as e:
+            logger.error(f"OpenRouter API error: {e.status_code} - {str(e)}")
+            raise llm_http_exception(e, "Failed to evaluate answer")
+
+        log_payload("Raw response content", extractor.buffer)
+        return await parse_evaluation_content(extractor.buffer, question, answer)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in evaluate_answer_streaming: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@api_router.post("/transcribe")
+async def transcribe_interview(
+    audio: UploadFile = File(...),
+    question: str = Form(...),
+    session_id: str = Form(...),
+    is_final: bool = Form(False)  # New parameter to indicate if this is the final answer
+):
+    try:
+        logger.info("Starting transcription process")
+        with metrics.timer("upload_read"):
+            content = await audio.read()
+        
+        # Transcribe the audio (served from the cache when the same recording is re-sent)
+        transcription = await transcribe_audio(content)
+        logger.info("Successfully transcribed audio")
+        
+        if is_final:
+            # Only store the answer if this is marked as final
+            result = session_repository.update_session(
+                session_id,
+                {"$push": {"answers": transcription}, "$inc": {"report_version": 1}}
+            )
+            if result.modified:
+                session_stats.answer_added()
+                search_index.refresh(session_id)
+            logger.info("Updated session with final transcription")
+        
+        return {"transcription": transcription}
+    except InferenceQueueFull as e:
+        logger.warning(f"Rejecting transcription request: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Transcription service is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error in transcribe_interview: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/transcribe/cache")
+async def get_transcription_cache_stats():
+    return transcription_cache.stats()
+
+@api_router.get("/inference/stats")
+async def get_inference_stats():
+    return {**inference_executor.stats(), "batching": transcription_batcher.stats()}
+
+class StreamingAudioDecoder:
+    """One ffmpeg process per live recording, fed chunks on stdin as they arrive.
+
+    Decoded 16kHz samples accumulate as ffmpeg emits them, so each pass reads only the new tail
+    instead of re-decoding the whole recording.
+    """
+
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._pcm = bytearray()
+        self._process = None
+        self._reader = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "f32le", "-ac", "1", "-ar", str(self.sample_rate),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._reader = asyncio.create_task(self._read_output())
+
+    async def _read_output(self):
+        while True:
+            data = await self._process.stdout.read(65536)
+            if not data:
+                return
+            self._pcm.extend(data)
+
+    async def _error(self) -> AudioConversionError:
+        stderr = await self._process.stderr.read()
+        return AudioConversionError(stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+
+    async def feed(self, chunk: bytes):
+        if self._process is None:
+            await self.start()
+        try:
+            self._process.stdin.write(chunk)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exits as soon as it hits data it cannot decode
+            await self._process.wait()
+            raise await self._error()
+
+    def samples(self, start: int = 0) -> np.ndarray:
+        """Samples decoded so far, from sample index start on (a copy, the buffer keeps growing)"""
+        end = len(self._pcm) // 4 * 4
+        return np.frombuffer(bytes(self._pcm[start * 4:end]), dtype=np.float32)
+
+    async def finish(self):
+        """Close the input and wait until ffmpeg has decoded everything it was sent"""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        await self._reader
+        if await self._process.wait() != 0:
+            raise await self._error()
+
+    async def aclose(self):
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+
+class LiveTranscription:
+    """Incremental transcript of a recording that is still arriving as MediaRecorder chunks"""
+
+    def __init__(self):
+        self.audio = bytearray()  # The encoded recording, kept for the transcription cache key
+        self.decoder = StreamingAudioDecoder()
+        self.committed = []  # Transcripts of finished speech segments, in order
+        self.committed_samples = 0  # Decoded samples already covered by the committed text
+        self.partial = ""
+
+    @property
+    def stable_text(self) -> str:
+        return " ".join(self.committed)
+
+    @property
+    def text(self) -> str:
+        return " ".join(part for part in (self.stable_text, self.partial) if part)
+
+    async def feed(self, chunk: bytes):
+        self.audio.extend(chunk)
+        await self.decoder.feed(chunk)
+
+    async def _transcribe(self, samples: np.ndarray) -> str:
+        result = await inference_executor.run(_run_samples_transcription_job, samples, WHISPER_OPTIONS)
+        return result["text"].strip()
+
+    async def run_pass(self, final: bool = False):
+        """Commit segments closed by a pause and re-transcribe the open window after them"""
+        if final:
+            await self.decoder.finish()
+        pending = self.decoder.samples(self.committed_samples)
+        segments = detect_speech_segments(pending)
+
+        if final:
+            commit_end = len(pending)
+        else:
+            silence = int(VAD_MIN_SILENCE * WHISPER_SAMPLE_RATE)
+            closed = [end for _, end in segments if len(pending) - end >= silence]
+            commit_end = min(len(pending), closed[-1] + silence // 2) if closed else 0
+            # Bound the window Whisper re-reads on every pass when the speaker never pauses
+            if len(pending) - commit_end > LIVE_WINDOW_SECONDS * WHISPER_SAMPLE_RATE:
+                commit_end = len(pending)
+
+        if commit_end:
+            if any(start < commit_end for start, _ in segments):
+                text = await self._transcribe(pending[:commit_end])
+                if text:
+                    self.committed.append(text)
+            self.committed_samples += commit_end
+
+        if not final and any(end > commit_end for _, end in segments):
+            self.partial = await self._transcribe(pending[commit_end:])
+        else:
+            self.partial = ""
+
+@api_router.websocket("/transcribe/live")
+async def transcribe_live(websocket: WebSocket):
+    """Stream recording chunks in and partial transcripts out; {"type": "stop"} returns the final transcript"""
+    await websocket.accept()
+    live = LiveTranscription()
+    pass_task = None
+
+    async def send_partial():
+        try:
+            await live.run_pass()
+            await websocket.send_json({"type": "partial", "stable": live.stable_text, "text": live.text})
+        except InferenceQueueFull:
+            logger.info("Skipping live transcription pass, inference queue is full")
+
+    try:
+        start = await websocket.receive_json()
+        session_id = start.get("session_id")
+        logger.info(f"Starting live transcription for session {session_id}")
+
+        last_pass = 0.0
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                await live.feed(message["bytes"])
+                now = time.monotonic()
+                if (pass_task is None or pass_task.done()) and now - last_pass >= LIVE_TRANSCRIBE_INTERVAL:
+                    last_pass = now
+                    pass_task = asyncio.create_task(send_partial())
+            elif message.get("text"):
+                control = json.loads(message["text"])
+                if control.get("type") == "stop":
+                    break
+
+        # Only the window after the last committed segment is left to transcribe
+        if pass_task is not None:
+            await pass_task
+        await live.run_pass(final=True)
+        transcription = live.stable_text or "Could not transcribe audio. Please try again."
+
+        # The client confirms by re-sending the same recording to /api/transcribe
+        if live.stable_text:
+            transcription_cache.put(TranscriptionCache.make_key(bytes(live.audio), WHISPER_OPTIONS), transcription)
+
+        if control.get("is_final"):
+            result = session_repository.update_session(
+                session_id,
+                {"$push": {"answers": transcription}, "$inc": {"report_version": 1}}
+            )
+            if result.modified:
+                session_stats.answer_added()
+                search_index.refresh(session_id)
+            logger.info("Updated session with final transcription")
+
+        await websocket.send_json({"type": "final", "transcription": transcription})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Live transcription client disconnected")
+        if pass_task is not None:
+            pass_task.cancel()
+    except InferenceQueueFull as e:
+        logger.warning(f"Rejecting live transcription: {str(e)}")
+        await websocket.send_json({
+            "type": "error",
+            "detail": "Transcription service is busy. Please try again shortly.",
+            "retry_after": e.retry_after
+        })
+        await websocket.close(code=1013)
+    except Exception as e:
+        logger.error(f"Error in transcribe_live: {str(e)}")
+        detail = f"Error converting audio format: {str(e)}" if isinstance(e, AudioConversionError) else str(e)
+        await websocket.send_json({"type": "error", "detail": detail})
+        await websocket.close(code=1011)
+    finally:
+        await live.decoder.aclose()
+
+class JobStore:
+    """Persistence interface for background jobs"""
+
+    def create_job(self, kind: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None,
+                   in_flight_only: bool = False):
+        """Create a queued job, or return (existing_job, False) for a job with the same key that did not fail.
+
+        With in_flight_only, only queued or running jobs are reused, so a finished job is never returned.
+        """
+        raise NotImplementedError
+
+    def claim_next_job(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job (or one whose worker lease expired)"""
+        raise NotImplementedError
+
+    def update_job(self, job_id: str, **fields):
+        raise NotImplementedError
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+class SQLiteJobStore(JobStore):
+    """Job store backed by a local SQLite table"""
+
+    JSON_FIELDS = ("payload", "result")
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress INTEGER DEFAULT 0,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                idempotency_key TEXT,
+                attempts INTEGER DEFAULT 0,
+                worker_id TEXT,
+                lease_expires_at REAL,
+                created_at TEXT,
+                updated_at TEXT
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_idempotency_key ON jobs (idempotency_key)')
+
+    def _to_job(self, row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        for field in self.JSON_FIELDS:
+            job[field] = json.loads(job[field]) if job[field] else None
+        return job
+
+    def create_job(self, kind, payload, idempotency_key=None, in_flight_only=False):
+        now = datetime.now().isoformat()
+        statuses = "status IN ('queued', 'running')" if in_flight_only else "status != 'failed'"
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if idempotency_key:
+                    row = self._conn.execute(
+                        f"SELECT * FROM jobs WHERE idempotency_key = ? AND {statuses} "
+                        "ORDER BY created_at DESC LIMIT 1",
+                        (idempotency_key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._conn.execute('COMMIT')
+                        return self._to_job(row), False
+                job_id = str(uuid.uuid4())
+                self._conn.execute(
+                    '''INSERT INTO jobs (id, kind, status, stage, progress, payload, idempotency_key, created_at, updated_at)
+                       VALUES (?, ?, 'queued', 'queued', 0, ?, ?, ?, ?)''',
+                    (job_id, kind, json.dumps(payload), idempotency_key, now, now)
+                )
+                row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+                self._conn.execute('COMMIT')
+                return self._to_job(row), True
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def claim_next_job(self, worker_id):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (worker_id, now + JOB_LEASE_SECONDS, datetime.now().isoformat(), row["id"])
+                )
+                job = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (row["id"],)).fetchone()
+                self._conn.execute('COMMIT')
+                return self._to_job(job)
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def update_job(self, job_id, **fields):
+        fields["updated_at"] = datetime.now().isoformat()
+        for field in self.JSON_FIELDS:
+            if field in fields and fields[field] is not None:
+                fields[field] = json.dumps(fields[field], default=str)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self._to_job(self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone())
+
+class MongoJobStore(JobStore):
+    """Job store backed by a MongoDB collection.
+
+    A job's idempotency key is also held in active_key for as long as the job can be reused (until it
+    fails, or completes when it was created in_flight_only); a unique index on it makes the check atomic.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.collection.create_index([("status", 1), ("created_at", 1)])
+        self.collection.create_index("idempotency_key")
+        self.collection.create_index("active_key", unique=True, sparse=True)
+
+    @staticmethod
+    def _to_job(document) -> Optional[Dict[str, Any]]:
+        if document is None:
+            return None
+        document["id"] = document.pop("_id")
+        return document
+
+    def create_job(self, kind, payload, idempotency_key=None, in_flight_only=False):
+        while True:
+            if idempotency_key:
+                existing = self.collection.find_one({"active_key": idempotency_key})
+                if existing:
+                    return self._to_job(existing), False
+            job = self._new_job(kind, payload, idempotency_key, in_flight_only)
+            try:
+                self.collection.insert_one(job)
+                return self._to_job(job), True
+            except DuplicateKeyError:
+                # A concurrent request with the same key inserted first; return its job
+                continue
+
+    @staticmethod
+    def _new_job(kind, payload, idempotency_key, in_flight_only) -> Dict[str, Any]:
+        now = datetime.now().isoformat()
+        job = {
+            "_id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0,
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "idempotency_key": idempotency_key,
+            "in_flight_only": in_flight_only,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now
+        }
+        if idempotency_key:
+            job["active_key"] = idempotency_key
+        return job
+
+    def claim_next_job(self, worker_id):
+        now = time.time()
+        job = self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + JOB_LEASE_SECONDS,
+                    "updated_at": datetime.now().isoformat()
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        return self._to_job(job)
+
+    def update_job(self, job_id, **fields):
+        fields["updated_at"] = datetime.now().isoformat()
+        update = {"$set": fields}
+        # Release the key once the job can no longer be reused
+        if fields.get("status") == "failed":
+            update["$unset"] = {"active_key": ""}
+        self.collection.update_one({"_id": job_id}, update)
+        if fields.get("status") == "completed":
+            self.collection.update_one({"_id": job_id, "in_flight_only": True}, {"$unset": {"active_key": ""}})
+
+    def get_job(self, job_id):
+        return self._to_job(self.collection.find_one({"_id": job_id}))
+
+def create_job_store(backend: str) -> JobStore:
+    if backend == "mongo":
+        return MongoJobStore(db["jobs"])
+    return SQLiteJobStore(JOB_DB_PATH)
+
+job_store = create_job_store(JOB_STORE_BACKEND)
+
+def is_retryable_job_error(error: Exception) -> bool:
+    # Client errors (bad PDF, invalid parameters) will fail the same way again
+    return not (isinstance(error, HTTPException) and error.status_code < 500)
+
+class JobWorkerPool:
+    """Runs queued jobs from the job store on a set of asyncio worker tasks"""
+
+    def __init__(self, store: JobStore, handlers: Dict[str, Any], workers: int, poll_interval: float):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks = []
+        self._wakeup = None
+
+    def start(self):
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(f"{prefix}-{index}"))
+            for index in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} background job workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job has been queued from this process"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker_loop(self, worker_id: str):
+        while True:
+            try:
+                job = self.store.claim_next_job(worker_id)
+            except Exception as e:
+                logger.error(f"Error claiming job: {str(e)}")
+                job = None
+
+            if job is None:
+                # Jobs queued by other processes are picked up on the next poll
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._run_job(job)
+
+    async def _run_job(self, job: Dict[str, Any]):
+        logger.info(f"Running {job['kind']} job {job['id']} (attempt {job['attempts']})")
+        try:
+            result = await self.handlers[job["kind"]](job)
+            self.store.update_job(job["id"], status="completed", progress=100, result=result, error=None)
+            logger.info(f"Job {job['id']} completed")
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            if is_retryable_job_error(e) and job["attempts"] < JOB_MAX_ATTEMPTS:
+                logger.warning(f"Job {job['id']} failed, will retry: {detail}")
+                self.store.update_job(job["id"], status="queued", error=detail)
+            else:
+                logger.error(f"Job {job['id']} failed: {detail}")
+                self.store.update_job(job["id"], status="failed", error=detail)
+
+async def run_upload_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract resume text, generate questions and persist the session for an upload job"""
+    payload = job["payload"]
+    session_id = payload["session_id"]
+    file_path = payload["file_path"]
+    try:
+        # A retried job whose session was already persisted only needs its result rebuilt
+        existing = session_repository.get_session(session_id, {"questions": 1})
+        if existing:
+            job_store.update_job(job["id"], stage="persisted")
+            return {"session_id": session_id, "questions": existing.get("questions", [])}
+
+        # Extract text from PDF
+        job_store.update_job(job["id"], stage="extracting", progress=10)
+        try:
+            with metrics.timer("pdf_extraction"):
+                resume_text = await asyncio.to_thread(extract_text_from_pdf, file_path)
+        except Exception as e:
+            # An unreadable PDF fails the same way on every attempt
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+            raise HTTPException(status_code=422, detail=f"Error extracting text from PDF: {str(e)}")
+        if not resume_text.strip():
+            raise HTTPException(status_code=400, detail="Could not extract text from PDF. Please ensure the PDF contains text and is not scanned/image-based.")
+        logger.info(f"Successfully extracted text from PDF. Length: {len(resume_text)} characters")
+
+        # Generate questions
+        job_store.update_job(job["id"], stage="generating", progress=40)
+        params = InterviewParams(**payload["params"])
+        # A candidate is waiting on these, so they go ahead of queued evaluations
+        with llm_lane("interactive", session_id):
+            questions = await get_or_generate_questions(resume_text, params, payload.get("fresh", False))
+        logger.info(f"Successfully generated {len(questions)} questions")
+
+        # Create the session under the id reserved when the job was queued
+        session = {
+            "_id": session_id,
+            "timestamp": datetime.now(),
+            "questions": questions,
+            "answers": [],
+            "evaluations": [],
+            "difficulty": params.difficulty,
+            "interview_type": params.interview_type,
+            "status": "in-progress",
+            "resume_text": resume_text  # Store the resume text for reference
+        }
+        create_session(session)
+        job_store.update_job(job["id"], stage="persisted", progress=90)
+        logger.info(f"Successfully created session with ID: {session_id}")
+
+        _remove_upload(file_path)
+        return {"session_id": session_id, "questions": questions}
+    except Exception as e:
+        if not is_retryable_job_error(e) or job["attempts"] >= JOB_MAX_ATTEMPTS:
+            _remove_upload(file_path)
+        raise
+
+def _remove_upload(file_path: str):
+    if file_path and os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+            logger.info(f"Cleaned up file: {file_path}")
+        except Exception as e:
+            logger.error(f"Error cleaning up file {file_path}: {str(e)}")
+
+job_workers = JobWorkerPool(job_store, {"upload": run_upload_job}, JOB_WORKERS, JOB_POLL_INTERVAL)
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_workers.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_workers.stop()
+
+@app.post("/api/upload", status_code=202)
+async def upload_resume(
+    file: UploadFile = File(...),
+    num_questions: int = Form(...),
+    difficulty: str = Form(...),
+    interview_type: str = Form(...),
+    fresh: bool = Form(False),  # Skip the question cache and generate a new variant
+    idempotency_key: Optional[str] = Header(None)
+):
+    file_path = None
+    try:
+        logger.info(f"Starting resume upload process for file: {file.filename}")
+        
+        # Validate parameters
+        if num_questions < 1 or num_questions > 20:
+            raise HTTPException(status_code=400, detail="Number of questions must be between 1 and 20")
+        
+        if difficulty not in ["easy", "medium", "hard"]:
+            raise HTTPException(status_code=400, detail="Invalid difficulty level")
+            
+        if interview_type not in ["technical", "behavioral", "system_design", "mixed"]:
+            raise HTTPException(status_code=400, detail="Invalid interview type")
+        
+        # Validate file type
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+        
+        params = InterviewParams(
+            num_questions=num_questions,
+            difficulty=difficulty,
+            interview_type=interview_type
+        )
+        
         # Create uploads directory if it doesn't exist
         os.makedirs("uploads", exist_ok=True)
         
-        # Save the uploaded file
+        # Save the uploaded file where the job workers can read it
         file_path = os.path.join("uploads", f"{uuid.uuid4()}_{file.filename}")
         logger.info(f"Saving file to: {file_path}")
         
         try:
-            content = await file.read()
+            with metrics.timer("upload_read"):
+                content = await file.read()
+            if len(content) > PDF_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"PDF must be smaller than {PDF_MAX_BYTES // (1024 * 1024)}MB")
             with open(file_path, "wb") as buffer:
                 buffer.write(content)
             logger.info(f"File saved successfully: {file_path}")
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
         
-        # Extract text from PDF
-        try:
-            logger.info("Extracting text from PDF")
-            resume_text = extract_text_from_pdf(file_path)
-            if not resume_text.strip():
-                raise HTTPException(status_code=400, detail="Could not extract text from PDF. Please ensure the PDF contains text and is not scanned/image-based.")
-            logger.info(f"Successfully extracted text from PDF. Length: {len(resume_text)} characters")
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error extracting text from PDF: {str(e)}")
+        # Re-submitting the same file and parameters while its job is still queued or running returns
+        # that job; once it has finished, the same upload starts a new session (a fresh variant is always
+        # a new job). A client-supplied Idempotency-Key also matches finished jobs.
+        derived_key = not idempotency_key and not fresh
+        if derived_key:
+            digest = hashlib.sha256(content)
+            digest.update(json.dumps(params.dict(), sort_keys=True).encode("utf-8"))
+            idempotency_key = digest.hexdigest()
         
-        # Create interview parameters
-        params = InterviewParams(
-            num_questions=num_questions,
-            difficulty=difficulty,
-            interview_type=interview_type
+        job, created = job_store.create_job(
+            "upload",
+            {
+                "file_path": file_path,
+                "filename": file.filename,
+                "params": params.dict(),
+                "fresh": fresh,
+                "session_id": str(ObjectId())
+            },
+            idempotency_key,
+            in_flight_only=derived_key
         )
+        if created:
+            file_path = None  # The job owns the file now
+            job_workers.notify()
+            logger.info(f"Queued upload job {job['id']}")
+        else:
+            logger.info(f"Reusing upload job {job['id']} for identical request")
         
-        # Generate questions
-        try:
-            logger.info("Generating questions from resume text")
-            questions = generate_questions(resume_text, params)
-            logger.info(f"Successfully generated {len(questions)} questions")
-        except Exception as e:
-            logger.error(f"Error generating questions: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "stage": job["stage"]
+        }
+        
+    except HTTPException as he:
+        # Re-raise HTTP exceptions as they are already properly formatted
+        raise he
+    except Exception as e:
+        logger.error(f"Unexpected error in upload_resume: {str(e)}")
+        logger.error(f"Error type: {type(e).__name__}")
+        logger.error(f"Error traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Clean up the uploaded file unless a new job took ownership of it
+        _remove_upload(file_path)
+
+@api_router.get("/questions/cache")
+async def get_question_cache_stats():
+    return question_cache.stats()
+
+@api_router.post("/questions/cache/prewarm")
+async def prewarm_question_cache():
+    """Seed the question cache from the resumes and question sets of past sessions"""
+    try:
+        loaded = 0
+        skipped = 0
+        sessions = session_repository.iter_sessions(
+            {"resume_text": 1, "questions": 1, "difficulty": 1, "interview_type": 1, "timestamp": 1}
+        )
+        for session in sessions:
+            if not session.get("resume_text") or not session.get("questions"):
+                continue
+            try:
+                params = InterviewParams(
+                    num_questions=len(session["questions"]),
+                    difficulty=session.get("difficulty", ""),
+                    interview_type=session.get("interview_type", "")
+                )
+            except Exception:
+                skipped += 1
+                continue
+            created_at = session["timestamp"].timestamp() if isinstance(session.get("timestamp"), datetime) else None
+            if created_at and time.time() - created_at > QUESTION_CACHE_TTL:
+                skipped += 1
+                continue
+            # Newer sessions overwrite older ones for the same resume and parameters
+            question_cache.put(QuestionCache.make_key(session["resume_text"], params), session["questions"], created_at)
+            loaded += 1
+        logger.info(f"Pre-warmed question cache with {loaded} question sets")
+        return {"loaded": loaded, "skipped": skipped, **question_cache.stats()}
+    except Exception as e:
+        logger.error(f"Error pre-warming question cache: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    job = job_store.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+@api_router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_store.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"] or "Job failed")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is still {job['status']} ({job['stage']})")
+    return job["result"]
+
+async def evaluate_answers_concurrently(
+    session_id: str,
+    answers: List[Dict[str, str]],
+    events: Optional[asyncio.Queue] = None,
+    batch_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Evaluate all answers with bounded concurrency, storing each result as soon as it is ready.
+
+    When an events queue is given, answers are evaluated with streamed completions and
+    (event, data) tuples are put on it for summary tokens and finished evaluations.
+    Otherwise answers are packed batch_size (default EVALUATION_BATCH_SIZE) per request.
+    """
+    # Reset evaluations to per-question placeholders so partial results can be fetched
+    previous = session_repository.find_and_update_session(
+        session_id,
+        {"$set": {
+            "evaluations": [{"status": "pending"} for _ in answers],
+            "evaluation_status": "in-progress"
+        }, "$inc": {"report_version": 1}},
+        projection={"evaluations": 1}
+    )
+    if previous:
+        session_stats.evaluations_replaced(session_id, previous.get("evaluations", []))
+    # Re-evaluating a session that was already scored waits behind first-time evaluations
+    rescoring = any(
+        not isinstance(evaluation, dict) or evaluation.get("status") != "pending"
+        for evaluation in (previous or {}).get("evaluations") or []
+    )
+    lane = "bulk" if rescoring else "evaluation"
+
+    semaphore = asyncio.Semaphore(max(1, EVALUATION_CONCURRENCY))
+
+    def store_evaluation(index: int, evaluation: Dict[str, Any]):
+        session_repository.update_session(
+            session_id,
+            {"$set": {f"evaluations.{index}": evaluation}, "$inc": {"report_version": 1}}
+        )
+        session_stats.evaluation_written(session_id, {"status": "pending"}, evaluation)
+
+    async def evaluate_batch(start: int, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            evaluations = await evaluate_answer_batch(items)
+        for index, evaluation in enumerate(evaluations, start=start):
+            if evaluation.get("status") == "error":
+                logger.error(f"Error evaluating answer {index} of session {session_id}: {evaluation['error']}")
+            store_evaluation(index, evaluation)
+        return evaluations
+
+    async def evaluate_item(index: int, answer: Dict[str, str]) -> Dict[str, Any]:
+        async def on_summary_delta(delta: str):
+            await events.put(("summary_delta", {"index": index, "delta": delta}))
+
+        async with semaphore:
+            try:
+                if events is None:
+                    evaluation = await evaluate_answer(answer["question"], answer["answer"])
+                else:
+                    evaluation = await evaluate_answer_streaming(answer["question"], answer["answer"], on_summary_delta)
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.error(f"Error evaluating answer {index} of session {session_id}: {detail}")
+                evaluation = {"status": "error", "error": detail, "question": answer["question"]}
+
+        store_evaluation(index, evaluation)
+        if events is not None:
+            if evaluation.get("status") == "error":
+                await events.put(("error", {"index": index, "error": evaluation["error"]}))
+            else:
+                await events.put(("evaluation", {"index": index, "evaluation": evaluation}))
+        return evaluation
+
+    batch_size = max(1, batch_size or EVALUATION_BATCH_SIZE)
+    with llm_lane(lane, session_id):
+        if events is None and batch_size > 1:
+            batches = await asyncio.gather(*(
+                evaluate_batch(start, answers[start:start + batch_size])
+                for start in range(0, len(answers), batch_size)
+            ))
+            evaluations = [evaluation for batch in batches for evaluation in batch]
+        else:
+            evaluations = await asyncio.gather(*(
+                evaluate_item(index, answer) for index, answer in enumerate(answers)
+            ))
+
+    failed = sum(1 for evaluation in evaluations if evaluation.get("status") == "error")
+    session_repository.update_session(
+        session_id,
+        {"$set": {"evaluation_status": "completed_with_errors" if failed else "completed"}}
+    )
+    search_index.refresh(session_id)
+    return evaluations
+
+@api_router.post("/evaluate")
+async def evaluate_interview(request: EvaluationRequest):
+    try:
+        logger.info(f"Starting evaluation for session {request.session_id}")
+        
+        # Get the session
+        session = session_repository.get_session(request.session_id, {"_id": 1})
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        # Evaluate all answers concurrently
+        evaluations = await evaluate_answers_concurrently(
+            request.session_id, request.answers, batch_size=request.batch_size
+        )
+        
+        logger.info(f"Successfully evaluated session {request.session_id}")
+        return {"feedback": evaluations}
+        
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error in evaluate_interview: {str(e)}")
+        logger.error(f"Error type: {type(e).__name__}")
+        logger.error(f"Error traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-run
+background_tasks = set()
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@api_router.post("/evaluate/stream")
+async def evaluate_interview_stream(request: EvaluationRequest):
+    try:
+        logger.info(f"Starting streamed evaluation for session {request.session_id}")
         
-        # Create a new session in MongoDB
+        # Get the session
+        session = session_repository.get_session(request.session_id, {"_id": 1})
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error in evaluate_interview_stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    events = asyncio.Queue()
+
+    async def run_evaluation():
         try:
-            logger.info("Creating new session in MongoDB")
-            session_id = str(ObjectId())
-            session = {
-                "_id": ObjectId(session_id),
-                "timestamp": datetime.now(),
-                "questions": questions,
-                "answers": [],
-                "evaluations": [],
-                "difficulty": difficulty,
-                "interview_type": interview_type,
-                "status": "in-progress",
-                "resume_text": resume_text  # Store the resume text for reference
-            }
-            sessions_collection.insert_one(session)
-            logger.info(f"Successfully created session with ID: {session_id}")
+            evaluations = await evaluate_answers_concurrently(request.session_id, request.answers, events)
+            failed = sum(1 for evaluation in evaluations if evaluation.get("status") == "error")
+            await events.put(("done", {"total": len(evaluations), "failed": failed}))
         except Exception as e:
-            logger.error(f"Error creating session in MongoDB: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error creating session: {str(e)}")
+            logger.error(f"Error in streamed evaluation: {str(e)}")
+            await events.put(("done", {"total": len(request.answers), "error": str(e)}))
+
+    async def event_stream():
+        # The evaluation keeps running (and persisting) if the client disconnects
+        task = asyncio.create_task(run_evaluation())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+        yield format_sse("start", {"session_id": request.session_id, "total": len(request.answers)})
+        while True:
+            event, data = await events.get()
+            yield format_sse(event, data)
+            if event == "done":
+                break
+        await task
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/evaluate/{session_id}")
+async def get_evaluation_progress(session_id: str):
+    try:
+        session = session_repository.get_session(session_id, {"evaluations": 1, "evaluation_status": 1})
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
         
+        evaluations = session.get("evaluations") or []
+        # Legacy sessions can hold None or plain strings in place of evaluation objects
+        statuses = [evaluation.get("status") if isinstance(evaluation, dict) else None for evaluation in evaluations]
+        pending = statuses.count("pending")
+        failed = statuses.count("error")
         return {
             "session_id": session_id,
-            "questions": questions
+            "status": session.get("evaluation_status", "not-started"),
+            "total": len(evaluations),
+            "completed": len(evaluations) - pending,
+            "failed": failed,
+            "evaluations": evaluations
         }
-        
     except HTTPException as he:
-        # Re-raise HTTP exceptions as they are already properly formatted
         raise he
     except Exception as e:
-        logger.error(f"Unexpected error in upload_resume: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error traceback: {traceback.format_exc()}")
+        logger.error(f"Error in get_evaluation_progress: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+SCORE_CRITERIA = ["clarity", "technical_relevance", "structure", "communication", "correctness"]
+
+def _score_value(value: Any) -> Optional[float]:
+    """A stored score as a number, or None for missing and unparseable ones (e.g. legacy "7/10" strings)"""
+    if isinstance(value, bool):
+        return None
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return score if math.isfinite(score) else None
+
+def evaluation_score(evaluation: Any) -> Optional[float]:
+    """Overall score of one evaluation, falling back to the mean of its criteria scores"""
+    if not isinstance(evaluation, dict):
+        return None
+    score = _score_value(evaluation.get("score"))
+    if score is not None:
+        return score
+    criteria = evaluation.get("evaluation")
+    if isinstance(criteria, dict):
+        scores = [
+            _score_value(criteria[key].get("score")) for key in SCORE_CRITERIA
+            if isinstance(criteria.get(key), dict)
+        ]
+        scores = [score for score in scores if score is not None]
+        if scores:
+            return sum(scores) / len(scores)
+    return None
+
+class SessionStatsStore:
+    """Running totals behind /api/sessions/stats, updated as sessions change instead of rescanned"""
+
+    def __init__(self, repository: SessionRepository):
+        self.repository = repository
+
+    @staticmethod
+    def _key(name: Any) -> str:
+        # Difficulty and tag names become field names, which may not contain "." or start with "$"
+        return quote(str(name), safe="").replace(".", "%2E")
+
+    def _inc(self, increments: Dict[str, float]):
+        increments = {field: value for field, value in increments.items() if value}
+        if increments:
+            self.repository.increment_stats(increments)
+
+    def session_created(self, session: Dict[str, Any]):
+        self._inc({
+            "total_sessions": 1,
+            "total_questions": len(session.get("questions", [])),
+            "total_answers": len(session.get("answers", [])),
+            f"difficulty.{self._key(session.get('difficulty', 'unknown'))}": 1
+        })
+
+    def session_deleted(self, session: Dict[str, Any]):
+        increments = {
+            "total_sessions": -1,
+            "total_questions": -len(session.get("questions", [])),
+            "total_answers": -len(session.get("answers", [])),
+            f"difficulty.{self._key(session.get('difficulty', 'unknown'))}": -1,
+            "score_sum": -session.get("score_total", 0),
+            "score_count": -session.get("scored_answers", 0)
+        }
+        for tag in session.get("tags", []):
+            increments[f"tags.{self._key(tag)}"] = -1
+        self._inc(increments)
+
+    def answer_added(self):
+        self._inc({"total_answers": 1})
+
+    def tag_added(self, tag_name: str):
+        self._inc({f"tags.{self._key(tag_name)}": 1})
+
+    def evaluations_replaced(self, session_id: str, old_evaluations: List[Any]):
+        """Drop the scores of evaluations about to be overwritten"""
+        scores = [score for score in map(evaluation_score, old_evaluations) if score is not None]
+        if scores:
+            self._adjust_session_score(session_id, -sum(scores), -len(scores))
+
+    def evaluation_written(self, session_id: str, old_evaluation: Any, new_evaluation: Any):
+        old_score = evaluation_score(old_evaluation)
+        new_score = evaluation_score(new_evaluation)
+        delta_total = (new_score or 0.0) - (old_score or 0.0)
+        delta_count = (new_score is not None) - (old_score is not None)
+        if delta_total or delta_count:
+            self._adjust_session_score(session_id, delta_total, delta_count)
+
+    def _adjust_session_score(self, session_id: str, delta_total: float, delta_count: int):
+        session = self.repository.find_and_update_session(
+            session_id,
+            {"$inc": {"score_total": delta_total, "scored_answers": delta_count}},
+            projection={"score_total": 1, "scored_answers": 1},
+            return_after=True
+        )
+        if session is None:
+            return
+        # Only the write that saw the latest totals sets the average, so concurrent evaluations cannot leave it stale
+        count = session["scored_answers"]
+        self.repository.update_session(
+            session_id,
+            {"$set": {"avg_score": round(session["score_total"] / count, 2) if count else None}},
+            expect={"score_total": session["score_total"], "scored_answers": count}
+        )
+        self._inc({"score_sum": delta_total, "score_count": delta_count})
+
+    def get(self) -> Dict[str, Any]:
+        totals = self.repository.get_stats() or {}
+        score_count = totals.get("score_count", 0)
+
+        # The trend only needs the newest sessions' precomputed averages, served by the timestamp index
+        score_trend = [
+            {"date": session.get("timestamp", ""), "score": session["avg_score"]}
+            for session in self.repository.list_sessions({}, None, 10, summary=True)
+            if session.get("avg_score") is not None
+        ]
+
+        return {
+            "total_sessions": totals.get("total_sessions", 0),
+            "total_questions": totals.get("total_questions", 0),
+            "total_answers": totals.get("total_answers", 0),
+            "average_score": round(totals.get("score_sum", 0) / score_count, 2) if score_count else 0,
+            "difficulty_distribution": {unquote(k): v for k, v in totals.get("difficulty", {}).items() if v},
+            "score_trend": score_trend,
+            "tag_distribution": {unquote(k): v for k, v in totals.get("tags", {}).items() if v}
+        }
+
+    def compute(self) -> Dict[str, Any]:
+        """Recompute every total from the stored sessions"""
+        aggregated = self.repository.aggregate_stats()
+        session_scores = aggregated["session_scores"]
+        return {
+            "total_sessions": aggregated["total_sessions"],
+            "total_questions": aggregated["total_questions"],
+            "total_answers": aggregated["total_answers"],
+            "score_sum": sum(total for total, _ in session_scores.values()),
+            "score_count": sum(count for _, count in session_scores.values()),
+            "difficulty": {self._key(name): count for name, count in aggregated["difficulty"].items()},
+            "tags": {self._key(name): count for name, count in aggregated["tags"].items()},
+            "session_scores": session_scores
+        }
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Replace the incremental totals with recomputed ones, reporting any drift between them"""
+        rebuilt = self.compute()
+        session_scores = rebuilt.pop("session_scores")
+        current = self.repository.get_stats() or {}
+
+        drift = {}
+        # Nothing to compare against the first time the totals are built
+        for field, value in (rebuilt.items() if current else []):
+            incremental = current.get(field, {} if isinstance(value, dict) else 0)
+            if isinstance(value, dict):
+                incremental = {k: v for k, v in incremental.items() if v}
+                matches = incremental == value
+            else:
+                matches = abs(incremental - value) < 1e-6
+            if not matches:
+                drift[field] = {"incremental": incremental, "rebuilt": value}
+
+        self.repository.set_session_scores(session_scores)
+        self.repository.replace_stats(rebuilt)
+
+        if drift:
+            logger.warning(f"Session stats drifted from the stored sessions: {drift}")
+        return {"consistent": not drift, "drift": drift, "stats": self.get()}
+
+session_stats = SessionStatsStore(session_repository)
+
+@app.on_event("startup")
+async def init_session_stats():
+    # First start after upgrading: build the totals from the existing sessions once
+    if session_repository.get_stats() is None:
+        await asyncio.to_thread(session_stats.rebuild)
+
+class SessionSearchIndex:
+    """SQLite FTS5 index over session questions, answers, feedback and notes, kept in sync with the session store"""
+
+    COLUMNS = ["questions", "answers", "feedback", "notes", "interview_type"]
+    # bm25 weights per column: matches in answers and feedback matter more than in generated questions
+    WEIGHTS = (1.0, 2.0, 1.5, 1.0, 0.5)
+    SESSION_PROJECTION = {
+        "timestamp": 1, "difficulty": 1, "interview_type": 1, "notes": 1,
+        "questions": 1, "answers": 1, "evaluations": 1
+    }
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS session_search_docs (
+                id INTEGER PRIMARY KEY,
+                session_id TEXT UNIQUE NOT NULL,
+                timestamp REAL,
+                difficulty TEXT,
+                interview_type TEXT
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_search_docs_filters ON session_search_docs (difficulty, timestamp)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_search_docs_timestamp ON session_search_docs (timestamp)')
+        self._conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS session_search USING fts5(
+                {", ".join(self.COLUMNS)},
+                tokenize = 'porter unicode61'
+            )
+        ''')
+
+    @staticmethod
+    def session_text(session: Dict[str, Any]) -> Dict[str, str]:
+        """Flatten the searchable parts of a session document into one string per column"""
+        def text_of(item, *keys):
+            if isinstance(item, dict):
+                return " ".join(str(item[key]) for key in keys if item.get(key))
+            return str(item) if item else ""
+
+        feedback = []
+        for evaluation in session.get("evaluations", []):
+            if isinstance(evaluation, dict):
+                feedback.append(evaluation.get("summary") or "")
+                feedback.extend(evaluation.get("strengths") or [])
+                feedback.extend(evaluation.get("improvements") or [])
+
+        return {
+            "questions": "\n".join(text_of(question, "question", "text") for question in session.get("questions", [])),
+            "answers": "\n".join(text_of(answer, "answer", "text") for answer in session.get("answers", [])),
+            "feedback": "\n".join(str(item) for item in feedback if item),
+            "notes": session.get("notes") or "",
+            "interview_type": session.get("interview_type") or ""
+        }
+
+    def _write(self, session: Dict[str, Any]):
+        session_id = str(session["_id"])
+        timestamp = session.get("timestamp")
+        values = (
+            timestamp.timestamp() if isinstance(timestamp, datetime) else None,
+            (session.get("difficulty") or "").lower(),
+            session.get("interview_type") or ""
+        )
+        row = self._conn.execute(
+            'SELECT id FROM session_search_docs WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        if row is None:
+            doc_id = self._conn.execute(
+                'INSERT INTO session_search_docs (session_id, timestamp, difficulty, interview_type) VALUES (?, ?, ?, ?)',
+                (session_id, *values)
+            ).lastrowid
+        else:
+            doc_id = row[0]
+            self._conn.execute(
+                'UPDATE session_search_docs SET timestamp = ?, difficulty = ?, interview_type = ? WHERE id = ?',
+                (*values, doc_id)
+            )
+            self._conn.execute('DELETE FROM session_search WHERE rowid = ?', (doc_id,))
+
+        text = self.session_text(session)
+        self._conn.execute(
+            f'INSERT INTO session_search (rowid, {", ".join(self.COLUMNS)}) VALUES (?{", ?" * len(self.COLUMNS)})',
+            (doc_id, *(text[column] for column in self.COLUMNS))
+        )
+
+    def index_sessions(self, sessions) -> int:
+        """Index or re-index many sessions in a single transaction"""
+        count = 0
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                for session in sessions:
+                    self._write(session)
+                    count += 1
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return count
+
+    def refresh(self, session_id: str):
+        """Re-read one session from the session store after a write and update its index entry"""
+        try:
+            session = session_repository.get_session(session_id, self.SESSION_PROJECTION)
+            if session is None:
+                self.remove(session_id)
+            else:
+                self.index_sessions([session])
+        except Exception as e:
+            # The index is derived data; a failed update must not fail the write itself
+            logger.error(f"Error updating search index for session {session_id}: {str(e)}")
+
+    def remove(self, session_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id FROM session_search_docs WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute('DELETE FROM session_search WHERE rowid = ?', (row[0],))
+                self._conn.execute('DELETE FROM session_search_docs WHERE id = ?', (row[0],))
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """Drop the index and rebuild it from every stored session"""
+        with self._lock:
+            self._conn.execute('DELETE FROM session_search')
+            self._conn.execute('DELETE FROM session_search_docs')
+        count = 0
+        batch = []
+        for session in session_repository.iter_sessions(self.SESSION_PROJECTION, batch_size):
+            batch.append(session)
+            if len(batch) >= batch_size:
+                count += self.index_sessions(batch)
+                batch = []
+        count += self.index_sessions(batch)
+        logger.info(f"Rebuilt search index with {count} sessions")
+        return count
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM session_search_docs').fetchone()[0]
+
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        # Quote every term so user input cannot inject FTS5 syntax; the last term also matches as a prefix
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return ""
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def search(
+        self,
+        query: str,
+        difficulty: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = SESSIONS_PAGE_SIZE,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Ranked matches with a highlighted snippet, filtered like the session listing"""
+        match = self.build_match_query(query)
+        if not match:
+            return {"sessions": [], "next_cursor": None}
+
+        conditions = ["session_search MATCH ?"]
+        params = [match]
+        if difficulty:
+            conditions.append("d.difficulty = ?")
+            params.append(difficulty.lower())
+        if start is not None:
+            conditions.append("d.timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            conditions.append("d.timestamp <= ?")
+            params.append(end.timestamp())
+
+        limit = max(1, min(limit, SESSIONS_MAX_PAGE_SIZE))
+        weights = ", ".join(str(weight) for weight in self.WEIGHTS)
+        with self._lock:
+            rows = self._conn.execute(f'''
+                SELECT d.session_id, d.timestamp, d.difficulty, d.interview_type,
+                       bm25(session_search, {weights}) AS rank,
+                       snippet(session_search, -1, '<mark>', '</mark>', '…', 16)
+                FROM session_search
+                JOIN session_search_docs d ON d.id = session_search.rowid
+                WHERE {" AND ".join(conditions)}
+                ORDER BY rank, d.timestamp DESC
+                LIMIT ? OFFSET ?
+            ''', (*params, limit + 1, offset)).fetchall()
+
+        has_more = len(rows) > limit
+        return {
+            "sessions": [
+                {
+                    "_id": session_id,
+                    "timestamp": datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None,
+                    "difficulty": row_difficulty,
+                    "interview_type": interview_type,
+                    "rank": round(-rank, 4),
+                    "snippet": snippet
+                }
+                for session_id, timestamp, row_difficulty, interview_type, rank, snippet in rows[:limit]
+            ],
+            "next_cursor": encode_offset_cursor(offset + limit) if has_more else None
+        }
+
+def encode_offset_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode("utf-8")).decode("ascii")
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        return max(0, int(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["offset"]))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+search_index = SessionSearchIndex(SEARCH_DB_PATH)
+
+@app.on_event("startup")
+async def init_search_index():
+    # Index existing sessions the first time the side index is created
+    if search_index.count() == 0 and session_repository.count_sessions():
+        await asyncio.to_thread(search_index.rebuild)
+
+def create_session(session: Dict[str, Any]):
+    """Persist a new session and record it in the stats totals and the search index"""
+    session_repository.insert_session(session)
+    session_stats.session_created(session)
+    search_index.index_sessions([session])
+
+@app.on_event("startup")
+async def create_session_indexes():
+    await asyncio.to_thread(session_repository.ensure_indexes)
+
+def encode_session_cursor(session: Dict[str, Any]) -> str:
+    # Sessions without a datetime timestamp sort last in both repositories; their cursor carries none
+    timestamp = session.get("timestamp")
+    position = {"timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else None, "id": str(session["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+def decode_session_cursor(cursor: str) -> tuple:
+    """Turn a cursor back into the (timestamp, session_id) position the next page starts after"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        timestamp = datetime.fromisoformat(position["timestamp"]) if position["timestamp"] is not None else None
+        session_id = position["id"]
+        if not isinstance(session_id, str):
+            raise ValueError("cursor id must be a string")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return timestamp, session_id
+
+def list_sessions_page(
+    filters: Dict[str, Any],
+    cursor: Optional[str],
+    limit: int,
+    fields: str
+) -> Dict[str, Any]:
+    """One page of sessions, newest first, with the cursor for the next page"""
+    if fields not in ("summary", "full"):
+        raise HTTPException(status_code=400, detail="fields must be 'summary' or 'full'")
+    limit = max(1, min(limit, SESSIONS_MAX_PAGE_SIZE))
+    after = decode_session_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to know whether another page exists
+    sessions = session_repository.list_sessions(filters, after, limit + 1, summary=fields == "summary")
+
+    has_more = len(sessions) > limit
+    sessions = sessions[:limit]
+    next_cursor = encode_session_cursor(sessions[-1]) if has_more else None
+    return {"sessions": sessions, "next_cursor": next_cursor}
+
+@app.get("/api/sessions")
+async def get_sessions(
+    cursor: str = None,
+    limit: int = SESSIONS_PAGE_SIZE,
+    fields: str = "summary"
+):
+    try:
+        return list_sessions_page({}, cursor, limit, fields)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error in get_sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up the uploaded file
-        if file_path and os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                logger.info(f"Cleaned up file: {file_path}")
-            except Exception as e:
-                logger.error(f"Error cleaning up file {file_path}: {str(e)}")
 
-@api_router.post("/evaluate")
-async def evaluate_interview(request: EvaluationRequest):
+@app.get("/api/sessions/stats")
+async def get_session_statistics():
     try:
-        logger.info(f"Starting evaluation for session {request.session_id}")
-        
-        # Get the session
-        session = sessions_collection.find_one({"_id": ObjectId(request.session_id)})
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Evaluate each answer
-        evaluations = []
-        for answer in request.answers:
-            evaluation = evaluate_answer(answer["question"], answer["answer"])
-            evaluations.append(evaluation)
-        
-        # Update session with evaluations
-        sessions_collection.update_one(
-            {"_id": ObjectId(request.session_id)},
-            {"$set": {"evaluations": evaluations}}
-        )
-        
-        logger.info(f"Successfully evaluated session {request.session_id}")
-        return {"feedback": evaluations}
-        
+        return session_stats.get()
     except Exception as e:
-        logger.error(f"Error in evaluate_interview: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error traceback: {traceback.format_exc()}")
+        logger.error(f"Error in get_session_statistics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/sessions")
-async def get_sessions():
+@api_router.post("/sessions/stats/rebuild")
+async def rebuild_session_statistics():
     try:
-        sessions = list(sessions_collection.find().sort("timestamp", -1))
-        for session in sessions:
-            session["_id"] = str(session["_id"])
-        return sessions
+        return await asyncio.to_thread(session_stats.rebuild)
     except Exception as e:
-        logger.error(f"Error in get_sessions: {str(e)}")
+        logger.error(f"Error in rebuild_session_statistics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/sessions/stats")
-async def get_session_statistics():
+@app.get("/api/sessions/search")
+async def search_sessions(
+    query: str = None,
+    difficulty: str = None,
+    start_date: str = None,
+    end_date: str = None,
+    cursor: str = None,
+    limit: int = SESSIONS_PAGE_SIZE,
+    fields: str = "summary"
+):
     try:
-        # Get all sessions
-        sessions = list(sessions_collection.find())
-        
-        # Calculate statistics
-        total_sessions = len(sessions)
-        total_questions = sum(len(session.get('questions', [])) for session in sessions)
-        total_answers = sum(len(session.get('answers', [])) for session in sessions)
-        
-        # Calculate average score
-        scores = []
-        for session in sessions:
-            if 'evaluations' in session and session['evaluations']:
-                for eval in session['evaluations']:
-                    if isinstance(eval, dict) and 'score' in eval:
-                        scores.append(float(eval['score']))
-                    elif isinstance(eval, dict) and 'evaluation' in eval:
-                        # Handle nested evaluation structure
-                        eval_scores = []
-                        for key in ['clarity', 'technical_relevance', 'structure', 'communication', 'correctness']:
-                            if key in eval['evaluation'] and 'score' in eval['evaluation'][key]:
-                                eval_scores.append(float(eval['evaluation'][key]['score']))
-                        if eval_scores:
-                            scores.append(sum(eval_scores) / len(eval_scores))
-        
-        average_score = sum(scores) / len(scores) if scores else 0
+        # Build the filters
+        filters = {}
         
-        # Calculate difficulty distribution
-        difficulty_distribution = {}
-        for session in sessions:
-            difficulty = session.get('difficulty', 'unknown')
-            difficulty_distribution[difficulty] = difficulty_distribution.get(difficulty, 0) + 1
+        if difficulty and difficulty != "all":
+            filters["difficulty"] = difficulty.lower()
         
-        # Calculate score trend (last 10 sessions)
-        score_trend = []
-        sorted_sessions = sorted(sessions, key=lambda x: x.get('timestamp', ''), reverse=True)[:10]
-        for session in sorted_sessions:
-            if 'evaluations' in session and session['evaluations']:
-                session_scores = []
-                for eval in session['evaluations']:
-                    if isinstance(eval, dict) and 'score' in eval:
-                        session_scores.append(float(eval['score']))
-                    elif isinstance(eval, dict) and 'evaluation' in eval:
-                        eval_scores = []
-                        for key in ['clarity', 'technical_relevance', 'structure', 'communication', 'correctness']:
-                            if key in eval['evaluation'] and 'score' in eval['evaluation'][key]:
-                                eval_scores.append(float(eval['evaluation'][key]['score']))
-                        if eval_scores:
-                            session_scores.append(sum(eval_scores) / len(eval_scores))
-                if session_scores:
-                    score_trend.append({
-                        'date': session.get('timestamp', ''),
-                        'score': sum(session_scores) / len(session_scores)
-                    })
+        if start_date and end_date:
+            filters["start"] = datetime.fromisoformat(start_date)
+            filters["end"] = datetime.fromisoformat(end_date)
         
-        # Calculate tag distribution
-        tag_distribution = {}
-        for session in sessions:
-            if 'tags' in session:
-                for tag in session['tags']:
-                    tag_distribution[tag] = tag_distribution.get(tag, 0) + 1
+        if query:
+            # Ranked full-text matches over questions, answers, feedback and notes
+            return await asyncio.to_thread(
+                search_index.search,
+                query,
+                **filters,
+                limit=limit,
+                offset=decode_offset_cursor(cursor) if cursor else 0
+            )
         
-        return {
-            'total_sessions': total_sessions,
-            'total_questions': total_questions,
-            'total_answers': total_answers,
-            'average_score': round(average_score, 2),
-            'difficulty_distribution': difficulty_distribution,
-            'score_trend': score_trend,
-            'tag_distribution': tag_distribution
-        }
+        return list_sessions_page(filters, cursor, limit, fields)
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        logger.error(f"Error in get_session_statistics: {str(e)}")
+        logger.error(f"Error searching sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/sessions/{session_id}")
 async def get_session(session_id: str):
     try:
-        session = sessions_collection.find_one({"_id": ObjectId(session_id)})
+        session = session_repository.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         return session
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error in get_session: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -731,54 +4574,31 @@ async def get_session(session_id: str):
 async def get_report(session_id: str):
     try:
         logger.info(f"Fetching report for session {session_id}")
-        conn = sqlite3.connect('interview_sessions.db')
-        c = conn.cursor()
         
         # Get session details
-        c.execute('''
-            SELECT 
-                s.id,
-                s.created_at,
-                s.difficulty,
-                s.interview_type,
-                s.overall_score,
-                s.duration,
-                COUNT(q.id) as total_questions
-            FROM sessions s
-            LEFT JOIN questions q ON s.id = q.session_id
-            WHERE s.id = ?
-            GROUP BY s.id
-        ''', (session_id,))
-        
-        session = c.fetchone()
+        session = session_repository.get_session(
+            session_id,
+            {"timestamp": 1, "difficulty": 1, "interview_type": 1, "duration": 1, "questions": 1, "answers": 1, "evaluations": 1}
+        )
         
         if not session:
             logger.warning(f"Session {session_id} not found")
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Get all questions with their evaluations
-        c.execute('''
-            SELECT 
-                q.question_text,
-                q.answer_text,
-                q.evaluation_json,
-                q.score
-            FROM questions q
-            WHERE q.session_id = ?
-            ORDER BY q.id
-        ''', (session_id,))
-        
         questions = []
         strengths = set()
         improvements = set()
+        answers = session.get("answers", [])
+        evaluations = session.get("evaluations", [])
         
-        for row in c.fetchall():
-            evaluation = json.loads(row[2]) if row[2] else {}
+        for index, question in enumerate(session.get("questions", [])):
+            evaluation = evaluations[index] if index < len(evaluations) and isinstance(evaluations[index], dict) else {}
             question_data = {
-                "text": row[0],
-                "answer": row[1],
+                "text": question_text(question),
+                "answer": answers[index] if index < len(answers) else "",
                 "feedback": evaluation.get("summary", "No feedback available"),
-                "score": row[3] if row[3] is not None else evaluation.get("score", 0) * 10,  # Convert 0-10 scale to percentage
+                "score": (evaluation_score(evaluation) or 0) * 10,  # Convert 0-10 scale to percentage
                 "evaluation": {
                     "strengths": evaluation.get("strengths", []),
                     "improvements": evaluation.get("improvements", []),
@@ -798,13 +4618,14 @@ async def get_report(session_id: str):
         average_score = total_score / len(questions) if questions else 0
         
         # Prepare the report data
+        timestamp = session.get("timestamp")
         report_data = {
-            "id": session[0],
-            "date": session[1],
-            "role": session[3].replace("_", " ").title(),
-            "difficulty": session[2].capitalize(),
-            "duration": session[5] or 0,
-            "totalQuestions": session[6],
+            "id": session["_id"],
+            "date": timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+            "role": (session.get("interview_type") or "").replace("_", " ").title(),
+            "difficulty": (session.get("difficulty") or "").capitalize(),
+            "duration": session.get("duration") or 0,
+            "totalQuestions": len(questions),
             "score": average_score,
             "questions": questions,
             "feedback": {
@@ -813,9 +4634,10 @@ async def get_report(session_id: str):
             }
         }
         
-        conn.close()
         return report_data
         
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error fetching report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -823,20 +4645,19 @@ async def get_report(session_id: str):
 @app.get("/api/report/{session_id}/download")
 async def download_report(session_id: str):
     try:
-        # In a real application, you would generate a PDF here
-        # For now, we'll return a simple text file
-        report_text = f"Interview Report for Session {session_id}\n\n"
-        report_text += "This is a placeholder for the actual report content.\n"
-        report_text += "In a real implementation, this would be a PDF file."
+        pdf_content = await get_session_report(session_id)
         
         return Response(
-            content=report_text,
+            content=pdf_content,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=interview-report-{session_id}.pdf"
             }
         )
+    except HTTPException as he:
+        raise he
     except Exception as e:
+        logger.error(f"Error downloading report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/report/{session_id}/share")
@@ -853,23 +4674,18 @@ async def share_report(session_id: str):
 async def debug_list_sessions():
     try:
         logger.info("Fetching all sessions from database")
-        conn = sqlite3.connect('interview_sessions.db')
-        c = conn.cursor()
         
         # Get all sessions
-        c.execute('SELECT id, created_at, interview_type FROM sessions')
-        sessions = c.fetchall()
+        sessions = list(session_repository.iter_sessions({"timestamp": 1, "interview_type": 1}))
         
         logger.info(f"Found {len(sessions)} sessions")
         
-        conn.close()
-        
         return {
             "sessions": [
                 {
-                    "id": session[0],
-                    "created_at": session[1],
-                    "type": session[2]
+                    "id": session["_id"],
+                    "created_at": session["timestamp"].isoformat() if isinstance(session.get("timestamp"), datetime) else None,
+                    "type": session.get("interview_type")
                 }
                 for session in sessions
             ]
@@ -882,25 +4698,6 @@ async def debug_list_sessions():
 async def create_test_session():
     try:
         logger.info("Creating test session")
-        conn = sqlite3.connect('interview_sessions.db')
-        c = conn.cursor()
-        
-        # Create a test session
-        session_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        
-        c.execute('''
-            INSERT INTO sessions 
-            (id, created_at, num_questions, difficulty, interview_type, overall_score)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            session_id,
-            now,
-            3,  # num_questions
-            "medium",  # difficulty
-            "technical",  # interview_type
-            85.0  # overall_score
-        ))
         
         # Create test questions
         test_questions = [
@@ -926,21 +4723,22 @@ async def create_test_session():
             }
         ]
         
-        for question in test_questions:
-            c.execute('''
-                INSERT INTO questions 
-                (id, session_id, question_text, answer_text, evaluation_json)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                str(uuid.uuid4()),
-                session_id,
-                question["text"],
-                question["answer"],
-                json.dumps(question["evaluation"])
-            ))
-        
-        conn.commit()
-        conn.close()
+        # Create a test session
+        session_id = str(ObjectId())
+        session = {
+            "_id": session_id,
+            "timestamp": datetime.now(),
+            "questions": [{"question": question["text"]} for question in test_questions],
+            "answers": [question["answer"] for question in test_questions],
+            "evaluations": [question["evaluation"] for question in test_questions],
+            "difficulty": "medium",
+            "interview_type": "technical",
+            "status": "completed",
+            "evaluation_status": "completed"
+        }
+        create_session(session)
+        for evaluation in session["evaluations"]:
+            session_stats.evaluation_written(session_id, None, evaluation)
         
         logger.info(f"Created test session with ID: {session_id}")
         return {"session_id": session_id}
@@ -952,10 +4750,18 @@ async def create_test_session():
 @app.delete("/api/sessions/{session_id}")
 async def delete_session(session_id: str):
     try:
-        result = sessions_collection.delete_one({"_id": ObjectId(session_id)})
-        if result.deleted_count == 0:
+        session = session_repository.find_and_delete_session(
+            session_id,
+            projection={"questions": 1, "answers": 1, "difficulty": 1, "tags": 1, "score_total": 1, "scored_answers": 1}
+        )
+        if session is None:
             raise HTTPException(status_code=404, detail="Session not found")
+        session_stats.session_deleted(session)
+        search_index.remove(session_id)
+        report_cache.invalidate(session_id)
         return {"message": "Session deleted successfully"}
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error deleting session: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -963,52 +4769,20 @@ async def delete_session(session_id: str):
 @app.patch("/api/sessions/{session_id}")
 async def update_session(session_id: str, notes: str = Form(...)):
     try:
-        result = sessions_collection.update_one(
-            {"_id": ObjectId(session_id)},
-            {"$set": {"notes": notes}}
+        result = session_repository.update_session(
+            session_id,
+            {"$set": {"notes": notes}, "$inc": {"report_version": 1}}
         )
-        if result.matched_count == 0:
+        if not result.matched:
             raise HTTPException(status_code=404, detail="Session not found")
+        search_index.refresh(session_id)
         return {"message": "Session updated successfully"}
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error updating session: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/sessions/search")
-async def search_sessions(
-    query: str = None,
-    difficulty: str = None,
-    start_date: str = None,
-    end_date: str = None
-):
-    try:
-        # Build the query filter
-        filter_query = {}
-        
-        if query:
-            filter_query["interview_type"] = {"$regex": query, "$options": "i"}
-        
-        if difficulty and difficulty != "all":
-            filter_query["difficulty"] = difficulty.lower()
-        
-        if start_date and end_date:
-            filter_query["timestamp"] = {
-                "$gte": datetime.fromisoformat(start_date),
-                "$lte": datetime.fromisoformat(end_date)
-            }
-        
-        # Execute the query
-        sessions = list(sessions_collection.find(filter_query).sort("timestamp", -1))
-        
-        # Convert ObjectId to string for JSON serialization
-        for session in sessions:
-            session["_id"] = str(session["_id"])
-        
-        return sessions
-    except Exception as e:
-        logger.error(f"Error searching sessions: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-
 @app.post("/api/sessions/{session_id}/feedback/rating")
 async def rate_feedback(
     session_id: str,
@@ -1021,12 +4795,12 @@ async def rate_feedback(
             raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
         
         # Update the session with the rating
-        result = sessions_collection.update_one(
-            {"_id": ObjectId(session_id)},
+        result = session_repository.update_session(
+            session_id,
             {"$set": {f"feedback_ratings.{question_index}": rating}}
         )
         
-        if result.matched_count == 0:
+        if not result.matched:
             raise HTTPException(status_code=404, detail="Session not found")
         
         return {"message": "Rating saved successfully"}
@@ -1042,12 +4816,12 @@ async def add_comment(
 ):
     try:
         # Update the session with the comment
-        result = sessions_collection.update_one(
-            {"_id": ObjectId(session_id)},
+        result = session_repository.update_session(
+            session_id,
             {"$set": {f"comments.{question_index}": comment}}
         )
         
-        if result.matched_count == 0:
+        if not result.matched:
             raise HTTPException(status_code=404, detail="Session not found")
         
         return {"message": "Comment saved successfully"}
@@ -1055,19 +4829,226 @@ async def add_comment(
         logger.error(f"Error saving comment: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Report styles, built once per report worker process
+_report_styles = None
+
+def _get_report_styles() -> Dict[str, "ParagraphStyle"]:
+    # ReportLab is only imported by the report worker processes
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    global _report_styles
+    if _report_styles is None:
+        styles = getSampleStyleSheet()
+        _report_styles = {
+            "Normal": styles["Normal"],
+            "Heading2": styles["Heading2"],
+            "Heading3": styles["Heading3"],
+            "Heading4": styles["Heading4"],
+            "Title": ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=24,
+                spaceAfter=30
+            ),
+            "Heading": ParagraphStyle(
+                'CustomHeading',
+                parent=styles['Heading2'],
+                fontSize=18,
+                spaceAfter=20
+            )
+        }
+    return _report_styles
+
+def _paragraph(text: Any, style: "ParagraphStyle") -> "Paragraph":
+    from reportlab.platypus import Paragraph
+
+    # Answers and feedback are free text; escape them so ReportLab does not parse them as markup
+    return Paragraph(xml_escape(str(text)), style)
+
+def _render_sessions_export(sessions: List[Dict[str, Any]], include_questions: bool, include_evaluations: bool) -> bytes:
+    """Render the multi-session PDF export inside a report worker process"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = _get_report_styles()
+
+    # Content
+    content = []
+
+    # Title
+    content.append(Paragraph("Interview Sessions Report", styles['Title']))
+    content.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    content.append(Spacer(1, 20))
+
+    # Session details
+    for session in sessions:
+        content.append(Paragraph(f"Session {str(session['_id'])}", styles['Heading2']))
+        content.append(_paragraph(f"Date: {session.get('timestamp', '')}", styles['Normal']))
+        content.append(_paragraph(f"Type: {session.get('interview_type', '')}", styles['Normal']))
+        content.append(_paragraph(f"Difficulty: {session.get('difficulty', '')}", styles['Normal']))
+
+        if include_questions:
+            content.append(Paragraph("Questions and Answers:", styles['Heading3']))
+            for i, question in enumerate(session.get("questions", [])):
+                content.append(_paragraph(f"Q{i+1}: {question_text(question)}", styles['Normal']))
+                if i < len(session.get("answers", [])):
+                    content.append(_paragraph(f"A: {session['answers'][i]}", styles['Normal']))
+                if include_evaluations and i < len(session.get("evaluations", [])):
+                    eval = session['evaluations'][i]
+                    if not isinstance(eval, dict):
+                        eval = {}
+                    content.append(_paragraph(f"Score: {eval.get('score', 'N/A')}", styles['Normal']))
+                    content.append(_paragraph(f"Feedback: {eval.get('summary', 'N/A')}", styles['Normal']))
+
+        content.append(Spacer(1, 20))
+
+    # Build PDF
+    doc.build(content)
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
+
+_report_pool = None
+
+def _get_report_pool() -> ProcessPoolExecutor:
+    global _report_pool
+    if _report_pool is None:
+        _report_pool = ProcessPoolExecutor(
+            max_workers=max(1, REPORT_WORKERS),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _report_pool
+
+@app.on_event("shutdown")
+async def stop_report_workers():
+    if _report_pool is not None:
+        _report_pool.shutdown(wait=False, cancel_futures=True)
+
+async def render_report(fn, *args) -> bytes:
+    """Run a ReportLab render function in the report worker pool"""
+    global _report_pool
+    loop = asyncio.get_running_loop()
+    try:
+        with metrics.timer("pdf_render"):
+            return await loop.run_in_executor(_get_report_pool(), fn, *args)
+    except BrokenProcessPool:
+        logger.error("Report worker pool crashed, restarting on next render")
+        _report_pool = None
+        raise
+
+class ReportCache:
+    """Rendered session reports on disk, addressed by session id, report version and template version
+
+    Each session's renders live in their own directory, so invalidation only lists that session's files.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Counted once at startup and kept up to date by put/invalidate
+        self.entries = sum(
+            1 for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name))
+            for entry in os.listdir(os.path.join(directory, name)) if entry.endswith(".pdf")
+        )
+
+    @staticmethod
+    def make_key(session_id: str, report_version: int) -> str:
+        return hashlib.sha256(f"{session_id}:{report_version}:{REPORT_TEMPLATE_VERSION}".encode("utf-8")).hexdigest()
+
+    def _session_dir(self, session_id: str) -> str:
+        return os.path.join(self.directory, session_id)
+
+    def _path(self, session_id: str, key: str) -> str:
+        return os.path.join(self._session_dir(session_id), f"{key}.pdf")
+
+    def get(self, session_id: str, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(session_id, key), "rb") as report_file:
+                pdf_content = report_file.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return pdf_content
+
+    def put(self, session_id: str, key: str, pdf_content: bytes):
+        path = self._path(session_id, key)
+        os.makedirs(self._session_dir(session_id), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as report_file:
+            report_file.write(pdf_content)
+        with self._lock:
+            if not os.path.exists(path):
+                self.entries += 1
+            os.replace(temp_path, path)
+        # Renders of older versions of this session can never be requested again
+        self.invalidate(session_id, keep=path)
+
+    def invalidate(self, session_id: str, keep: Optional[str] = None):
+        session_dir = self._session_dir(session_id)
+        try:
+            names = os.listdir(session_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(session_dir, name)
+            if name.endswith(".pdf") and path != keep:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                with self._lock:
+                    self.entries -= 1
+        if keep is None:
+            try:
+                os.rmdir(session_dir)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": self.entries
+            }
+
+report_cache = ReportCache(REPORT_CACHE_DIR)
+
+async def get_session_report(session_id: str) -> bytes:
+    """The session's PDF report, rendered once per report_version and then served from disk"""
+    session = session_repository.get_session(session_id, {"resume_text": 0})
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    key = ReportCache.make_key(session_id, session.get("report_version", 0))
+    pdf_content = report_cache.get(session_id, key)
+    if pdf_content is not None:
+        logger.info(f"Report cache hit for session {session_id}")
+        return pdf_content
+
+    pdf_content = await render_report(generate_pdf_report, session)
+    report_cache.put(session_id, key, pdf_content)
+    return pdf_content
+
+@api_router.get("/reports/cache")
+async def get_report_cache_stats():
+    return report_cache.stats()
+
 @app.get("/api/sessions/{session_id}/export")
 async def export_report(session_id: str):
     try:
-        # Get the session
-        session = sessions_collection.find_one({"_id": ObjectId(session_id)})
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Convert ObjectId to string for JSON serialization
-        session["_id"] = str(session["_id"])
-        
-        # Generate PDF content
-        pdf_content = generate_pdf_report(session)
+        # Rendered in the report worker pool, or served from the report cache
+        pdf_content = await get_session_report(session_id)
         
         # Return the PDF file
         return Response(
@@ -1077,65 +5058,58 @@ async def export_report(session_id: str):
                 "Content-Disposition": f"attachment; filename=interview-report-{session_id}.pdf"
             }
         )
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error exporting report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 def generate_pdf_report(session):
-    """Generate a PDF report for the interview session"""
+    """Generate a PDF report for the interview session (runs in a report worker process)"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
     # Create a buffer to store the PDF
     buffer = io.BytesIO()
     
     # Create the PDF document
     doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=18,
-        spaceAfter=20
-    )
+    styles = _get_report_styles()
     
     # Content
     content = []
     
     # Title
-    content.append(Paragraph(f"Interview Report - {session['interview_type']}", title_style))
-    content.append(Paragraph(f"Date: {session['timestamp']}", styles['Normal']))
+    content.append(_paragraph(f"Interview Report - {session.get('interview_type', '')}", styles['Title']))
+    content.append(_paragraph(f"Date: {session.get('timestamp', '')}", styles['Normal']))
+    if session.get('notes'):
+        content.append(Paragraph("Notes:", styles['Heading3']))
+        content.append(_paragraph(session['notes'], styles['Normal']))
     content.append(Spacer(1, 20))
     
-    # Questions and Answers
-    for i, (question, answer, evaluation) in enumerate(zip(
-        session['questions'],
-        session['answers'],
-        session['evaluations']
-    )):
-        content.append(Paragraph(f"Question {i+1}: {question['text']}", heading_style))
+    # Questions and Answers (unanswered and unevaluated questions are still listed)
+    answers = session.get('answers', [])
+    evaluations = session.get('evaluations', [])
+    for i, question in enumerate(session.get('questions', [])):
+        answer = answers[i] if i < len(answers) else None
+        evaluation = evaluations[i] if i < len(evaluations) else None
+        content.append(_paragraph(f"Question {i+1}: {question_text(question)}", styles['Heading']))
         content.append(Paragraph("Your Answer:", styles['Heading3']))
-        content.append(Paragraph(answer or "No answer provided", styles['Normal']))
+        content.append(_paragraph(answer or "No answer provided", styles['Normal']))
         
-        if evaluation:
+        if isinstance(evaluation, dict) and not evaluation.get('status'):
             content.append(Paragraph("Feedback:", styles['Heading3']))
-            content.append(Paragraph(evaluation['summary'], styles['Normal']))
+            content.append(_paragraph(evaluation.get('summary', ''), styles['Normal']))
             
             # Strengths
             content.append(Paragraph("Strengths:", styles['Heading4']))
-            for strength in evaluation['strengths']:
-                content.append(Paragraph(f"• {strength}", styles['Normal']))
+            for strength in evaluation.get('strengths', []):
+                content.append(_paragraph(f"• {strength}", styles['Normal']))
             
             # Areas for Improvement
             content.append(Paragraph("Areas for Improvement:", styles['Heading4']))
-            for improvement in evaluation['improvements']:
-                content.append(Paragraph(f"• {improvement}", styles['Normal']))
+            for improvement in evaluation.get('improvements', []):
+                content.append(_paragraph(f"• {improvement}", styles['Normal']))
         
         content.append(Spacer(1, 20))
     
@@ -1152,20 +5126,16 @@ def generate_pdf_report(session):
 async def create_tag(tag: Tag):
     try:
         # Check if tag already exists
-        existing_tag = tags_collection.find_one({"name": tag.name})
+        existing_tag = session_repository.get_tag(tag.name)
         if existing_tag:
             raise HTTPException(status_code=400, detail="Tag already exists")
         
         # Create new tag
-        tag_id = str(ObjectId())
-        tags_collection.insert_one({
-            "_id": ObjectId(tag_id),
-            "name": tag.name,
-            "color": tag.color,
-            "created_at": datetime.now()
-        })
+        tag_id = session_repository.insert_tag(tag.name, tag.color)
         
         return {"tag_id": tag_id}
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error creating tag: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1174,128 +5144,163 @@ async def create_tag(tag: Tag):
 async def add_tag_to_session(session_id: str, tag_name: str):
     try:
         # Check if session exists
-        session = sessions_collection.find_one({"_id": ObjectId(session_id)})
+        session = session_repository.get_session(session_id, {"_id": 1})
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Check if tag exists
-        tag = tags_collection.find_one({"name": tag_name})
+        tag = session_repository.get_tag(tag_name)
         if not tag:
             raise HTTPException(status_code=404, detail="Tag not found")
         
         # Add tag to session
-        session_tags_collection.insert_one({
-            "session_id": session_id,
-            "tag_name": tag_name,
-            "added_at": datetime.now()
-        })
+        session_repository.link_tag(session_id, tag_name)
+        result = session_repository.update_session(
+            session_id,
+            {"$addToSet": {"tags": tag_name}}
+        )
+        if result.modified:
+            session_stats.tag_added(tag_name)
         
         return {"message": "Tag added successfully"}
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error adding tag to session: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def export_projection(request: ExportRequest) -> Dict[str, int]:
+    """Only fetch the session fields the export will actually write"""
+    projection = {"timestamp": 1, "interview_type": 1, "difficulty": 1, "avg_score": 1}
+    if request.include_questions:
+        projection["questions"] = 1
+    if request.include_answers:
+        projection["answers"] = 1
+    if request.include_evaluations:
+        projection["evaluations"] = 1
+    return projection
+
+def iter_export_sessions(session_ids: List[str], projection: Dict[str, int]):
+    """Yield the requested sessions in request order, one batched fetch per EXPORT_BATCH_SIZE ids"""
+    batch_size = max(1, EXPORT_BATCH_SIZE)
+    for start in range(0, len(session_ids), batch_size):
+        batch = session_ids[start:start + batch_size]
+        found = {session["_id"]: session for session in session_repository.get_sessions(batch, projection)}
+        for session_id in batch:
+            if session_id in found:
+                yield found.pop(session_id)
+
+def session_export_score(session: Dict[str, Any]):
+    if session.get("avg_score") is not None:
+        return session["avg_score"]
+    return calculate_average_score(session.get("evaluations", []))
+
+def question_text(question: Any) -> str:
+    if isinstance(question, dict):
+        return question.get("question") or question.get("text") or ""
+    return str(question)
+
+# Streamed exports are sent in chunks of about this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def stream_sessions_csv(request: ExportRequest, session_ids: List[str]):
+    """Emit the CSV export incrementally, holding at most one chunk of rows in memory"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        rows = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return rows
+
+    # Write header
+    headers = ["Session ID", "Date", "Interview Type", "Difficulty", "Score"]
+    if request.include_questions:
+        headers.append("Question")
+    if request.include_answers:
+        headers.append("Answer")
+    if request.include_evaluations:
+        headers.append("Evaluation")
+    writer.writerow(headers)
+
+    # One row per question (or a single row when no per-question columns are exported)
+    for session in iter_export_sessions(session_ids, export_projection(request)):
+        questions = session.get("questions", [])
+        answers = session.get("answers", [])
+        evaluations = session.get("evaluations", [])
+        timestamp = session.get("timestamp")
+        for i in range(max(len(questions), len(answers), len(evaluations), 1)):
+            row = [
+                str(session["_id"]),
+                timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp or "",
+                session.get("interview_type", ""),
+                session.get("difficulty", ""),
+                session_export_score(session)
+            ]
+            if request.include_questions:
+                row.append(question_text(questions[i]) if i < len(questions) else "")
+            if request.include_answers:
+                row.append(answers[i] if i < len(answers) else "")
+            if request.include_evaluations:
+                row.append(json.dumps(evaluations[i], default=str) if i < len(evaluations) else "")
+            writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield flush()
+    yield flush()
+
+def stream_sessions_json(request: ExportRequest, session_ids: List[str], ndjson: bool = False):
+    """Emit the export as a JSON array, or one JSON document per line, element by element"""
+    parts = [] if ndjson else ["["]
+    size = 0
+    first = True
+    for session in iter_export_sessions(session_ids, export_projection(request)):
+        element = json.dumps(session, default=str)
+        if ndjson:
+            element += "\n"
+        elif not first:
+            element = "," + element
+        first = False
+        parts.append(element)
+        size += len(element)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    if not ndjson:
+        parts.append("]")
+    yield "".join(parts)
+
 @app.post("/api/sessions/export")
 async def export_sessions(request: ExportRequest):
     try:
-        # Get selected sessions
-        sessions = []
-        for session_id in request.session_ids:
-            session = sessions_collection.find_one({"_id": ObjectId(session_id)})
-            if session:
-                sessions.append(session)
-        
-        if not sessions:
+        session_ids = list(request.session_ids)
+
+        # Only check that something will be exported; rows are fetched in batches while streaming
+        if next(iter_export_sessions(session_ids, {"_id": 1}), None) is None:
             raise HTTPException(status_code=404, detail="No sessions found")
         
         # Prepare data based on format
-        if request.format == "json":
-            return Response(
-                content=json.dumps(sessions, default=str),
-                media_type="application/json",
-                headers={"Content-Disposition": "attachment; filename=sessions.json"}
+        if request.format in ("json", "ndjson"):
+            ndjson = request.format == "ndjson"
+            return StreamingResponse(
+                stream_sessions_json(request, session_ids, ndjson=ndjson),
+                media_type="application/x-ndjson" if ndjson else "application/json",
+                headers={"Content-Disposition": f"attachment; filename=sessions.{request.format}"}
             )
         elif request.format == "csv":
-            # Convert sessions to CSV format
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            headers = ["Session ID", "Date", "Interview Type", "Difficulty", "Score"]
-            if request.include_questions:
-                headers.extend(["Question", "Answer", "Evaluation"])
-            writer.writerow(headers)
-            
-            # Write data
-            for session in sessions:
-                for i in range(len(session.get("questions", []))):
-                    row = [
-                        str(session["_id"]),
-                        session["timestamp"].isoformat(),
-                        session.get("interview_type", ""),
-                        session.get("difficulty", ""),
-                        calculate_average_score(session.get("evaluations", []))
-                    ]
-                    if request.include_questions:
-                        row.extend([
-                            session["questions"][i]["text"],
-                            session["answers"][i] if i < len(session["answers"]) else "",
-                            json.dumps(session["evaluations"][i]) if i < len(session["evaluations"]) else ""
-                        ])
-                    writer.writerow(row)
-            
-            return Response(
-                content=output.getvalue(),
+            return StreamingResponse(
+                stream_sessions_csv(request, session_ids),
                 media_type="text/csv",
                 headers={"Content-Disposition": "attachment; filename=sessions.csv"}
             )
         elif request.format == "pdf":
-            # Generate PDF report
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30
+            # Generate PDF report in the report worker pool
+            sessions = list(iter_export_sessions(session_ids, export_projection(request)))
+            pdf_data = await render_report(
+                _render_sessions_export, sessions, request.include_questions, request.include_evaluations
             )
             
-            # Content
-            content = []
-            
-            # Title
-            content.append(Paragraph("Interview Sessions Report", title_style))
-            content.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            content.append(Spacer(1, 20))
-            
-            # Session details
-            for session in sessions:
-                content.append(Paragraph(f"Session {str(session['_id'])}", styles['Heading2']))
-                content.append(Paragraph(f"Date: {session['timestamp']}", styles['Normal']))
-                content.append(Paragraph(f"Type: {session['interview_type']}", styles['Normal']))
-                content.append(Paragraph(f"Difficulty: {session['difficulty']}", styles['Normal']))
-                
-                if request.include_questions:
-                    content.append(Paragraph("Questions and Answers:", styles['Heading3']))
-                    for i, question in enumerate(session.get("questions", [])):
-                        content.append(Paragraph(f"Q{i+1}: {question['text']}", styles['Normal']))
-                        if i < len(session.get("answers", [])):
-                            content.append(Paragraph(f"A: {session['answers'][i]}", styles['Normal']))
-                        if request.include_evaluations and i < len(session.get("evaluations", [])):
-                            eval = session['evaluations'][i]
-                            content.append(Paragraph(f"Score: {eval.get('score', 'N/A')}", styles['Normal']))
-                            content.append(Paragraph(f"Feedback: {eval.get('summary', 'N/A')}", styles['Normal']))
-                
-                content.append(Spacer(1, 20))
-            
-            # Build PDF
-            doc.build(content)
-            pdf_data = buffer.getvalue()
-            buffer.close()
-            
             return Response(
                 content=pdf_data,
                 media_type="application/pdf",
@@ -1303,6 +5308,8 @@ async def export_sessions(request: ExportRequest):
             )
         else:
             raise HTTPException(status_code=400, detail="Unsupported export format")
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error exporting sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1316,7 +5323,7 @@ async def compare_sessions(request: ComparisonRequest):
         # Get sessions
         sessions = []
         for session_id in request.session_ids:
-            session = sessions_collection.find_one({"_id": ObjectId(session_id)})
+            session = session_repository.get_session(session_id)
             if not session:
                 raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
             sessions.append(session)
@@ -1325,14 +5332,14 @@ async def compare_sessions(request: ComparisonRequest):
         comparison = {
             "sessions": [
                 {
-                    "id": str(session["_id"]),
+                    "id": session["_id"],
                     "timestamp": session["timestamp"],
                     "interview_type": session["interview_type"],
                     "difficulty": session["difficulty"],
                     "score": calculate_average_score(session.get("evaluations", [])),
                     "questions_answered": len(session.get("answers", [])),
                     "total_questions": len(session.get("questions", [])),
-                    "tags": [tag["tag_name"] for tag in session_tags_collection.find({"session_id": str(session["_id"])})]
+                    "tags": session.get("tags", [])
                 }
                 for session in sessions
             ],
@@ -1357,14 +5364,87 @@ async def compare_sessions(request: ComparisonRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 def calculate_average_score(evaluations):
-    if not evaluations:
+    # Pending and failed evaluations carry no score
+    scores = [eval["score"] for eval in evaluations if isinstance(eval, dict) and "score" in eval]
+    if not scores:
         return 0
-    scores = [eval.get("score", 0) for eval in evaluations]
     return sum(scores) / len(scores)
 
+def _warm_up_report_worker() -> int:
+    _get_report_styles()
+    return os.getpid()
+
+async def warm_up() -> Dict[str, Any]:
+    """Load the Whisper model and ReportLab in their worker processes ahead of the first request"""
+    started = time.perf_counter()
+    report_pool = _get_report_pool()
+    loop = asyncio.get_running_loop()
+    inference, _ = await asyncio.gather(
+        inference_executor.warm_up(),
+        asyncio.gather(*(
+            loop.run_in_executor(report_pool, _warm_up_report_worker) for _ in range(max(1, REPORT_WORKERS))
+        ))
+    )
+    return {"inference": inference, "seconds": round(time.perf_counter() - started, 3)}
+
+@api_router.post("/warmup")
+async def warm_up_workers():
+    try:
+        return await warm_up()
+    except Exception as e:
+        logger.error(f"Error in warm_up_workers: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.on_event("startup")
+async def schedule_warm_up():
+    # Runs after the other startup hooks; the readiness probe waits for it
+    app.state.started = True
+    if WARMUP_ON_STARTUP:
+        task = asyncio.create_task(warm_up())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+@app.get("/healthz")
+async def liveness():
+    """The process is up and its event loop is responding"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness(response: Response):
+    """Whether to route traffic here: startup has finished and the model is loaded if warm-up was requested"""
+    model_state = inference_executor.model_state
+    ready = (
+        getattr(app.state, "started", False)
+        and model_state != "failed"
+        and (model_state == "ready" or not WARMUP_ON_STARTUP)
+    )
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "not-ready",
+        "model": model_state,
+        "model_error": inference_executor.model_error
+    }
+
 # Include the router in the app
 app.include_router(api_router)
 
+async def run_job_workers_forever():
+    job_workers.workers = max(1, job_workers.workers)
+    job_workers.start()
+    await asyncio.Event().wait()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        # Run only the background job workers, scaled separately from the API processes
+        asyncio.run(run_job_workers_forever())
+    elif len(sys.argv) > 1 and sys.argv[1] == "rebuild-search":
+        print(f"Indexed {search_index.rebuild()} sessions")
+    elif len(sys.argv) > 1 and sys.argv[1] == "rebuild-stats":
+        # Recompute the session stats from scratch and report drift from the incremental totals
+        report = session_stats.rebuild()
+        print(json.dumps(report, indent=2, default=str))
+        sys.exit(0 if report["consistent"] else 1)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Benchmark the audio ingestion path in front of Whisper.
+
+"disk + pydub" is the old transcribe_interview path: write the upload to
+audio/*.webm, decode it with pydub, export WAV into a BytesIO, write that to
+a temporary file and let whisper.load_audio decode it again with ffmpeg.
+"ffmpeg pipe" is backend.decode_audio: one ffmpeg decode from stdin into a
+float32 array.
+
+    python bench/bench_audio_decode.py --seconds 10 30 60 --repeat 3
+"""
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import whisper
+from pydub import AudioSegment
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+
+
+def make_clip(seconds: int) -> bytes:
+    """Synthesise a speech-like opus/webm clip, like a MediaRecorder upload"""
+    process = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+            "-f", "lavfi", "-i", f"anoisesrc=amplitude=0.05:duration={seconds}",
+            "-filter_complex", "amix=inputs=2", "-ar", "48000", "-ac", "1",
+            "-c:a", "libopus", "-f", "webm", "pipe:1"
+        ],
+        capture_output=True,
+        check=True
+    )
+    return process.stdout
+
+
+def old_path(audio_data: bytes, directory: str):
+    copied = 0
+    webm_path = os.path.join(directory, "upload.webm")
+    with open(webm_path, "wb") as buffer:
+        buffer.write(audio_data)
+    copied += len(audio_data)
+
+    audio = AudioSegment.from_file(webm_path, format="webm").set_frame_rate(16000).set_channels(1)
+    copied += len(audio.raw_data)
+    wav_buffer = io.BytesIO()
+    audio.export(wav_buffer, format="wav")
+    wav_data = wav_buffer.getvalue()
+    copied += len(wav_data)
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=directory, delete=False) as wav_file:
+        wav_file.write(wav_data)
+        wav_path = wav_file.name
+    copied += len(wav_data)
+
+    samples = whisper.load_audio(wav_path)
+    copied += samples.nbytes // 2 + samples.nbytes  # s16le pipe output, then float32 conversion
+
+    os.remove(wav_path)
+    os.remove(webm_path)
+    return samples, copied
+
+
+def new_path(audio_data: bytes, directory: str):
+    samples = backend.decode_audio(audio_data)
+    return samples, len(audio_data) + samples.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'clip s':>6}  {'path':<14} {'median ms':>10} {'bytes copied':>13} {'samples':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in args.seconds:
+            clip = make_clip(seconds)
+            for name, fn in (("disk + pydub", old_path), ("ffmpeg pipe", new_path)):
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    samples, copied = fn(clip, directory)
+                    timings.append(time.perf_counter() - started)
+                median_ms = statistics.median(timings) * 1000
+                print(f"{seconds:>6}  {name:<14} {median_ms:>10.1f} {copied:>13,} {len(samples):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark batched answer evaluation against the local OpenRouter stub.
+
+For each batch size K, evaluates the same set of answers the way
+/api/evaluate does: K=1 sends one backend.build_evaluation_payload request
+per answer, K>1 packs K answers into each backend.evaluate_answer_batch
+request. Prompt/completion tokens come from the stub's usage counters, so
+the rubric saved by stating it once per batch shows up directly.
+
+    python bench/bench_evaluation_batching.py --answers 24 --sizes 1 2 4 8 --generation-delay 0.002
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+import fake_openrouter  # noqa: E402
+
+ANSWER = (
+    "In my last role I owned the checkout service. We had latency spikes during sales, so I added "
+    "request tracing, found an N+1 query in the cart lookup and replaced it with a batched fetch, "
+    "which brought p95 latency from 900ms down to about 200ms."
+)
+
+
+def start_stub(args) -> str:
+    app = fake_openrouter.build_app(
+        latency=args.latency,
+        malformed_rate=args.malformed_rate,
+        generation_delay=args.generation_delay
+    )
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{args.port}"
+
+
+async def evaluate_all(items, size: int):
+    semaphore = asyncio.Semaphore(max(1, backend.EVALUATION_CONCURRENCY))
+
+    async def run(chunk):
+        async with semaphore:
+            if size == 1:
+                return [await backend.evaluate_answer(chunk[0]["question"], chunk[0]["answer"])]
+            return await backend.evaluate_answer_batch(chunk)
+
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    return [evaluation for chunk in await asyncio.gather(*(run(chunk) for chunk in chunks)) for evaluation in chunk]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=24)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub seconds per request")
+    parser.add_argument("--generation-delay", type=float, default=0.002, help="Stub seconds per completion token")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of batched entries the stub breaks")
+    args = parser.parse_args()
+
+    # The backend logs every request and raw response at INFO
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    stub_url = start_stub(args)
+    backend.openrouter_client.url = f"{stub_url}/api/v1/chat/completions"
+    items = [{"question": f"Tell me about a time you improved performance (#{i})", "answer": ANSWER}
+             for i in range(args.answers)]
+
+    print(f"{'K':>3} {'requests':>9} {'prompt tok/ans':>15} {'compl tok/ans':>14} {'wall s':>8} {'errors':>7}")
+    for size in args.sizes:
+        before = httpx.get(f"{stub_url}/stats").json()
+        started = time.perf_counter()
+        evaluations = asyncio.run(evaluate_all(items, size))
+        wall = time.perf_counter() - started
+        after = httpx.get(f"{stub_url}/stats").json()
+        # Each asyncio.run gets a fresh loop, so the pooled client must not be reused across runs
+        backend.openrouter_client._client = None
+        backend.openrouter_client._host_limits = {}
+
+        errors = sum(1 for evaluation in evaluations if evaluation.get("status") == "error")
+        print(f"{size:>3} {after['requests'] - before['requests']:>9} "
+              f"{(after['prompt_tokens'] - before['prompt_tokens']) / len(items):>15.0f} "
+              f"{(after['completion_tokens'] - before['completion_tokens']) / len(items):>14.0f} "
+              f"{wall:>8.2f} {errors:>7}")
+
+    print("\nper-batch stats (backend.evaluation_batch_stats):")
+    for size, stats in backend.evaluation_batch_stats.stats().items():
+        print(f"  K={size}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
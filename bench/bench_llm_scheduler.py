@@ -0,0 +1,126 @@
+"""Benchmark the LLM request scheduler against a rate-limited OpenRouter stub.
+
+The stub allows --rate-limit requests per --rate-window seconds and answers
+the rest with 429. The same mixed workload is run with the scheduler off
+(requests go straight out and back off on 429) and on (paced at the stub's
+limit): a backlog of --bulk re-evaluations from a few sessions in the bulk
+lane, plus --interactive question generations that arrive every --arrival
+seconds in the interactive lane, as candidates uploading resumes would.
+
+Reports per-lane p50/p95 latency, failed requests (errors surfaced to the
+caller, including scheduler rejections) and the 429s the stub sent.
+
+    python bench/bench_llm_scheduler.py --rate-limit 20 --rate-window 10 --bulk 40 --interactive 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+import fake_openrouter  # noqa: E402
+
+ANSWER = (
+    "I split the monolith's reporting module into a queue-backed worker, which kept the API "
+    "responsive during month-end runs and cut report generation time by half."
+)
+RESUME = "Backend engineer, five years of Python, FastAPI, PostgreSQL and Kubernetes."
+
+
+def start_stub(args) -> str:
+    app = fake_openrouter.build_app(latency=args.latency, rate_limit=args.rate_limit, rate_window=args.rate_window)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{args.port}"
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(len(values) * fraction + 0.5) - 1))]
+
+
+async def workload(args) -> dict:
+    results = {"interactive": [], "bulk": []}
+    failures = {"interactive": 0, "bulk": 0}
+    params = backend.InterviewParams(num_questions=5, difficulty="medium", interview_type="technical")
+
+    async def timed(lane: str, owner: str, call):
+        started = time.perf_counter()
+        with backend.llm_lane(lane, owner):
+            try:
+                await call()
+            except Exception:
+                failures[lane] += 1
+                return
+        results[lane].append(time.perf_counter() - started)
+
+    async def bulk(index: int):
+        await timed("bulk", f"session-{index % 4}",
+                    lambda: backend.evaluate_answer(f"Describe a refactoring you led (#{index})", ANSWER))
+
+    async def interactive(index: int):
+        await asyncio.sleep(index * args.arrival)
+        await timed("interactive", f"candidate-{index}", lambda: backend.generate_questions(RESUME, params))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bulk(i) for i in range(args.bulk)), *(interactive(i) for i in range(args.interactive)))
+    return {"wall": time.perf_counter() - started, "latencies": results, "failures": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk", type=int, default=40, help="Re-evaluation requests queued at the start")
+    parser.add_argument("--interactive", type=int, default=8, help="Question generations arriving during the backlog")
+    parser.add_argument("--arrival", type=float, default=1.5, help="Seconds between interactive arrivals")
+    parser.add_argument("--rate-limit", type=int, default=20, help="Stub requests allowed per window")
+    parser.add_argument("--rate-window", type=float, default=10.0, help="Stub rate window in seconds")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per request")
+    parser.add_argument("--port", type=int, default=8093)
+    args = parser.parse_args()
+
+    logging.getLogger("backend").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    stub_url = start_stub(args)
+    backend.openrouter_client.url = f"{stub_url}/api/v1/chat/completions"
+    requests_per_minute = args.rate_limit * 60 / args.rate_window
+
+    print(f"stub limit {args.rate_limit} requests / {args.rate_window:g}s ({requests_per_minute:g}/min)\n")
+    print(f"{'scheduler':<10} {'lane':<12} {'done':>5} {'failed':>7} {'p50 s':>7} {'p95 s':>7} {'wall s':>7} {'429s':>5}")
+    for enabled in (False, True):
+        backend.llm_scheduler = backend.LLMScheduler(
+            requests_per_minute if enabled else 0, 0, backend.LLM_RATE_BURST, backend.LLM_QUEUE_LIMIT,
+            backend.LLM_LANE_DEADLINES
+        )
+        # Each asyncio.run gets a fresh loop, so the pooled client must not be reused across runs
+        backend.openrouter_client._client = None
+        backend.openrouter_client._host_limits = {}
+        backend.openrouter_client.breaker.record_success()
+        # Let the previous run's requests leave the stub's window
+        time.sleep(args.rate_window)
+
+        before = httpx.get(f"{stub_url}/stats").json()
+        result = asyncio.run(workload(args))
+        after = httpx.get(f"{stub_url}/stats").json()
+        rate_limited = after["rate_limited"] - before["rate_limited"]
+        for lane in ("interactive", "bulk"):
+            latencies = result["latencies"][lane]
+            print(f"{'on' if enabled else 'off':<10} {lane:<12} {len(latencies):>5} {result['failures'][lane]:>7} "
+                  f"{percentile(latencies, 0.5):>7.2f} {percentile(latencies, 0.95):>7.2f} "
+                  f"{result['wall']:>7.1f} {rate_limited:>5}")
+
+
+if __name__ == "__main__":
+    main()
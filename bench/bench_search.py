@@ -0,0 +1,136 @@
+"""Benchmark session search on a synthetic corpus.
+
+"regex scan" is what a case-insensitive $regex over the interview content
+costs: every session's text is matched in turn. "fts5" is
+backend.SessionSearchIndex, the SQLite side index behind
+/api/sessions/search.
+
+    python bench/bench_search.py --sessions 100000 --repeat 20
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+
+TOPICS = [
+    "react", "hooks", "kubernetes", "docker", "postgres", "indexing", "caching", "redis", "kafka",
+    "microservices", "latency", "throughput", "graphql", "typescript", "python", "asyncio", "testing",
+    "deployment", "monitoring", "terraform", "security", "oauth", "sharding", "replication", "pandas"
+]
+FILLER = (
+    "i think the main point is that we had to make sure the team understood how the system "
+    "worked and what the tradeoffs were before we changed anything in production"
+).split()
+QUERIES = [
+    ("kafka", {}),
+    ("react hooks", {}),
+    ("postgres index", {"difficulty": "hard"}),
+    ("latency monitoring", {"start": datetime(2025, 6, 1), "end": datetime(2025, 9, 1)}),
+    ("terraf", {})
+]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    picked = [rng.choice(FILLER) for _ in range(words)]
+    # Most sentences are generic; roughly one in four names a specific technology
+    if rng.random() < 0.25:
+        picked[rng.randrange(words)] = rng.choice(TOPICS)
+    return " ".join(picked)
+
+
+def make_session(rng: random.Random, index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "timestamp": datetime(2025, 1, 1) + timedelta(minutes=5 * index),
+        "difficulty": rng.choice(["easy", "medium", "hard"]),
+        "interview_type": rng.choice(["technical", "behavioral", "system design"]),
+        "questions": [{"question": f"Tell me about a project where you {sentence(rng, 8)}"} for _ in range(5)],
+        "answers": [sentence(rng, 40) for _ in range(5)],
+        "evaluations": [
+            {"summary": sentence(rng, 16), "strengths": [sentence(rng, 6)], "improvements": [sentence(rng, 6)], "score": 7}
+            for _ in range(5)
+        ],
+        "notes": sentence(rng, 10) if rng.random() < 0.2 else ""
+    }
+
+
+def regex_scan(corpus, query: str, filters: dict, limit: int = 20):
+    patterns = [re.compile(re.escape(term), re.IGNORECASE) for term in query.split()]
+    matches = []
+    for session, text in corpus:
+        if filters.get("difficulty") and session["difficulty"] != filters["difficulty"]:
+            continue
+        if filters.get("start") and not filters["start"] <= session["timestamp"] <= filters["end"]:
+            continue
+        if all(pattern.search(text) for pattern in patterns):
+            matches.append(session["_id"])
+    return matches[:limit]
+
+
+def timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return result, statistics.median(timings) * 1000, timings[int(0.95 * (len(timings) - 1))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scan-repeat", type=int, default=3, help="Repetitions for the (slow) regex scan")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    sessions = [make_session(rng, i) for i in range(args.sessions)]
+    print(f"generated {len(sessions):,} sessions in {time.perf_counter() - started:.1f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "search.db")
+        index = backend.SessionSearchIndex(db_path)
+        started = time.perf_counter()
+        for start in range(0, len(sessions), 1000):
+            index.index_sessions(sessions[start:start + 1000])
+        build = time.perf_counter() - started
+        print(f"fts5 index built in {build:.1f}s ({len(sessions) / build:,.0f} sessions/s), "
+              f"{os.path.getsize(db_path) / 1e6:.1f} MB on disk")
+
+        corpus = [(session, " ".join(backend.SessionSearchIndex.session_text(session).values())) for session in sessions]
+
+        print(f"\n{'query':<22} {'filters':<12} {'path':<11} {'p50 ms':>9} {'p95 ms':>9} {'hits':>6}")
+        for query, filters in QUERIES:
+            label = ",".join(filters) or "-"
+            result, p50, p95 = timed(lambda: index.search(query, limit=20, **filters), args.repeat)
+            print(f"{query:<22} {label:<12} {'fts5':<11} {p50:>9.2f} {p95:>9.2f} {len(result['sessions']):>6}")
+            scan, p50, p95 = timed(lambda: regex_scan(corpus, query, filters), args.scan_repeat)
+            print(f"{query:<22} {label:<12} {'regex scan':<11} {p50:>9.2f} {p95:>9.2f} {len(scan):>6}")
+
+        # Deep pagination: the fifth page of a broad query
+        _, p50, p95 = timed(lambda: index.search("caching", limit=20, offset=80), args.repeat)
+        print(f"{'caching (page 5)':<22} {'-':<12} {'fts5':<11} {p50:>9.2f} {p95:>9.2f}")
+
+        # Keeping the index in sync: re-index one session after an answer is added
+        session = sessions[len(sessions) // 2]
+        session["answers"].append(sentence(rng, 40))
+        _, p50, p95 = timed(lambda: index.index_sessions([session]), args.repeat)
+        print(f"{'re-index one session':<22} {'-':<12} {'fts5':<11} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
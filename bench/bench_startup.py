@@ -0,0 +1,111 @@
+"""Benchmark backend startup: module import time and time until the API answers.
+
+Import time is measured with `python -X importtime -c "import backend"` in a
+fresh interpreter (and a scratch working directory, so the SQLite side stores
+start empty); the report lists the slowest top-level imports by cumulative
+time. With --serve, uvicorn is started the same way and polled until
+/healthz answers; --warmup then times POST /api/warmup (Whisper and ReportLab
+loading in the worker processes) and shows /readyz before and after.
+
+    python bench/bench_startup.py --repeat 5 --top 15
+    python bench/bench_startup.py --serve --warmup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def import_times(cwd: str):
+    """Wall seconds for one `import backend`, and {top-level module: cumulative seconds}"""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import backend"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    wall = time.perf_counter() - started
+
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # Depth 0 is backend itself; depth 1 is what backend imports directly
+        if depth <= 1:
+            modules[name.strip()] = int(cumulative) / 1e6
+    return wall, modules
+
+
+def serve(cwd: str, port: int, warmup: bool):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend:app", "--port", str(port), "--app-dir", ROOT],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                httpx.get(f"{base}/healthz", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited before answering /healthz")
+                time.sleep(0.05)
+        print(f"\nprocess start -> /healthz: {time.perf_counter() - started:.2f}s")
+        print(f"/readyz: {httpx.get(f'{base}/readyz').json()}")
+        if warmup:
+            started = time.perf_counter()
+            result = httpx.post(f"{base}/api/warmup", timeout=600).json()
+            print(f"POST /api/warmup: {time.perf_counter() - started:.2f}s {result}")
+            print(f"/readyz: {httpx.get(f'{base}/readyz').json()}")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn until /healthz answers")
+    parser.add_argument("--warmup", action="store_true", help="With --serve, time POST /api/warmup")
+    parser.add_argument("--port", type=int, default=8097)
+    args = parser.parse_args()
+
+    walls = []
+    samples = {}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cwd:
+            wall, modules = import_times(cwd)
+        walls.append(wall)
+        for name, seconds in modules.items():
+            samples.setdefault(name, []).append(seconds)
+
+    print(f"import backend: median {statistics.median(walls):.2f}s wall "
+          f"(min {min(walls):.2f}s, max {max(walls):.2f}s over {len(walls)} runs, including interpreter start)")
+    print(f"\n{'module':<40} {'median cumulative s':>20}")
+    ranked = sorted(samples.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, seconds in ranked[:args.top]:
+        print(f"{name:<40} {statistics.median(seconds):>20.3f}")
+
+    if args.serve:
+        with tempfile.TemporaryDirectory() as cwd:
+            serve(cwd, args.port, args.warmup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Benchmark transcription engines and model sizes for speed and accuracy.
+
+Every combination of --backends and --models is loaded in-process through
+backend.create_transcription_engine and run over the clips listed in
+bench/clips/manifest.json (an audio file plus its reference transcript). For
+each it reports load time, real-time factor (inference seconds per second of
+audio, lower is cheaper) and word error rate against the references, and
+marks the cheapest combination whose WER is within --max-wer.
+
+The bundled clips are synthetic: --synthesize renders any missing ones from
+their reference text with a command-line TTS (espeak-ng by default), with
+leading/trailing silence, optional pauses between sentences and a little
+background noise. Recorded answers can be added to the manifest alongside
+them; any format ffmpeg decodes works.
+
+    python bench/bench_transcription.py --synthesize
+    python bench/bench_transcription.py --backends openai-whisper faster-whisper --models tiny base small --threads 4
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+
+CLIPS_DIR = os.path.join(os.path.dirname(__file__), "clips")
+SAMPLE_RATE = backend.WHISPER_SAMPLE_RATE
+
+
+def normalize(text: str) -> list:
+    """Lowercase words without punctuation, so WER only counts recognition errors"""
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_errors(reference: list, hypothesis: list) -> int:
+    """Word-level edit distance (substitutions + deletions + insertions)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def speak(tts: str, text: str, directory: str) -> np.ndarray:
+    """Render text with the TTS command and decode it to 16kHz mono samples"""
+    path = os.path.join(directory, "speech.wav")
+    subprocess.run([tts, "-w", path, text], check=True, capture_output=True)
+    with open(path, "rb") as speech_file:
+        return backend.decode_audio(speech_file.read())
+
+
+def synthesize(clip: dict, tts: str, rng: np.random.Generator):
+    """Write a synthetic interview answer for the clip's reference text"""
+    with tempfile.TemporaryDirectory() as directory:
+        if clip.get("pauses"):
+            sentences = [sentence for sentence in re.split(r"(?<=[.?!])\s+", clip["text"]) if sentence]
+        else:
+            sentences = [clip["text"]]
+        parts = [np.zeros(SAMPLE_RATE, dtype=np.float32)]
+        for sentence in sentences:
+            parts.append(speak(tts, sentence, directory))
+            # A thinking gap between sentences, a short breath otherwise
+            parts.append(np.zeros(int(SAMPLE_RATE * (2.5 if clip.get("pauses") else 1.0)), dtype=np.float32))
+    samples = np.concatenate(parts)
+    samples = samples + rng.normal(0, 0.003, samples.size).astype(np.float32)
+    pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+    with wave.open(os.path.join(CLIPS_DIR, clip["file"]), "wb") as clip_file:
+        clip_file.setnchannels(1)
+        clip_file.setsampwidth(2)
+        clip_file.setframerate(SAMPLE_RATE)
+        clip_file.writeframes(pcm.tobytes())
+
+
+def load_clips(manifest: list) -> list:
+    clips = []
+    for clip in manifest:
+        path = os.path.join(CLIPS_DIR, clip["file"])
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as clip_file:
+            samples = backend.decode_audio(clip_file.read())
+        clips.append({**clip, "samples": samples, "seconds": len(samples) / SAMPLE_RATE})
+    return clips
+
+
+def run(backend_name: str, model_name: str, threads: int, clips: list, options: dict) -> dict:
+    started = time.perf_counter()
+    engine = backend.create_transcription_engine(backend_name, model_name, threads)
+    load_seconds = time.perf_counter() - started
+
+    # One untimed pass so lazy initialisation is not billed to the first clip
+    engine.transcribe(clips[0]["samples"], options)
+
+    inference = 0.0
+    errors = 0
+    words = 0
+    for clip in clips:
+        started = time.perf_counter()
+        text = engine.transcribe(clip["samples"], options)
+        inference += time.perf_counter() - started
+        reference = normalize(clip["text"])
+        errors += word_errors(reference, normalize(text))
+        words += len(reference)
+    audio_seconds = sum(clip["seconds"] for clip in clips)
+    return {
+        "backend": backend_name,
+        "model": model_name,
+        "load": load_seconds,
+        "rtf": inference / audio_seconds,
+        "wer": errors / words if words else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["openai-whisper", "faster-whisper"])
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"])
+    parser.add_argument("--threads", type=int, default=backend.WHISPER_THREADS, help="CPU threads per engine (0 = library default)")
+    parser.add_argument("--max-wer", type=float, default=0.10, help="Accuracy target for the recommendation")
+    parser.add_argument("--synthesize", action="store_true", help="Render missing clips with --tts first")
+    parser.add_argument("--tts", default="espeak-ng", help="TTS command taking -w OUTPUT.wav TEXT")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with open(os.path.join(CLIPS_DIR, "manifest.json")) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if args.synthesize:
+        rng = np.random.default_rng(0)
+        for clip in manifest:
+            if not os.path.exists(os.path.join(CLIPS_DIR, clip["file"])):
+                print(f"Synthesizing {clip['file']}")
+                synthesize(clip, args.tts, rng)
+
+    clips = load_clips(manifest)
+    if not clips:
+        sys.exit(f"No clips found in {CLIPS_DIR}; run with --synthesize or add recordings to manifest.json")
+    audio_seconds = sum(clip["seconds"] for clip in clips)
+    print(f"{len(clips)} clips, {audio_seconds:.1f}s of audio, {args.threads or 'default'} threads\n")
+
+    results = []
+    print(f"{'backend':<16} {'model':<8} {'load s':>7} {'RTF':>7} {'WER':>7}")
+    for backend_name in args.backends:
+        for model_name in args.models:
+            try:
+                result = run(backend_name, model_name, args.threads, clips, backend.WHISPER_OPTIONS)
+            except ImportError as e:
+                print(f"{backend_name:<16} {model_name:<8} skipped: {e}")
+                continue
+            results.append(result)
+            print(f"{backend_name:<16} {model_name:<8} {result['load']:>7.2f} {result['rtf']:>7.3f} {result['wer']:>7.1%}")
+
+    eligible = [result for result in results if result["wer"] <= args.max_wer]
+    if eligible:
+        best = min(eligible, key=lambda result: result["rtf"])
+        print(f"\nCheapest within {args.max_wer:.0%} WER: TRANSCRIPTION_BACKEND={best['backend']} WHISPER_MODEL={best['model']}")
+    elif results:
+        print(f"\nNo combination reached {args.max_wer:.0%} WER")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"clips": len(clips), "audio_seconds": audio_seconds, "threads": args.threads, "results": results},
+                      output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Load-test /api/transcribe with and without micro-batching.
+
+For every --batch-sizes value a fresh uvicorn is started with
+TRANSCRIPTION_BATCH_SIZE set to it (1 = no batching), warmed up through
+POST /api/warmup, and then driven by 1, 8 and 32 (--clients) concurrent
+clients that each upload --requests recordings back to back. Every upload is
+a distinct opus/webm clip, so the transcription cache never answers. Clips are
+made from the recordings in bench/clips when there are any (see
+bench_transcription.py --synthesize), otherwise from tone and noise.
+
+Reports transcriptions/sec, p50/p95 latency, 503 rejections and the average
+batch size the server formed (from /api/inference/stats).
+
+    STORAGE_BACKEND=sqlite python bench/bench_transcription_load.py --batch-sizes 1 8 --wait-ms 250
+"""
+import argparse
+import asyncio
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CLIPS_DIR = os.path.join(os.path.dirname(__file__), "clips")
+
+
+def make_clips(count: int, seconds: int) -> list:
+    """Distinct opus/webm uploads: bundled recordings with per-clip noise, or tone and noise"""
+    recordings = sorted(glob.glob(os.path.join(CLIPS_DIR, "*.wav")))
+    clips = []
+    for index in range(count):
+        if recordings:
+            source = ["-i", recordings[index % len(recordings)]]
+        else:
+            source = ["-f", "lavfi", "-i", f"sine=frequency={200 + index % 300}:duration={seconds}"]
+        process = subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error", *source,
+                "-f", "lavfi", "-i", f"anoisesrc=amplitude=0.01:seed={index}:duration={seconds}",
+                "-filter_complex", "amix=inputs=2:duration=first", "-ar", "48000", "-ac", "1",
+                "-c:a", "libopus", "-f", "webm", "pipe:1"
+            ],
+            capture_output=True,
+            check=True
+        )
+        clips.append(process.stdout)
+    return clips
+
+
+def start_server(cwd: str, port: int, batch_size: int, wait_ms: int, queue_size: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "TRANSCRIPTION_BATCH_SIZE": str(batch_size),
+        "TRANSCRIPTION_BATCH_WAIT_MS": str(wait_ms),
+        "INFERENCE_QUEUE_SIZE": str(queue_size)
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend:app", "--port", str(port), "--app-dir", ROOT],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    while True:
+        try:
+            httpx.get(f"{base}/healthz", timeout=1).raise_for_status()
+            break
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn exited before answering /healthz")
+            time.sleep(0.1)
+    httpx.post(f"{base}/api/warmup", timeout=600).raise_for_status()
+    return process
+
+
+async def drive(base: str, clients: int, requests: int, clips: list) -> dict:
+    latencies = []
+    rejected = 0
+    failed = 0
+    clip_iter = iter(clips)
+
+    async def client(http: httpx.AsyncClient):
+        nonlocal rejected, failed
+        for _ in range(requests):
+            clip = next(clip_iter)
+            started = time.perf_counter()
+            response = await http.post(
+                f"{base}/api/transcribe",
+                files={"audio": ("answer.webm", clip, "audio/webm")},
+                data={"question": "Tell me about yourself", "session_id": "bench"}
+            )
+            if response.status_code == 503:
+                rejected += 1
+            elif response.status_code != 200:
+                failed += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(timeout=600) as http:
+        before = (await http.get(f"{base}/api/inference/stats")).json()["batching"]
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        wall = time.perf_counter() - started
+        after = (await http.get(f"{base}/api/inference/stats")).json()["batching"]
+
+    latencies.sort()
+    batches = after["batches"] - before["batches"]
+    return {
+        "throughput": len(latencies) / wall,
+        "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0,
+        "rejected": rejected,
+        "failed": failed,
+        "avg_batch": (after["recordings"] - before["recordings"]) / batches if batches else 1.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--wait-ms", type=int, default=250, help="TRANSCRIPTION_BATCH_WAIT_MS for batched runs")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=4, help="Uploads per client at each concurrency level")
+    parser.add_argument("--seconds", type=int, default=8, help="Length of generated clips when none are bundled")
+    parser.add_argument("--queue-size", type=int, default=64, help="INFERENCE_QUEUE_SIZE, so clients are not rejected")
+    parser.add_argument("--port", type=int, default=8098)
+    args = parser.parse_args()
+
+    clips = make_clips(sum(args.clients) * args.requests, args.seconds)
+    print(f"{'batch':>5} {'clients':>7} {'transcr/s':>10} {'p50 s':>7} {'p95 s':>7} {'503s':>5} {'errors':>6} {'avg batch':>9}")
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory() as cwd:
+            process = start_server(cwd, args.port, batch_size, args.wait_ms, args.queue_size)
+            try:
+                offset = 0
+                for clients in args.clients:
+                    count = clients * args.requests
+                    result = asyncio.run(drive(f"http://127.0.0.1:{args.port}", clients, args.requests,
+                                               clips[offset:offset + count]))
+                    offset += count
+                    print(f"{batch_size:>5} {clients:>7} {result['throughput']:>10.2f} {result['p50']:>7.2f} "
+                          f"{result['p95']:>7.2f} {result['rejected']:>5} {result['failed']:>6} {result['avg_batch']:>9.1f}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
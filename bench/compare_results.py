@@ -0,0 +1,65 @@
+"""Compare two bench/load_suite.py result files.
+
+Prints baseline vs. candidate for throughput, peak RSS and p50/p95/p99 of
+every endpoint, with the relative change. Exits non-zero when throughput
+drops, or an endpoint's p95 or the peak RSS grows, by more than --threshold.
+
+    python bench/compare_results.py results/base.json results/new.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+
+
+def change(base: float, new: float) -> float:
+    return (new - base) / base if base else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file:
+        base = json.load(baseline_file)
+    with open(args.candidate) as candidate_file:
+        new = json.load(candidate_file)
+
+    regressions = []
+    print(f"baseline {base['commit']} ({base['timestamp']})  vs  candidate {new['commit']} ({new['timestamp']})\n")
+    print(f"{'':<40} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for key, label, higher_is_better in (
+        ("scenarios_per_second", "scenarios/s", True),
+        ("requests_per_second", "requests/s", True),
+        ("peak_rss_mb", "peak RSS MB", False)
+    ):
+        delta = change(base[key], new[key])
+        print(f"{label:<40} {base[key]:>10.3f} {new[key]:>10.3f} {delta:>+8.1%}")
+        if (-delta if higher_is_better else delta) > args.threshold:
+            regressions.append(label)
+
+    print(f"\n{'endpoint':<40} {'p50':>17} {'p95':>17} {'p99':>17}")
+    for name, new_stats in new["endpoints"].items():
+        base_stats = base["endpoints"].get(name)
+        if base_stats is None:
+            print(f"{name:<40} (new endpoint)")
+            continue
+        cells = []
+        for quantile in ("p50", "p95", "p99"):
+            delta = change(base_stats[quantile], new_stats[quantile])
+            cells.append(f"{new_stats[quantile]:>8.3f} {delta:>+7.1%}")
+            if quantile == "p95" and delta > args.threshold:
+                regressions.append(f"{name} p95")
+        errors = f"  errors {base_stats['errors']} -> {new_stats['errors']}" if new_stats["errors"] or base_stats["errors"] else ""
+        print(f"{name:<40} {'  '.join(cells)}{errors}")
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Local stand-in for the OpenRouter /chat/completions endpoint.
+
+Run it and point the backend at it:
+
+    python bench/fake_openrouter.py --port 8081 --latency 0.2
+    OPENROUTER_URL=http://127.0.0.1:8081/api/v1/chat/completions uvicorn backend:app
+
+Question-generation prompts get a numbered list back, batched evaluation prompts
+a JSON array with one canned evaluation per response, follow-ups for missing
+evaluation fields just those fields, everything else a single canned
+evaluation JSON object, in the same response shape OpenRouter returns.
+Requests with "stream": true are answered as server-sent event chunks.
+With --rate-limit, requests beyond that many per --rate-window seconds are
+answered with 429 and a Retry-After header, like OpenRouter's free tier.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import deque
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SAMPLE_EVALUATION = {
+    "summary": "Clear answer that covers the main points but could use a concrete example.",
+    "score": 7,
+    "evaluation": {
+        "clarity": {"score": 8, "feedback": "Easy to follow."},
+        "technical_relevance": {"score": 7, "feedback": "Addresses the core concepts."},
+        "structure": {"score": 7, "feedback": "Mostly logical order."},
+        "communication": {"score": 7, "feedback": "Confident and concise."},
+        "correctness": {"score": 8, "feedback": "No factual errors spotted."}
+    },
+    "strengths": ["Clear explanation", "Relevant experience"],
+    "improvements": ["Add a concrete example", "Quantify the impact"],
+    "revised_answer": "In my last project I ...",
+    "tips": ["Use the STAR format", "Lead with the result"]
+}
+
+
+def build_app(latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+              token_delay: float = 0.01, malformed_rate: float = 0.0, generation_delay: float = 0.0,
+              truncate_rate: float = 0.0, rate_limit: int = 0, rate_window: float = 60.0) -> FastAPI:
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.rate_limited = 0
+    app.state.prompt_tokens = 0
+    app.state.completion_tokens = 0
+    accepted_at = deque()  # Arrival times of requests inside the current rate window
+
+    def completion(content: str, prompt: str) -> dict:
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        app.state.prompt_tokens += prompt_tokens
+        app.state.completion_tokens += completion_tokens
+        return {
+            "id": f"gen-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "fake/openrouter",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def stream_completion(content: str, chunk_size: int = 16):
+        generation_id = f"gen-{uuid.uuid4().hex}"
+        yield ": OPENROUTER PROCESSING\n\n"
+        for start in range(0, len(content), chunk_size):
+            chunk = {
+                "id": generation_id,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": content[start:start + chunk_size]}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(token_delay)
+        yield "data: [DONE]\n\n"
+
+    def answer_for(prompt: str) -> str:
+        match = re.search(r"Generate (\d+) ", prompt)
+        if match:
+            count = int(match.group(1))
+            return "\n".join(f"{i}. Sample interview question number {i}?" for i in range(1, count + 1))
+        match = re.search(r"JSON array with exactly (\d+) objects", prompt)
+        if match:
+            evaluations = []
+            for index in range(1, int(match.group(1)) + 1):
+                evaluation = {"index": index, **SAMPLE_EVALUATION}
+                if malformed_rate and random.random() < malformed_rate:
+                    del evaluation["score"]
+                evaluations.append(evaluation)
+            return json.dumps(evaluations, indent=2)
+        match = re.search(r"exactly these keys: ([\w, ]+)\.", prompt)
+        if match:
+            keys = [key.strip() for key in match.group(1).split(",")]
+            return json.dumps({key: SAMPLE_EVALUATION[key] for key in keys if key in SAMPLE_EVALUATION}, indent=2)
+        content = json.dumps(SAMPLE_EVALUATION, indent=2)
+        if truncate_rate and random.random() < truncate_rate:
+            # Cut off like a completion that hit max_tokens
+            content = content[:int(len(content) * 0.85)]
+        return content
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests += 1
+        if rate_limit:
+            now = time.monotonic()
+            while accepted_at and accepted_at[0] <= now - rate_window:
+                accepted_at.popleft()
+            if len(accepted_at) >= rate_limit:
+                app.state.rate_limited += 1
+                retry_after = max(1, int(accepted_at[0] + rate_window - now + 0.999))
+                return JSONResponse(
+                    {"error": {"message": "Rate limit exceeded", "code": 429}},
+                    status_code=429,
+                    headers={"Retry-After": str(retry_after)}
+                )
+            accepted_at.append(now)
+        payload = await request.json()
+        await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        if error_rate and random.random() < error_rate:
+            return JSONResponse({"error": {"message": "Upstream error", "code": 502}}, status_code=502)
+
+        prompt = payload["messages"][-1]["content"]
+        content = answer_for(prompt)
+        if payload.get("stream"):
+            return StreamingResponse(stream_completion(content), media_type="text/event-stream")
+        # Non-streamed responses arrive once the whole completion has been "generated"
+        await asyncio.sleep(generation_delay * (len(content) // 4))
+        return completion(content, prompt)
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "requests": app.state.requests,
+            "rate_limited": app.state.rate_limited,
+            "prompt_tokens": app.state.prompt_tokens,
+            "completion_tokens": app.state.completion_tokens
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenRouter chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 502")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed chunks")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Fraction of batched evaluations returned without a score")
+    parser.add_argument("--generation-delay", type=float, default=0.0,
+                        help="Seconds per completion token before a non-streamed response is sent")
+    parser.add_argument("--truncate-rate", type=float, default=0.0,
+                        help="Fraction of single evaluations cut off before the end")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests allowed per --rate-window (0 = unlimited)")
+    parser.add_argument("--rate-window", type=float, default=60.0, help="Length of the rate limit window in seconds")
+    args = parser.parse_args()
+
+    app = build_app(args.latency, args.jitter, args.error_rate, args.token_delay, args.malformed_rate,
+                    args.generation_delay, args.truncate_rate, args.rate_limit, args.rate_window)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""End-to-end load test of the interview flow against local stand-ins.
+
+Starts bench/fake_openrouter.py and the backend (bench/serve_app.py) in a
+scratch directory. Sessions go to mongomock by default; --storage sqlite uses
+the embedded store, and --storage mongo uses MONGODB_URI, e.g. a local mongod.
+After warming the workers up, --users virtual candidates each run
+--iterations of the full scenario:
+
+    upload resume -> wait for questions -> transcribe x --answers
+    -> evaluate -> session stats -> PDF export
+
+Every resume and recording is distinct, so no cache answers for the real work.
+Whisper runs for real (WHISPER_MODEL, default tiny here). The suite reports:
+- scenarios/sec and requests/sec
+- count, errors, p50/p95/p99 per endpoint
+- the server's per-stage means from /metrics
+- peak RSS of the server process tree
+
+The same numbers are written as JSON, which bench/compare_results.py diffs
+across commits.
+
+    python bench/load_suite.py --users 4 --iterations 3 --output results/$(git rev-parse --short HEAD).json
+    python bench/compare_results.py results/base.json results/new.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+from bench_transcription_load import make_clips
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RESUME = (
+    "Backend engineer with {years} years of experience building Python web services, REST APIs and data "
+    "pipelines. Worked with FastAPI, PostgreSQL, MongoDB, Redis and Kubernetes; led the migration of a "
+    "reporting system to an event-driven design. Candidate reference {ref}."
+)
+
+
+def make_resume(ref: str) -> bytes:
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    content = [Paragraph("Resume", styles["Heading1"])]
+    content += [Paragraph(RESUME.format(years=3 + index, ref=ref), styles["Normal"]) for index in range(6)]
+    SimpleDocTemplate(buffer, pagesize=letter).build(content)
+    return buffer.getvalue()
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def tree_rss(pid: int) -> int:
+    """Resident bytes of a process and all its descendants (Linux /proc)"""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total
+
+
+class RSSSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, tree_rss(self.pid))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def wait_for(url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                raise RuntimeError(f"{process.args[1]} exited before answering {url}")
+            time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def stage_means(metrics_text: str) -> dict:
+    """Mean seconds and count per stage from the server's stage_duration_seconds histogram"""
+    sums = {}
+    counts = {}
+    for match in re.finditer(r'stage_duration_seconds_(sum|count)\{stage="(\w+)"\} ([\d.e+-]+)', metrics_text):
+        kind, stage, value = match.groups()
+        (sums if kind == "sum" else counts)[stage] = float(value)
+    return {
+        stage: {"count": int(counts[stage]), "mean": sums[stage] / counts[stage]}
+        for stage in sorted(counts) if counts[stage]
+    }
+
+
+class Scenario:
+    def __init__(self, http: httpx.AsyncClient, args, clips: list):
+        self.http = http
+        self.args = args
+        self.clips = iter(clips)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.completed = 0
+
+    async def call(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.http.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            raise RuntimeError(f"{name}: {response.status_code} {response.text[:200]}")
+        self.latencies[name].append(time.perf_counter() - started)
+        return response
+
+    async def run_once(self, ref: str):
+        started = time.perf_counter()
+        upload = await self.call(
+            "POST /api/upload", "POST", "/api/upload",
+            files={"file": (f"resume-{ref}.pdf", make_resume(ref), "application/pdf")},
+            data={"num_questions": str(self.args.answers), "difficulty": "medium", "interview_type": "technical"}
+        )
+        job_id = upload.json()["job_id"]
+        while True:
+            status = (await self.call("GET /api/jobs/{job_id}", "GET", f"/api/jobs/{job_id}")).json()
+            if status["status"] in ("completed", "failed"):
+                break
+            await asyncio.sleep(0.05)
+        self.latencies["upload job (until questions)"].append(time.perf_counter() - started)
+        result = (await self.call("GET /api/jobs/{job_id}/result", "GET", f"/api/jobs/{job_id}/result")).json()
+        session_id = result["session_id"]
+
+        answers = []
+        for question in result["questions"][:self.args.answers]:
+            question_text = question["question"] if isinstance(question, dict) else question
+            transcription = (await self.call(
+                "POST /api/transcribe", "POST", "/api/transcribe",
+                files={"audio": ("answer.webm", next(self.clips), "audio/webm")},
+                data={"question": question_text, "session_id": session_id, "is_final": "true"}
+            )).json()["transcription"]
+            answers.append({"question": question_text, "answer": transcription})
+
+        await self.call("POST /api/evaluate", "POST", "/api/evaluate", json={"session_id": session_id, "answers": answers})
+        await self.call("GET /api/sessions/stats", "GET", "/api/sessions/stats")
+        await self.call("GET /api/sessions/{session_id}/export", "GET", f"/api/sessions/{session_id}/export")
+        self.latencies["scenario"].append(time.perf_counter() - started)
+        self.completed += 1
+
+    async def user(self, user: int):
+        for iteration in range(self.args.iterations):
+            try:
+                await self.run_once(f"{user}-{iteration}-{time.time_ns()}")
+            except Exception as e:
+                print(f"user {user} iteration {iteration} failed: {e}", file=sys.stderr)
+
+
+async def drive(base: str, args, clips: list) -> dict:
+    async with httpx.AsyncClient(base_url=base, timeout=args.timeout) as http:
+        scenario = Scenario(http, args, clips)
+        started = time.perf_counter()
+        await asyncio.gather(*(scenario.user(user) for user in range(args.users)))
+        wall = time.perf_counter() - started
+        metrics_text = (await http.get("/metrics")).text
+
+    endpoints = {}
+    for name in sorted(set(scenario.latencies) | set(scenario.errors)):
+        values = sorted(scenario.latencies[name])
+        endpoints[name] = {
+            "count": len(values),
+            "errors": scenario.errors[name],
+            "mean": sum(values) / len(values) if values else 0.0,
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99)
+        }
+    requests = sum(len(values) for name, values in scenario.latencies.items() if " /" in name)
+    return {
+        "wall_seconds": wall,
+        "scenarios": scenario.completed,
+        "scenarios_per_second": scenario.completed / wall,
+        "requests_per_second": requests / wall,
+        "endpoints": endpoints,
+        "stages": stage_means(metrics_text)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=4, help="Concurrent virtual candidates")
+    parser.add_argument("--iterations", type=int, default=2, help="Scenarios per user")
+    parser.add_argument("--answers", type=int, default=3, help="Questions answered (transcribed) per scenario")
+    parser.add_argument("--storage", choices=["mongomock", "sqlite", "mongo"], default="mongomock")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Fake OpenRouter latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--whisper-model", default=os.getenv("WHISPER_MODEL", "tiny"))
+    parser.add_argument("--clip-seconds", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--llm-port", type=int, default=8091)
+    parser.add_argument("--output", default="bench-results.json")
+    args = parser.parse_args()
+
+    clips = make_clips(args.users * args.iterations * args.answers, args.clip_seconds)
+    env = {
+        **os.environ,
+        "OPENROUTER_URL": f"http://127.0.0.1:{args.llm_port}/api/v1/chat/completions",
+        "OPENROUTER_API_KEY": os.getenv("OPENROUTER_API_KEY", "bench"),
+        "WHISPER_MODEL": args.whisper_model
+    }
+    if args.storage == "sqlite":
+        env["STORAGE_BACKEND"] = "sqlite"
+    elif args.storage == "mongo":
+        env["STORAGE_BACKEND"] = "mongo"
+
+    with tempfile.TemporaryDirectory() as cwd:
+        llm = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "fake_openrouter.py"), "--port", str(args.llm_port),
+             "--latency", str(args.llm_latency), "--jitter", str(args.llm_jitter)],
+            cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "serve_app.py"), "--port", str(args.port)]
+            + (["--mongomock"] if args.storage == "mongomock" else []),
+            cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        sampler = RSSSampler(server.pid)
+        try:
+            base = f"http://127.0.0.1:{args.port}"
+            wait_for(f"http://127.0.0.1:{args.llm_port}/stats", llm)
+            wait_for(f"{base}/healthz", server)
+            httpx.post(f"{base}/api/warmup", timeout=600).raise_for_status()
+            sampler.start()
+            result = asyncio.run(drive(base, args, clips))
+            sampler.stop()
+        finally:
+            server.terminate()
+            llm.terminate()
+            server.wait()
+            llm.wait()
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "port", "llm_port")},
+        **result,
+        "peak_rss_mb": sampler.peak / (1024 * 1024)
+    }
+
+    print(f"commit {result['commit']}, {args.users} users x {args.iterations} iterations, storage {args.storage}")
+    print(f"{result['scenarios']} scenarios in {result['wall_seconds']:.1f}s: "
+          f"{result['scenarios_per_second']:.3f} scenarios/s, {result['requests_per_second']:.2f} requests/s, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB\n")
+    print(f"{'endpoint':<40} {'count':>6} {'errors':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}")
+    for name, stats in result["endpoints"].items():
+        print(f"{name:<40} {stats['count']:>6} {stats['errors']:>6} {stats['p50']:>8.3f} {stats['p95']:>8.3f} {stats['p99']:>8.3f}")
+    print(f"\n{'stage':<40} {'count':>6} {'mean s':>8}")
+    for stage, stats in result["stages"].items():
+        print(f"{stage:<40} {stats['count']:>6} {stats['mean']:>8.4f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
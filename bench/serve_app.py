@@ -0,0 +1,39 @@
+"""Run the backend under uvicorn for benchmarks, optionally on an in-memory MongoDB.
+
+With --mongomock, pymongo.MongoClient is replaced by mongomock's before the
+backend is imported, so the Mongo-backed session store runs without a mongod
+(state lives in this process and is gone when it exits). Otherwise the
+backend uses whatever STORAGE_BACKEND / MONGODB_URI say.
+
+    python bench/serve_app.py --port 8090 --mongomock
+"""
+import argparse
+import os
+import sys
+
+import uvicorn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--mongomock", action="store_true", help="Serve sessions from an in-memory mongomock database")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        import pymongo
+
+        pymongo.MongoClient = mongomock.MongoClient
+        os.environ["STORAGE_BACKEND"] = "mongo"
+
+    import backend  # noqa: E402
+
+    uvicorn.run(backend.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
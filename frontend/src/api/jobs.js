@@ -0,0 +1,31 @@
+import axios from 'axios';
+
+const API_BASE_URL = 'http://localhost:8000/api';
+const JOB_POLL_INTERVAL = 1000; // 1 second
+
+// Poll a background job until it finishes and return its result
+export const waitForJob = async (jobId, onProgress) => {
+  while (true) {
+    const { data: job } = await axios.get(`${API_BASE_URL}/jobs/${jobId}`);
+    if (onProgress) {
+      onProgress(job);
+    }
+
+    if (job.status === 'completed') {
+      const { data: result } = await axios.get(`${API_BASE_URL}/jobs/${jobId}/result`);
+      return result;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Failed to generate questions');
+    }
+
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+  }
+};
+
+export const JOB_STAGE_LABELS = {
+  queued: 'Waiting in queue...',
+  extracting: 'Reading your resume...',
+  generating: 'Generating questions...',
+  persisted: 'Preparing your interview...'
+};
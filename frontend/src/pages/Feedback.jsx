@@ -11,11 +11,67 @@ import FeedbackAnalysis from '../components/FeedbackAnalysis';
 import ResourceCard from '../components/ResourceCard';
 import ScoreCircle from '../components/ScoreCircle';
 
+const API_BASE_URL = 'http://localhost:8000/api';
+
 // Create axios instance with base URL
 const api = axios.create({
-  baseURL: 'http://localhost:8000/api'
+  baseURL: API_BASE_URL
 });
 
+// Build the summary shown on the page from per-question evaluations
+const formatFeedback = (results) => {
+  // Skip questions that are still pending or failed to evaluate
+  const evaluations = results.filter(evaluation => evaluation && !evaluation.status);
+  const scores = evaluations.map(evaluation => evaluation.score);
+  const averageScore = scores.reduce((a, b) => a + b, 0) / (scores.length || 1);
+
+  return {
+    score: Math.round(averageScore * 10), // Convert to percentage
+    feedback: {
+      overall: evaluations[0]?.summary || '',
+      strengths: [...new Set(evaluations.flatMap(evaluation => evaluation.strengths || []))],
+      improvements: [...new Set(evaluations.flatMap(evaluation => evaluation.improvements || []))]
+    }
+  };
+};
+
+// Read server-sent events from the streaming evaluation endpoint
+const streamEvaluation = async (sessionId, answers, handlers) => {
+  const response = await fetch(`${API_BASE_URL}/evaluate/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ session_id: sessionId, answers })
+  });
+  if (!response.ok) {
+    throw new Error(`Evaluation failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let separator;
+    while ((separator = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, separator);
+      buffer = buffer.slice(separator + 2);
+
+      let event = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      if (data && handlers[event]) {
+        handlers[event](JSON.parse(data));
+      }
+    }
+  }
+};
+
 function Feedback() {
   const [feedback, setFeedback] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -26,31 +82,50 @@ function Feedback() {
   const [submitted, setSubmitted] = useState(false);
   const [resources, setResources] = useState([]);
   const [showShareModal, setShowShareModal] = useState(false);
+  const [liveSummary, setLiveSummary] = useState('');
+  const [progress, setProgress] = useState(null);
   const feedbackRef = useRef(null);
   const navigate = useNavigate();
   const location = useLocation();
 
   useEffect(() => {
     if (location.state?.feedback) {
-      setFeedback(location.state.feedback);
+      setFeedback(formatFeedback(location.state.feedback));
       setLoading(false);
-      
-      // Calculate overall score from evaluations
-      const evaluations = location.state.feedback;
-      const scores = evaluations.map(evaluation => evaluation.score);
-      const averageScore = scores.reduce((a, b) => a + b, 0) / scores.length;
-      
-      // Format feedback data
-      const formattedFeedback = {
-        score: Math.round(averageScore * 10), // Convert to percentage
-        feedback: {
-          overall: evaluations[0].summary,
-          strengths: [...new Set(evaluations.flatMap(evaluation => evaluation.strengths))],
-          improvements: [...new Set(evaluations.flatMap(evaluation => evaluation.improvements))]
+    } else if (location.state?.answers) {
+      // Render each question's feedback as soon as the server has evaluated it
+      const results = [];
+      const summaries = {};
+      let firstIndex = null;
+      setFeedback(formatFeedback(results));
+
+      streamEvaluation(location.state.sessionId, location.state.answers, {
+        start: ({ total }) => {
+          setProgress({ completed: 0, total });
+          setLoading(false);
+        },
+        summary_delta: ({ index, delta }) => {
+          summaries[index] = (summaries[index] || '') + delta;
+          if (firstIndex === null) firstIndex = index;
+          setLiveSummary(summaries[firstIndex]);
+        },
+        evaluation: ({ index, evaluation }) => {
+          results[index] = evaluation;
+          setFeedback(formatFeedback(results));
+          setProgress(prev => prev && { ...prev, completed: prev.completed + 1 });
+        },
+        error: ({ index, error: detail }) => {
+          results[index] = { status: 'error', error: detail };
+          setProgress(prev => prev && { ...prev, completed: prev.completed + 1 });
+        },
+        done: () => {
+          setProgress(prev => prev && { ...prev, done: true });
         }
-      };
-      
-      setFeedback(formattedFeedback);
+      }).catch(err => {
+        console.error('Evaluation stream error:', err);
+        setError('Failed to evaluate interview. Please try again.');
+        setLoading(false);
+      });
     } else {
       setError('No feedback data available');
       setLoading(false);
@@ -148,6 +223,12 @@ function Feedback() {
           Interview Feedback
         </h1>
 
+        {progress && !progress.done && (
+          <p className="text-center text-gray-600 mb-8">
+            Evaluated {progress.completed} of {progress.total} answers...
+          </p>
+        )}
+
         <div className="grid grid-cols-1 md:grid-cols-2 gap-8 mb-8">
           <motion.div 
             className="flex flex-col items-center justify-center"
@@ -167,7 +248,7 @@ function Feedback() {
           >
             <FeedbackCard
               title="Overall Assessment"
-              items={[feedback.feedback.overall]}
+              items={[feedback.feedback.overall || liveSummary]}
               type="default"
             />
           </motion.div>
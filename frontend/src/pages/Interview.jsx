@@ -3,18 +3,24 @@ import { useNavigate, useLocation } from 'react-router-dom';
 import axios from 'axios';
 import RecordingControls from '../components/RecordingControls';
 import TranscriptionDisplay from '../components/TranscriptionDisplay';
+import { waitForJob } from '../api/jobs';
 
 // Create axios instance with base URL
 const api = axios.create({
   baseURL: 'http://localhost:8000/api'
 });
 
+const LIVE_TRANSCRIBE_URL = 'ws://localhost:8000/api/transcribe/live';
+// MediaRecorder hands over a chunk this often (ms) so partial transcripts keep up with speech
+const RECORDING_TIMESLICE = 1000;
+
 function Interview() {
   const [currentQuestion, setCurrentQuestion] = useState({ question: '' });
   const [questions, setQuestions] = useState([]);
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
   const [isRecording, setIsRecording] = useState(false);
   const [transcription, setTranscription] = useState('');
+  const [liveTranscript, setLiveTranscript] = useState('');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [answers, setAnswers] = useState([]);
@@ -28,6 +34,7 @@ function Interview() {
 
   const mediaRecorderRef = useRef(null);
   const chunksRef = useRef([]);
+  const socketRef = useRef(null);
   const timerRef = useRef(null);
 
   useEffect(() => {
@@ -79,13 +86,14 @@ function Interview() {
         },
       });
 
-      if (!response.data.session_id || !response.data.questions) {
+      if (!response.data.job_id) {
         throw new Error('Invalid response from server');
       }
 
-      setQuestions(response.data.questions);
-      setCurrentQuestion(response.data.questions[0]);
-      setSessionId(response.data.session_id);
+      const result = await waitForJob(response.data.job_id);
+      setQuestions(result.questions);
+      setCurrentQuestion(result.questions[0]);
+      setSessionId(result.session_id);
     } catch (err) {
       setError('Failed to generate questions. Please try again.');
       console.error('Error generating questions:', err);
@@ -114,14 +122,33 @@ function Interview() {
       });
       
       chunksRef.current = [];
+      setLiveTranscript('');
+      const socket = openLiveTranscription();
 
       mediaRecorderRef.current.ondataavailable = (e) => {
         if (e.data.size > 0) {
           chunksRef.current.push(e.data);
+          // Until the socket opens, chunks wait in chunksRef and are flushed by onopen
+          if (socket && socket.readyState === WebSocket.OPEN) {
+            socket.send(e.data);
+          }
         }
       };
 
       mediaRecorderRef.current.onstop = async () => {
+        if (socket && socket.readyState === WebSocket.OPEN) {
+          try {
+            setIsProcessing(true);
+            const finalTranscript = await finishLiveTranscription(socket);
+            setTranscription(finalTranscript);
+            return;
+          } catch (err) {
+            console.error('Live transcription failed, falling back to upload:', err);
+          } finally {
+            setIsProcessing(false);
+          }
+        }
+
         const audioBlob = new Blob(chunksRef.current, { type: 'audio/webm' });
         const formData = new FormData();
         formData.append('audio', audioBlob, 'recording.webm');
@@ -147,7 +174,7 @@ function Interview() {
         }
       };
 
-      mediaRecorderRef.current.start();
+      mediaRecorderRef.current.start(RECORDING_TIMESLICE);
       setIsRecording(true);
     } catch (err) {
       setError('Failed to access microphone. Please check your permissions.');
@@ -155,6 +182,44 @@ function Interview() {
     }
   };
 
+  const openLiveTranscription = () => {
+    try {
+      const socket = new WebSocket(LIVE_TRANSCRIBE_URL);
+      socket.onopen = () => {
+        socket.send(JSON.stringify({ session_id: sessionId, question: currentQuestion.question }));
+        // Chunks recorded while connecting (the first one carries the webm header) go out in order
+        chunksRef.current.forEach(chunk => socket.send(chunk));
+      };
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'partial') {
+          setLiveTranscript(message.text);
+        }
+      };
+      socketRef.current = socket;
+      return socket;
+    } catch (err) {
+      console.error('Could not open live transcription socket:', err);
+      return null;
+    }
+  };
+
+  const finishLiveTranscription = (socket) => new Promise((resolve, reject) => {
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'partial') {
+        setLiveTranscript(message.text);
+      } else if (message.type === 'final') {
+        resolve(message.transcription);
+      } else if (message.type === 'error') {
+        reject(new Error(message.detail));
+      }
+    };
+    socket.onclose = () => reject(new Error('Live transcription socket closed'));
+    // The answer is only stored once the user confirms it
+    socket.send(JSON.stringify({ type: 'stop', is_final: false }));
+  });
+
   const handleStopRecording = () => {
     if (mediaRecorderRef.current && isRecording) {
       mediaRecorderRef.current.stop();
@@ -164,6 +229,7 @@ function Interview() {
 
   const handleRetry = () => {
     setTranscription('');
+    setLiveTranscript('');
     handleStartRecording();
   };
 
@@ -197,6 +263,7 @@ function Interview() {
         setCurrentQuestionIndex(nextIndex);
         setCurrentQuestion(questions[nextIndex]);
         setTranscription('');
+        setLiveTranscript('');
       } else {
         setShowReview(true);
       }
@@ -208,29 +275,17 @@ function Interview() {
     }
   };
 
-  const handleSubmitInterview = async () => {
-    try {
-      setLoading(true);
-      const response = await api.post('/evaluate', {
-        session_id: sessionId,
+  const handleSubmitInterview = () => {
+    // The feedback page streams evaluations as each answer is scored
+    navigate('/feedback', { 
+      state: { 
         answers: answers.map(answer => ({
           question: answer.question,
           answer: answer.answer
-        }))
-      });
-
-      navigate('/feedback', { 
-        state: { 
-          feedback: response.data.feedback,
-          sessionId: sessionId
-        } 
-      });
-    } catch (err) {
-      setError('Failed to submit interview. Please try again.');
-      console.error('Submission error:', err);
-    } finally {
-      setLoading(false);
-    }
+        })),
+        sessionId: sessionId
+      } 
+    });
   };
 
   if (loading && !isRecording) {
@@ -281,7 +336,7 @@ function Interview() {
               {currentQuestion.question}
             </h3>
             <div className="bg-gray-50 rounded-lg p-4">
-              <TranscriptionDisplay transcription={transcription} />
+              <TranscriptionDisplay transcription={transcription || liveTranscript} />
             </div>
           </div>
 
@@ -1,10 +1,12 @@
 import React, { useState, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
+import { waitForJob, JOB_STAGE_LABELS } from '../api/jobs';
 
 function ResumeUpload() {
   const [file, setFile] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [stage, setStage] = useState('');
   const [error, setError] = useState('');
   const [numQuestions, setNumQuestions] = useState(10);
   const [difficulty, setDifficulty] = useState('medium');
@@ -63,17 +65,20 @@ function ResumeUpload() {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
-        timeout: 200000, // 60 seconds timeout
+        timeout: 60000, // 60 seconds timeout
       });
 
-      if (!response.data.session_id || !response.data.questions) {
+      if (!response.data.job_id) {
         throw new Error('Invalid response from server');
       }
 
+      // Questions are generated in the background; poll until the job is done
+      const result = await waitForJob(response.data.job_id, job => setStage(job.stage));
+
       navigate('/interview', { 
         state: { 
-          sessionId: response.data.session_id,
-          questions: response.data.questions
+          sessionId: result.session_id,
+          questions: result.questions
         } 
       });
     } catch (err) {
@@ -95,11 +100,14 @@ function ResumeUpload() {
         }
       } else if (err.code === 'ECONNABORTED') {
         errorMessage = 'Request timed out. Please try again.';
+      } else if (err.message) {
+        errorMessage = err.message;
       }
       setError(errorMessage);
       console.error('Upload error:', err);
     } finally {
       setLoading(false);
+      setStage('');
     }
   };
 
@@ -232,7 +240,7 @@ function ResumeUpload() {
                     <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4"></circle>
                     <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path>
                   </svg>
-                  Processing...
+                  {JOB_STAGE_LABELS[stage] || 'Processing...'}
                 </span>
               ) : (
                 'Start Interview'
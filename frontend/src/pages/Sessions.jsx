@@ -38,6 +38,8 @@ const api = axios.create({
 
 function Sessions() {
   const [sessions, setSessions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [filter, setFilter] = useState('all');
@@ -70,28 +72,50 @@ function Sessions() {
     fetchStatistics();
   }, [dateRange, selectedTags]);
 
-  const fetchSessions = async () => {
+  // Transform the data if needed to match the expected structure
+  const transformSession = (session) => ({
+    ...session,
+    questions: session.questions || [],
+    answers: session.answers || [],
+    evaluations: session.evaluations || [],
+    question_count: session.question_count ?? session.questions?.length ?? 0,
+    answer_count: session.answer_count ?? session.answers?.length ?? 0,
+    interview_type: session.interview_type || session.interviewType || 'Technical',
+    difficulty: session.difficulty || 'Medium',
+    timestamp: session.timestamp || session.created_at || new Date().toISOString()
+  });
+
+  const fetchSessions = async (cursor = null) => {
     try {
-      setLoading(true);
-      const response = await api.get('/sessions');
-      
-      // Transform the data if needed to match the expected structure
-      const transformedSessions = response.data.map(session => ({
-        ...session,
-        questions: session.questions || [],
-        answers: session.answers || [],
-        evaluations: session.evaluations || [],
-        interview_type: session.interview_type || session.interviewType || 'Technical',
-        difficulty: session.difficulty || 'Medium',
-        timestamp: session.timestamp || session.created_at || new Date().toISOString()
-      }));
-      
-      setSessions(transformedSessions);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      // Pages only carry card fields; questions, answers and evaluations load when a card is expanded
+      const response = await api.get('/sessions', { params: cursor ? { cursor } : {} });
+      const page = response.data.sessions.map(transformSession);
+
+      setSessions(prev => (cursor ? [...prev, ...page] : page));
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError('Failed to fetch sessions. Please try again.');
       console.error('Error fetching sessions:', err);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  const fetchSessionDetails = async (sessionId) => {
+    try {
+      const response = await api.get(`/sessions/${sessionId}`);
+      setSessions(prev => prev.map(session =>
+        session._id === sessionId ? { ...session, ...transformSession(response.data), detailsLoaded: true } : session
+      ));
+    } catch (err) {
+      setError('Failed to fetch session details. Please try again.');
+      console.error('Error fetching session details:', err);
     }
   };
 
@@ -156,19 +180,13 @@ function Sessions() {
     if (sortBy === 'date') {
       return new Date(b.timestamp) - new Date(a.timestamp);
     } else if (sortBy === 'score') {
-      const scoreA = calculateAverageScore(a.evaluations);
-      const scoreB = calculateAverageScore(b.evaluations);
+      const scoreA = a.avg_score || 0;
+      const scoreB = b.avg_score || 0;
       return scoreB - scoreA;
     }
     return 0;
   });
 
-  const calculateAverageScore = (evaluations) => {
-    if (!evaluations || evaluations.length === 0) return 0;
-    const scores = evaluations.map(evaluation => evaluation.score || 0);
-    return scores.reduce((a, b) => a + b, 0) / scores.length;
-  };
-
   const formatDate = (timestamp) => {
     return new Date(timestamp).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -195,9 +213,9 @@ function Sessions() {
   // Calculate statistics
   const calculateStats = () => {
     const totalSessions = sessions.length;
-    const totalQuestions = sessions.reduce((acc, session) => acc + (session.questions?.length || 0), 0);
-    const totalAnswers = sessions.reduce((acc, session) => acc + (session.answers?.length || 0), 0);
-    const averageScore = sessions.reduce((acc, session) => acc + calculateAverageScore(session.evaluations || []), 0) / totalSessions || 0;
+    const totalQuestions = sessions.reduce((acc, session) => acc + session.question_count, 0);
+    const totalAnswers = sessions.reduce((acc, session) => acc + session.answer_count, 0);
+    const averageScore = sessions.reduce((acc, session) => acc + (session.avg_score || 0), 0) / totalSessions || 0;
     
     const difficultyDistribution = sessions.reduce((acc, session) => {
       const difficulty = session.difficulty || 'unknown';
@@ -207,7 +225,7 @@ function Sessions() {
 
     const scoreTrend = sessions.map(session => ({
       date: session.timestamp || new Date().toISOString(),
-      score: calculateAverageScore(session.evaluations || [])
+      score: session.avg_score || 0
     }));
 
     return {
@@ -357,6 +375,10 @@ function Sessions() {
 
   const toggleSession = (sessionId) => {
     console.log('Toggling session:', sessionId);
+    const session = sessions.find(item => item._id === sessionId);
+    if (session && !session.detailsLoaded && expandedSessionId !== sessionId) {
+      fetchSessionDetails(sessionId);
+    }
     setExpandedSessionId(prevId => {
       const newId = prevId === sessionId ? null : sessionId;
       console.log('Setting expandedSessionId to:', newId);
@@ -452,13 +474,13 @@ function Sessions() {
                   <div className="text-right">
                     <p className="text-sm text-gray-500">Score</p>
                     <p className="text-lg font-bold text-indigo-600">
-                      {Math.round(calculateAverageScore(session.evaluations || []) * 10)}/10
+                      {(session.avg_score || 0).toFixed(1)}/10
                     </p>
                   </div>
                   <div className="text-right">
                     <p className="text-sm text-gray-500">Questions</p>
                     <p className="text-lg font-bold text-indigo-600">
-                      {session.questions?.length || 0}
+                      {session.question_count}
                     </p>
                   </div>
                   <button
@@ -584,6 +606,19 @@ function Sessions() {
             </div>
           ))}
         </div>
+
+        {nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              type="button"
+              onClick={() => fetchSessions(nextCursor)}
+              disabled={loadingMore}
+              className="px-6 py-3 rounded-lg font-medium text-indigo-600 bg-indigo-100 hover:bg-indigo-200 transition-colors"
+            >
+              {loadingMore ? 'Loading...' : 'Load more sessions'}
+            </button>
+          </div>
+        )}
       </div>
 
       {showNotesModal && (
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Keep the SQLite stores and report cache the backend opens on import out of the working tree
+STATE_DIR = tempfile.mkdtemp(prefix="interview-tests-")
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+for name in ("STORAGE_DB_PATH", "JOB_DB_PATH", "SEARCH_DB_PATH", "QUESTION_CACHE_DB_PATH"):
+    os.environ.setdefault(name, os.path.join(STATE_DIR, "interview_sessions.db"))
+os.environ.setdefault("REPORT_CACHE_DIR", os.path.join(STATE_DIR, "reports"))
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bench"))
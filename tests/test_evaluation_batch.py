@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+import backend
+
+ITEMS = [{"question": f"Question {index}", "answer": f"Answer {index}"} for index in range(3)]
+
+
+def entry(index, score=7):
+    return {
+        "index": index, "summary": "Good", "score": score,
+        "evaluation": {"clarity": {"score": score, "feedback": "Clear"}},
+        "strengths": [], "improvements": [], "revised_answer": "", "tips": []
+    }
+
+
+@pytest.fixture
+def singles(monkeypatch):
+    """Questions that fell back to a single evaluation"""
+    calls = []
+
+    async def evaluate_answer(question, answer):
+        calls.append(question)
+        return {"summary": "single", "score": 5}
+
+    monkeypatch.setattr(backend, "evaluate_answer", evaluate_answer)
+    return calls
+
+
+def respond_with(monkeypatch, response=None, error=None):
+    async def chat_completion(payload):
+        if error:
+            raise error
+        return response
+
+    monkeypatch.setattr(backend.openrouter_client, "chat_completion", chat_completion)
+
+
+def completion(content):
+    return {"choices": [{"message": {"content": content}}], "usage": {"prompt_tokens": 10, "completion_tokens": 20}}
+
+
+def test_only_malformed_entries_fall_back(monkeypatch, singles):
+    respond_with(monkeypatch, completion(json.dumps([entry(1), {"index": 2, "summary": "no score"}, entry(3, 9)])))
+
+    results = asyncio.run(backend.evaluate_answer_batch(ITEMS))
+
+    assert [result["score"] for result in results] == [7, 5, 9]
+    assert singles == ["Question 1"]
+
+
+@pytest.mark.parametrize("error", [
+    backend.LLMRequestError("rate limited", status_code=429, retry_after=3),
+    backend.LLMRequestError("connection reset", status_code=503),
+    backend.CircuitOpenError("circuit open"),
+])
+def test_request_errors_fail_the_batch_without_single_calls(monkeypatch, singles, error):
+    respond_with(monkeypatch, error=error)
+
+    results = asyncio.run(backend.evaluate_answer_batch(ITEMS))
+
+    assert [result["status"] for result in results] == ["error"] * 3
+    assert [result["question"] for result in results] == [item["question"] for item in ITEMS]
+    assert singles == []
+
+
+@pytest.mark.parametrize("response", [
+    {"choices": []},
+    {"choices": [{"message": None}]},
+    {"choices": [{"text": "legacy"}]},
+    {"choices": "none", "usage": "n/a"},
+    completion(None),
+])
+def test_malformed_envelope_falls_back_for_every_entry(monkeypatch, singles, response):
+    respond_with(monkeypatch, response)
+
+    results = asyncio.run(backend.evaluate_answer_batch(ITEMS))
+
+    assert [result["summary"] for result in results] == ["single"] * 3
+    assert singles == [item["question"] for item in ITEMS]
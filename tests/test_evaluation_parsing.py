@@ -0,0 +1,31 @@
+import asyncio
+import logging
+
+import pytest
+
+import backend
+
+
+def test_unparseable_content_is_not_logged_at_error(caplog, monkeypatch):
+    monkeypatch.setattr(backend, "LOG_PAYLOAD_SAMPLE_RATE", 0.0)
+    content = "The candidate's answer mentions their home address"
+
+    with caplog.at_level(logging.DEBUG, logger="backend"):
+        with pytest.raises(backend.HTTPException):
+            asyncio.run(backend.parse_evaluation_content(content, "Question", "Answer"))
+
+    errors = [record.getMessage() for record in caplog.records if record.levelno >= logging.ERROR]
+    assert errors == [f"Failed to parse evaluation response ({len(content)} characters)"]
+    assert all(content not in record.getMessage() for record in caplog.records)
+
+
+def test_unparseable_content_goes_through_payload_sampling(caplog, monkeypatch):
+    monkeypatch.setattr(backend, "LOG_PAYLOAD_SAMPLE_RATE", 1.0)
+
+    with caplog.at_level(logging.DEBUG, logger="backend"):
+        with pytest.raises(backend.HTTPException):
+            asyncio.run(backend.parse_evaluation_content("not json", "Question", "Answer"))
+
+    assert [record.getMessage() for record in caplog.records if record.levelno == logging.DEBUG] == [
+        "Content that failed to parse: not json"
+    ]
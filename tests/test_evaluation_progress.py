@@ -0,0 +1,42 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import backend
+
+
+def insert_legacy_session(evaluations):
+    session_id = uuid.uuid4().hex[:24]
+    backend.session_repository.insert_session({
+        "_id": session_id,
+        "timestamp": datetime.now(),
+        "questions": ["Q1", "Q2", "Q3"],
+        "answers": ["A1", "A2", "A3"],
+        "evaluations": evaluations,
+        "status": "completed"
+    })
+    return session_id
+
+
+def test_progress_tolerates_non_dict_evaluations():
+    session_id = insert_legacy_session([None, "Good answer", {"status": "pending"}])
+    response = TestClient(backend.app).get(f"/api/evaluate/{session_id}")
+    assert response.status_code == 200
+    assert response.json()["completed"] == 2
+
+
+def test_rescoring_legacy_evaluations_uses_bulk_lane(monkeypatch):
+    session_id = insert_legacy_session([None, "Good answer", {"score": 7}])
+    lanes = []
+
+    async def fake_evaluate(question, answer):
+        lanes.append(backend.llm_lane_var.get())
+        return {"score": 5}
+
+    monkeypatch.setattr(backend, "evaluate_answer", fake_evaluate)
+    answers = [{"question": f"Q{i}", "answer": f"A{i}"} for i in range(3)]
+    evaluations = asyncio.run(backend.evaluate_answers_concurrently(session_id, answers, batch_size=1))
+    assert evaluations == [{"score": 5}] * 3
+    assert lanes == [("bulk", session_id)] * 3
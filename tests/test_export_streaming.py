@@ -0,0 +1,42 @@
+import json
+
+import backend
+
+CHUNK_SIZE = 4096
+
+
+def make_sessions(count):
+    return [{"_id": f"session-{index}", "answers": ["x" * 500]} for index in range(count)]
+
+
+def export(monkeypatch, sessions, ndjson=False):
+    monkeypatch.setattr(backend, "EXPORT_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(backend, "iter_export_sessions", lambda session_ids, projection: iter(sessions))
+    request = backend.ExportRequest(session_ids=[], format="ndjson" if ndjson else "json")
+    return list(backend.stream_sessions_json(request, [], ndjson=ndjson))
+
+
+def test_json_export_spans_several_full_chunks(monkeypatch):
+    sessions = make_sessions(40)
+    chunks = export(monkeypatch, sessions)
+
+    element_size = len(json.dumps(sessions[0])) + 1
+    assert len(chunks) > 2
+    for chunk in chunks[:-1]:
+        assert CHUNK_SIZE <= len(chunk) < CHUNK_SIZE + element_size + 1
+    assert json.loads("".join(chunks)) == sessions
+
+
+def test_ndjson_export_spans_several_full_chunks(monkeypatch):
+    sessions = make_sessions(40)
+    chunks = export(monkeypatch, sessions, ndjson=True)
+
+    assert len(chunks) > 2
+    for chunk in chunks[:-1]:
+        assert len(chunk) >= CHUNK_SIZE
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == sessions
+
+
+def test_json_export_of_one_session_is_a_valid_array(monkeypatch):
+    sessions = make_sessions(1)
+    assert json.loads("".join(export(monkeypatch, sessions))) == sessions
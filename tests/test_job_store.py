@@ -0,0 +1,64 @@
+import mongomock
+import pytest
+
+import backend
+
+
+class RacingCollection:
+    """Collection whose first lookup misses, as if another request inserted right after it"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._missed = False
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def find_one(self, *args, **kwargs):
+        if not self._missed:
+            self._missed = True
+            return None
+        return self._collection.find_one(*args, **kwargs)
+
+
+@pytest.fixture(params=["sqlite", "mongo"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return backend.SQLiteJobStore(str(tmp_path / "jobs.db"))
+    return backend.MongoJobStore(mongomock.MongoClient().db.jobs)
+
+
+def test_client_key_reuses_completed_job(store):
+    job, created = store.create_job("upload", {}, "key")
+    store.update_job(job["id"], status="completed")
+    again, created_again = store.create_job("upload", {}, "key")
+    assert created and not created_again
+    assert again["id"] == job["id"]
+
+
+def test_in_flight_only_key_is_released_on_completion(store):
+    job, _ = store.create_job("upload", {}, "key", in_flight_only=True)
+    duplicate, created = store.create_job("upload", {}, "key", in_flight_only=True)
+    assert not created and duplicate["id"] == job["id"]
+
+    store.update_job(job["id"], status="completed")
+    later, created = store.create_job("upload", {}, "key", in_flight_only=True)
+    assert created and later["id"] != job["id"]
+
+
+def test_failed_job_is_not_reused(store):
+    job, _ = store.create_job("upload", {}, "key")
+    store.update_job(job["id"], status="failed")
+    retry, created = store.create_job("upload", {}, "key")
+    assert created and retry["id"] != job["id"]
+
+
+def test_mongo_concurrent_create_returns_the_winning_job():
+    collection = mongomock.MongoClient().db.jobs
+    winner, _ = backend.MongoJobStore(collection).create_job("upload", {}, "key")
+
+    racing = backend.MongoJobStore(RacingCollection(collection))
+    job, created = racing.create_job("upload", {}, "key")
+    assert not created
+    assert job["id"] == winner["id"]
+    assert collection.count_documents({}) == 1
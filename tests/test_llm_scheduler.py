@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+import pytest
+
+import backend
+
+# 6 requests per minute: one request every 10 seconds of fake time. The dispatcher's real wait_for
+# timeouts are as long as the fake delays, so it only moves on when a test advances the clock.
+RPM = 6
+INTERVAL = 10
+DEADLINES = {"interactive": 1000, "evaluation": 1000, "bulk": 1000}
+
+
+class FakeClock:
+    """Stands in for backend's time module with a monotonic clock that only moves when advanced"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(backend, "time", clock)
+    return clock
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def advance(clock, scheduler, seconds):
+    clock.now += seconds
+    if scheduler._wakeup is not None:
+        scheduler._wakeup.set()
+    await settle()
+
+
+def start(scheduler, lane, owner, granted):
+    """Queue one request from owner in lane; its (lane, owner) is appended to granted once it may go out"""
+
+    async def request():
+        with backend.llm_lane(lane, owner):
+            # Real seconds: a request the test never lets through fails instead of hanging
+            await asyncio.wait_for(scheduler.acquire(100), timeout=5)
+        granted.append((lane, owner))
+
+    return asyncio.create_task(request())
+
+
+def test_more_urgent_lanes_go_first(clock):
+    async def scenario():
+        scheduler = backend.LLMScheduler(RPM, 0, 1, 10, DEADLINES)
+        granted = []
+        await start(scheduler, "bulk", "warmup", granted)
+        tasks = [start(scheduler, lane, "owner", granted) for lane in ("bulk", "evaluation", "interactive")]
+        await settle()
+        assert granted == [("bulk", "warmup")]
+
+        await advance(clock, scheduler, INTERVAL - 1)
+        assert len(granted) == 1
+        for _ in range(3):
+            await advance(clock, scheduler, INTERVAL)
+        await asyncio.gather(*tasks)
+        return granted, scheduler
+
+    granted, scheduler = asyncio.run(scenario())
+    assert [lane for lane, _ in granted[1:]] == ["interactive", "evaluation", "bulk"]
+    assert scheduler.counts["bulk"]["granted"] == 2
+    assert scheduler.depth() == 0
+
+
+def test_owners_take_turns_within_a_lane(clock):
+    async def scenario():
+        scheduler = backend.LLMScheduler(RPM, 0, 1, 10, DEADLINES)
+        granted = []
+        await start(scheduler, "interactive", "warmup", granted)
+        tasks = [start(scheduler, "evaluation", owner, granted) for owner in ("a", "a", "a", "b", "c")]
+        await settle()
+        for _ in range(len(tasks)):
+            await advance(clock, scheduler, INTERVAL)
+        await asyncio.gather(*tasks)
+        return granted
+
+    granted = asyncio.run(scenario())
+    assert [owner for _, owner in granted[1:]] == ["a", "b", "c", "a", "a"]
+
+
+def test_full_lane_rejects_without_queueing(clock):
+    async def scenario():
+        scheduler = backend.LLMScheduler(RPM, 0, 1, 2, DEADLINES)
+        granted = []
+        await start(scheduler, "interactive", "warmup", granted)
+        queued = [start(scheduler, "bulk", f"session-{index}", granted) for index in range(2)]
+        await settle()
+
+        with pytest.raises(backend.LLMRejectedError) as rejected:
+            await start(scheduler, "bulk", "session-2", granted)
+        # The limit is per lane
+        queued.append(start(scheduler, "evaluation", "session-3", granted))
+        await settle()
+        depth = {lane: scheduler.depth(lane) for lane in scheduler.LANES}
+
+        for _ in range(3):
+            await advance(clock, scheduler, INTERVAL)
+        await asyncio.gather(*queued)
+        return rejected.value, depth, scheduler
+
+    error, depth, scheduler = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.retry_after >= 1
+    assert depth == {"interactive": 0, "evaluation": 1, "bulk": 2}
+    assert scheduler.counts["bulk"] == {"granted": 2, "queue_full": 1, "deadline": 0}
+
+
+def test_requests_that_cannot_start_in_time_are_shed(clock):
+    async def scenario():
+        scheduler = backend.LLMScheduler(RPM, 0, 1, 10, {**DEADLINES, "interactive": 15, "bulk": 25})
+        granted = []
+        await start(scheduler, "evaluation", "warmup", granted)
+        bulk = start(scheduler, "bulk", "session", granted)
+        interactive = [start(scheduler, "interactive", f"candidate-{index}", granted) for index in range(2)]
+        await settle()
+
+        # Two requests ahead at one per 10 seconds cannot fit in a 15 second deadline
+        with pytest.raises(backend.LLMRejectedError):
+            await start(scheduler, "interactive", "candidate-2", granted)
+
+        # candidate-0 goes out; candidate-1 was admitted but would now start 5 seconds too late
+        await advance(clock, scheduler, INTERVAL)
+        with pytest.raises(backend.LLMRejectedError):
+            await interactive[1]
+
+        # A newer interactive request still jumps ahead, which pushes the bulk request past its deadline
+        interactive.append(start(scheduler, "interactive", "candidate-3", granted))
+        await settle()
+        await advance(clock, scheduler, INTERVAL)
+        await asyncio.gather(interactive[0], interactive[2])
+        with pytest.raises(backend.LLMRejectedError):
+            await bulk
+        return granted, scheduler
+
+    granted, scheduler = asyncio.run(scenario())
+    assert [owner for _, owner in granted] == ["warmup", "candidate-0", "candidate-3"]
+    assert scheduler.counts["interactive"]["deadline"] == 2
+    assert scheduler.counts["bulk"]["deadline"] == 1
+    assert scheduler.depth() == 0
+
+
+def test_penalize_holds_dispatch_after_a_429(clock):
+    async def scenario():
+        scheduler = backend.LLMScheduler(RPM, 0, 3, 10, {**DEADLINES, "interactive": 15})
+        granted = []
+        await start(scheduler, "evaluation", "first", granted)
+        scheduler.penalize(30)
+        paused_for = scheduler.stats()["paused_for"]
+
+        # Burst capacity is left, but nothing goes out until the pause ends
+        waiting = start(scheduler, "evaluation", "second", granted)
+        await settle()
+        with pytest.raises(backend.LLMRejectedError) as rejected:
+            await start(scheduler, "interactive", "candidate", granted)
+        await advance(clock, scheduler, 29)
+        held = list(granted)
+        await advance(clock, scheduler, 1)
+        await waiting
+        return paused_for, held, granted, rejected.value
+
+    paused_for, held, granted, rejected = asyncio.run(scenario())
+    assert paused_for == 30
+    assert held == [("evaluation", "first")]
+    assert granted == [("evaluation", "first"), ("evaluation", "second")]
+    assert "deadline" in str(rejected)
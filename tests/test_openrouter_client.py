@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import backend
+
+PAYLOAD = {"model": "test", "messages": [{"role": "user", "content": "Hello"}], "max_tokens": 10}
+COMPLETION = {"choices": [{"message": {"content": "Hi"}}], "usage": {"total_tokens": 12}}
+
+
+@pytest.fixture(autouse=True)
+def no_scheduling(monkeypatch):
+    monkeypatch.setattr(backend, "llm_scheduler", backend.LLMScheduler(0, 0, 1, 10, backend.LLM_LANE_DEADLINES))
+    monkeypatch.setattr(backend, "OPENROUTER_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(backend, "OPENROUTER_BACKOFF_MAX", 0.0)
+
+
+def make_client(responses, max_retries=2, threshold=5):
+    """Client whose requests are answered, in order, by the given (status, body) pairs"""
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        status, body = responses[min(len(calls), len(responses)) - 1]
+        return httpx.Response(status, text=body)
+
+    client = backend.OpenRouterClient("http://openrouter.test/chat", max_connections=4, max_retries=max_retries,
+                                      timeout=5, breaker=backend.CircuitBreaker(threshold, cooldown=60))
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, calls
+
+
+def sse(*chunks):
+    return "".join(f"data: {chunk}\n\n" for chunk in chunks)
+
+
+def delta(text):
+    return json.dumps({"choices": [{"delta": {"content": text}}]})
+
+
+async def collect(client):
+    return [piece async for piece in client.stream_chat_completion(PAYLOAD)]
+
+
+def test_retries_server_errors_then_succeeds():
+    client, calls = make_client([(503, "busy"), (200, json.dumps(COMPLETION))])
+    assert asyncio.run(client.chat_completion(PAYLOAD)) == COMPLETION
+    assert len(calls) == 2
+    assert client.breaker.failures == 0
+
+
+def test_client_errors_are_not_retried():
+    client, calls = make_client([(400, "bad request")])
+    with pytest.raises(backend.LLMRequestError) as error:
+        asyncio.run(client.chat_completion(PAYLOAD))
+    assert error.value.status_code == 400
+    assert len(calls) == 1
+
+
+def test_malformed_body_is_retried_as_bad_gateway():
+    client, calls = make_client([(200, '{"choices": [{"mess'), (200, "<html>oops</html>")], max_retries=1)
+    with pytest.raises(backend.LLMRequestError) as error:
+        asyncio.run(client.chat_completion(PAYLOAD))
+    assert error.value.status_code == 502
+    assert len(calls) == 2
+    assert client.breaker.failures == 1
+
+
+def test_malformed_body_recovers_on_retry():
+    client, calls = make_client([(200, "not json"), (200, json.dumps(COMPLETION))])
+    assert asyncio.run(client.chat_completion(PAYLOAD)) == COMPLETION
+
+
+def test_breaker_opens_after_repeated_failures():
+    client, calls = make_client([(502, "down")], max_retries=0, threshold=2)
+    for _ in range(2):
+        with pytest.raises(backend.LLMRequestError):
+            asyncio.run(client.chat_completion(PAYLOAD))
+    with pytest.raises(backend.CircuitOpenError):
+        asyncio.run(client.chat_completion(PAYLOAD))
+    assert len(calls) == 2
+
+
+def test_stream_yields_deltas():
+    client, calls = make_client([(200, sse(delta("Hel"), delta("lo"), "[DONE]"))])
+    assert asyncio.run(collect(client)) == ["Hel", "lo"]
+
+
+def test_malformed_stream_chunk_before_output_is_retried():
+    client, calls = make_client([(200, sse("{not json")), (200, sse(delta("ok"), "[DONE]"))])
+    assert asyncio.run(collect(client)) == ["ok"]
+    assert len(calls) == 2
+
+
+def test_malformed_stream_chunk_after_output_fails_without_retry():
+    client, calls = make_client([(200, sse(delta("partial"), "{not json"))])
+    received = []
+
+    async def run():
+        async for piece in client.stream_chat_completion(PAYLOAD):
+            received.append(piece)
+
+    with pytest.raises(backend.LLMRequestError) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 502
+    assert received == ["partial"]
+    assert len(calls) == 1
+    assert client.breaker.failures == 1
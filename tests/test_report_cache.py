@@ -0,0 +1,40 @@
+import os
+
+import backend
+
+
+def test_put_replaces_older_renders_of_the_same_session(tmp_path):
+    cache = backend.ReportCache(str(tmp_path))
+    cache.put("a", "v1", b"old")
+    cache.put("b", "v1", b"other")
+    cache.put("a", "v2", b"new")
+
+    assert cache.get("a", "v1") is None
+    assert cache.get("a", "v2") == b"new"
+    assert cache.get("b", "v1") == b"other"
+    assert cache.stats()["entries"] == 2
+
+
+def test_invalidate_only_lists_the_sessions_directory(tmp_path, monkeypatch):
+    cache = backend.ReportCache(str(tmp_path))
+    cache.put("a", "v1", b"report")
+    cache.put("b", "v1", b"report")
+    listed = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(backend.os, "listdir", lambda path: listed.append(path) or real_listdir(path))
+
+    cache.invalidate("a")
+    cache.put("b", "v1", b"rerendered")
+
+    assert str(tmp_path) not in listed
+    assert cache.get("a", "v1") is None
+    assert not os.path.exists(tmp_path / "a")
+    assert cache.stats()["entries"] == 1
+
+
+def test_entries_are_counted_from_disk_on_startup(tmp_path):
+    cache = backend.ReportCache(str(tmp_path))
+    cache.put("a", "v1", b"report")
+    cache.put("b", "v1", b"report")
+
+    assert backend.ReportCache(str(tmp_path)).stats()["entries"] == 2
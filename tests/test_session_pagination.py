@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+import backend
+
+
+@pytest.fixture(params=["sqlite", "mongo"])
+def repository(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        repository = backend.SQLiteSessionRepository(str(tmp_path / "sessions.db"), 2)
+    else:
+        repository = backend.MongoSessionRepository(mongomock.MongoClient().db)
+    monkeypatch.setattr(backend, "session_repository", repository)
+    return repository
+
+
+def insert_sessions(repository):
+    ids = [str(ObjectId()) for _ in range(6)]
+    start = datetime(2024, 3, 1)
+    timestamps = [start + timedelta(days=1), start, start + timedelta(days=2), None, "2024-01-01", start]
+    for session_id, timestamp in zip(ids, timestamps):
+        session = {"_id": session_id, "difficulty": "easy", "questions": [], "answers": []}
+        if timestamp is not None:
+            session["timestamp"] = timestamp
+        repository.insert_session(session)
+    return ids
+
+
+@pytest.mark.parametrize("fields", ["summary", "full"])
+def test_pages_cover_sessions_without_timestamps(repository, fields):
+    ids = insert_sessions(repository)
+
+    seen = []
+    cursor = None
+    while True:
+        page = backend.list_sessions_page({}, cursor, 2, fields)
+        seen.extend(session["_id"] for session in page["sessions"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+    # Dated sessions come first, newest first
+    assert seen[:4] == [ids[2], ids[0], *sorted([ids[1], ids[5]], reverse=True)]
+
+
+def test_mongo_backfills_missing_timestamps_from_the_id():
+    repository = backend.MongoSessionRepository(mongomock.MongoClient().db)
+    session_id = ObjectId()
+    repository.insert_session({"_id": str(session_id), "timestamp": "yesterday"})
+    repository.ensure_indexes()
+
+    timestamp = repository.get_session(str(session_id))["timestamp"]
+    assert isinstance(timestamp, datetime)
+    assert abs(timestamp - datetime.now()) < timedelta(minutes=1)
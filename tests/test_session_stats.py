@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+
+import backend
+
+# Shaped like sessions written before evaluations were validated: string scores and non-dict entries
+LEGACY_SESSION = {
+    "_id": "legacy-session",
+    "timestamp": datetime(2024, 1, 5),
+    "difficulty": "medium",
+    "questions": ["Q1", "Q2", "Q3", "Q4"],
+    "answers": ["A1", "A2", "A3", "A4"],
+    "evaluations": [
+        {"score": "7/10", "evaluation": {"clarity": {"score": 6}, "structure": {"score": "8"}}},
+        {"score": "n/a"},
+        {"score": 9},
+        None
+    ]
+}
+
+
+@pytest.fixture(params=["sqlite", "mongo"])
+def repository(request, tmp_path):
+    if request.param == "sqlite":
+        return backend.SQLiteSessionRepository(str(tmp_path / "sessions.db"), 2)
+    return backend.MongoSessionRepository(mongomock.MongoClient().db)
+
+
+def test_evaluation_score_skips_unparseable_values():
+    assert backend.evaluation_score({"score": "7/10"}) is None
+    assert backend.evaluation_score({"score": "8"}) == 8.0
+    assert backend.evaluation_score({"score": float("nan")}) is None
+    assert backend.evaluation_score({"score": "bad", "evaluation": {"clarity": {"score": "6"}, "structure": {"score": [1]}}}) == 6.0
+    assert backend.evaluation_score("Good answer") is None
+
+
+def test_rebuild_and_incremental_updates_on_legacy_session(repository):
+    repository.ensure_indexes()
+    stats = backend.SessionStatsStore(repository)
+    repository.insert_session(dict(LEGACY_SESSION))
+
+    result = stats.rebuild()
+    # 7.0 from the criteria mean of the first evaluation, 9 from the third
+    assert result["stats"]["average_score"] == 8.0
+
+    stats.evaluations_replaced("legacy-session", LEGACY_SESSION["evaluations"])
+    stats.evaluation_written("legacy-session", {"status": "pending"}, {"score": "6/10"})
+    assert stats.rebuild()["stats"]["total_sessions"] == 1
@@ -0,0 +1,53 @@
+import asyncio
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+import backend
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def webm_clip(seconds=3):
+    return subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", f"sine=frequency=300:duration={seconds}",
+         "-ar", "48000", "-ac", "1", "-c:a", "libopus", "-f", "webm", "pipe:1"],
+        capture_output=True,
+        check=True
+    ).stdout
+
+
+def test_chunked_decode_matches_one_shot_decode():
+    clip = webm_clip()
+
+    async def decode_in_chunks():
+        decoder = backend.StreamingAudioDecoder()
+        try:
+            for start in range(0, len(clip), 2000):
+                await decoder.feed(clip[start:start + 2000])
+            await decoder.finish()
+            tail = decoder.samples(16000)
+            return decoder.samples(), tail
+        finally:
+            await decoder.aclose()
+
+    samples, tail = asyncio.run(decode_in_chunks())
+    expected = backend.decode_audio(clip)
+    assert len(samples) == len(expected)
+    assert np.allclose(samples, expected, atol=1e-4)
+    assert np.array_equal(tail, samples[16000:])
+
+
+def test_undecodable_stream_raises_conversion_error():
+    async def decode_garbage():
+        decoder = backend.StreamingAudioDecoder()
+        try:
+            await decoder.feed(b"not audio" * 100)
+            await decoder.finish()
+        finally:
+            await decoder.aclose()
+
+    with pytest.raises(backend.AudioConversionError):
+        asyncio.run(decode_garbage())